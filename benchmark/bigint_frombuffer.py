@@ -0,0 +1,75 @@
+# Copyright 2022 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Microbenchmark of decoding SPU shares into BigintNdArray, which is the
+hot path of SPU -> HEU transfer.
+
+Usage:
+    python -m benchmark.bigint_frombuffer --sizes 10000 100000 1000000 10000000
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from secretflow.utils import ndarray_bigint
+
+
+def from_bytes_per_element(buffer, bytes_per_int, shape):
+    return ndarray_bigint.BigintNdArray(
+        [
+            int.from_bytes(
+                buffer[i * bytes_per_int : (i + 1) * bytes_per_int],
+                sys.byteorder,
+                signed=True,
+            )
+            for i in range(len(buffer) // bytes_per_int)
+        ],
+        shape,
+    )
+
+
+def timeit(fn, *args):
+    start = time.perf_counter()
+    res = fn(*args)
+    return time.perf_counter() - start, res
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[10**4, 10**5, 10**6, 10**7]
+    )
+    parser.add_argument('--bytes', type=int, nargs='+', default=[8, 16])
+    args = parser.parse_args()
+
+    print(f'{"bytes":>6} {"elements":>10} {"old(s)":>10} {"new(s)":>10} {"speedup":>8}')
+    for bytes_per_int in args.bytes:
+        for size in args.sizes:
+            buffer = np.random.bytes(size * bytes_per_int)
+            t_old, old = timeit(from_bytes_per_element, buffer, bytes_per_int, (size,))
+            t_new, new = timeit(
+                ndarray_bigint.frombuffer, buffer, bytes_per_int, (size,)
+            )
+            assert old.data == new.data
+            print(
+                f'{bytes_per_int:>6} {size:>10} {t_old:>10.4f} {t_new:>10.4f} '
+                f'{t_old / t_new:>7.1f}x'
+            )
+
+
+if __name__ == '__main__':
+    main()
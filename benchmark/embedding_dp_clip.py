@@ -0,0 +1,94 @@
+# Copyright 2022 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of per-sample clipping in GaussianEmbeddingDP on CPU.
+
+Compares scaling the flattened embedding by a [B, B] diagonal matrix, which
+GaussianEmbeddingDP used before, with broadcasting a [B, 1] scale. Every
+measurement runs in a fresh process so that peak RSS is not polluted by the
+previous one.
+
+Usage:
+    python -m benchmark.embedding_dp_clip --dim 256 --batch-sizes 256 1024 4096 8192 16384
+"""
+
+import argparse
+import multiprocessing
+import resource
+import time
+
+
+def diag_clip(inputs, l2_norm_clip):
+    import tensorflow as tf
+
+    embed_flat = tf.keras.layers.Flatten()(inputs)
+    norm_vec = tf.norm(embed_flat, ord=2, axis=-1)
+    ones = tf.ones(shape=norm_vec.shape)
+    max_v = tf.linalg.diag(1.0 / tf.math.maximum(norm_vec / l2_norm_clip, ones))
+    return tf.reshape(tf.linalg.matmul(max_v, embed_flat), inputs.shape)
+
+
+def run(method, batch_size, dim, repeat):
+    import tensorflow as tf
+
+    from secretflow.security.privacy.mechanism.tensorflow.layers import (
+        clip_by_sample_norm,
+    )
+
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    clip = diag_clip if method == 'diag' else clip_by_sample_norm
+    inputs = tf.random.normal((batch_size, dim))
+    # warm up, so that peak memory below excludes the tensorflow runtime.
+    clip(tf.random.normal((8, dim)), 1.0).numpy()
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        clip(inputs, 1.0).numpy()
+    elapsed = (time.perf_counter() - start) / repeat
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_rss
+    # ru_maxrss is in KiB on linux.
+    return elapsed, peak_rss / 1024
+
+
+def measure(method, batch_size, dim, repeat):
+    ctx = multiprocessing.get_context('spawn')
+    with ctx.Pool(1) as pool:
+        return pool.apply(run, (method, batch_size, dim, repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--dim', type=int, default=256)
+    parser.add_argument(
+        '--batch-sizes', type=int, nargs='+', default=[256, 1024, 4096, 8192, 16384]
+    )
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    print(
+        f'{"batch":>6} {"diag(ms)":>9} {"diag peak(MiB)":>15} '
+        f'{"broadcast(ms)":>14} {"broadcast peak(MiB)":>20} {"speedup":>8}'
+    )
+    for batch_size in args.batch_sizes:
+        t_diag, m_diag = measure('diag', batch_size, args.dim, args.repeat)
+        t_bc, m_bc = measure('broadcast', batch_size, args.dim, args.repeat)
+        print(
+            f'{batch_size:>6} {t_diag * 1e3:>9.2f} {m_diag:>15.1f} '
+            f'{t_bc * 1e3:>14.2f} {m_bc:>20.1f} {t_diag / t_bc:>7.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# Copyright 2022 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of X.T * X on vertical slice dataset used by SS Pearson, VIF and P-Value.
+
+Compares computing the whole gram matrix in SPU with computing diagonal
+blocks in plaintext by each party and only cross blocks in SPU.
+
+Usage:
+    python -m benchmark.ss_gram --rows 1000000 --features 100 500 1000
+"""
+
+import argparse
+import time
+
+import jax.numpy as jnp
+import numpy as np
+import spu
+
+import secretflow as sf
+from secretflow.stats.ss_gram_v import gram_matrix
+from secretflow.utils.testing import unused_tcp_port
+
+
+def full_spu_xtx(objs):
+    data = jnp.concatenate(objs, axis=1)
+    return jnp.matmul(data.transpose(), data)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--features', type=int, nargs='+', default=[100, 500, 1000])
+    parser.add_argument('--parties', type=int, default=2, choices=[2, 3])
+    args = parser.parse_args()
+
+    parties = ['alice', 'bob', 'carol'][: args.parties]
+    sf.init(parties, num_cpus=16, log_to_driver=False)
+    cluster_def = {
+        'nodes': [
+            {
+                'party': p,
+                'id': f'local:{i}',
+                'address': f'127.0.0.1:{unused_tcp_port()}',
+            }
+            for i, p in enumerate(parties)
+        ],
+        'runtime_config': {
+            'protocol': spu.spu_pb2.SEMI2K,
+            'field': spu.spu_pb2.FM128,
+        },
+    }
+    spu_device = sf.SPU(cluster_def)
+    pyus = [sf.PYU(p) for p in parties]
+
+    print(
+        f'{"features":>9} {"full spu(s)":>12} {"blocked(s)":>11} {"speedup":>8} {"max err":>9}'
+    )
+    for features in args.features:
+        widths = [features // len(pyus)] * len(pyus)
+        widths[-1] += features - sum(widths)
+        xs = [
+            pyu(lambda w: np.random.default_rng(0).normal(size=(args.rows, w)))(w)
+            for pyu, w in zip(pyus, widths)
+        ]
+        sf.wait(xs)
+
+        start = time.perf_counter()
+        expected = sf.reveal(spu_device(full_spu_xtx)([x.to(spu_device) for x in xs]))
+        t_full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        xtx = sf.reveal(gram_matrix(spu_device, xs))
+        t_blocked = time.perf_counter() - start
+
+        err = np.max(np.abs(xtx - expected)) / args.rows
+        print(
+            f'{features:>9} {t_full:>12.2f} {t_blocked:>11.2f} '
+            f'{t_full / t_blocked:>7.1f}x {err:>9.2e}'
+        )
+
+    sf.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+# Copyright 2022 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of compile and fit time of SS-SGD epochs.
+
+Compares the python loop over mini batches used before, which is unrolled
+into the compiled program, with the rolled loop of _batch_update_w. Reports the
+size of the traced program, the first call (compile and run) and the total
+time of all epochs on SPU for each batch size.
+
+Usage:
+    python -m benchmark.ss_sgd_epoch --rows 20000 --features 100 --batch-sizes 16 64 256 1024
+"""
+
+import argparse
+import time
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+import spu
+
+import secretflow as sf
+from secretflow.ml.linear.linear_model import RegType
+from secretflow.ml.linear.ss_sgd.model import Penalty, _batch_update_w, _init_w
+from secretflow.utils.sigmoid import SigType, sigmoid
+from secretflow.utils.testing import unused_tcp_port
+
+
+def unrolled_batch_update_w(
+    x: np.ndarray,
+    y: np.ndarray,
+    w: np.ndarray,
+    learning_rate: float,
+    l2_norm: float,
+    sig_type: SigType,
+    reg_type: RegType,
+    penalty: Penalty,
+    total_batch: int,
+    batch_size: int,
+) -> np.ndarray:
+    assert x.shape[0] >= total_batch * batch_size, "total batch is too large"
+    num_feat = x.shape[1]
+    assert w.shape[0] == num_feat + 1, "w shape is mismatch to x"
+    assert len(w.shape) == 1 or (
+        len(w.shape) == 2 and w.shape[1] == 1
+    ), "w should be list or 1D array"
+    w = w.reshape((w.shape[0], 1))
+    assert y.shape[0] == x.shape[0], "x & y not aligned"
+    assert len(y.shape) == 1 or (
+        len(y.shape) == 2 and y.shape[1] == 1
+    ), "Y should be be list or 1D array"
+    y = y.reshape((y.shape[0], 1))
+
+    for idx in range(total_batch):
+        begin = idx * batch_size
+        end = (idx + 1) * batch_size
+        # padding one col for bias in w
+        x_slice = jnp.concatenate((x[begin:end, :], jnp.ones((batch_size, 1))), axis=1)
+        y_slice = y[begin:end, :]
+
+        pred = jnp.matmul(x_slice, w)
+        if reg_type == RegType.Logistic:
+            pred = sigmoid(pred, sig_type)
+
+        err = pred - y_slice
+        grad = jnp.matmul(jnp.transpose(x_slice), err)
+
+        if penalty == Penalty.L2:
+            w_with_zero_bias = jnp.resize(w, (num_feat, 1))
+            w_with_zero_bias = jnp.concatenate(
+                (w_with_zero_bias, jnp.zeros((1, 1))),
+                axis=0,
+            )
+            grad = grad + w_with_zero_bias * l2_norm
+
+        step = (learning_rate * grad) / batch_size
+
+        w = w - step
+
+    return w
+
+
+def program_size(fn, x, y, w, **static):
+    jaxpr = jax.make_jaxpr(lambda x, y, w: fn(x, y, w, 0.1, 0.5, **static))(x, y, w)
+    return len(jaxpr.eqns)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--features', type=int, default=100)
+    parser.add_argument(
+        '--batch-sizes', type=int, nargs='+', default=[16, 64, 256, 1024]
+    )
+    parser.add_argument('--epochs', type=int, default=3)
+    args = parser.parse_args()
+
+    sf.init(['alice', 'bob'], num_cpus=16, log_to_driver=False)
+    cluster_def = {
+        'nodes': [
+            {
+                'party': p,
+                'id': f'local:{i}',
+                'address': f'127.0.0.1:{unused_tcp_port()}',
+            }
+            for i, p in enumerate(['alice', 'bob'])
+        ],
+        'runtime_config': {
+            'protocol': spu.spu_pb2.SEMI2K,
+            'field': spu.spu_pb2.FM64,
+        },
+    }
+    spu_device = sf.SPU(cluster_def)
+    alice, bob = sf.PYU('alice'), sf.PYU('bob')
+
+    x = alice(
+        lambda: np.random.default_rng(0).normal(size=(args.rows, args.features))
+    )().to(spu_device)
+    y = bob(
+        lambda: (np.random.default_rng(1).random(args.rows) < 0.5).astype(np.float32)
+    )().to(spu_device)
+    plain_x = np.zeros((args.rows, args.features), np.float32)
+    plain_y = np.zeros(args.rows, np.float32)
+    plain_w = np.zeros((args.features + 1, 1), np.float32)
+
+    print(
+        f'{"batch":>6} {"loop":>9} {"eqns":>7} {"first call(s)":>14} ' f'{"fit(s)":>8}'
+    )
+    for batch_size in args.batch_sizes:
+        static = dict(
+            sig_type=SigType.T1,
+            reg_type=RegType.Logistic,
+            penalty=Penalty.L2,
+            total_batch=args.rows // batch_size,
+            batch_size=batch_size,
+        )
+        for name, fn in (
+            ('unrolled', unrolled_batch_update_w),
+            ('rolled', _batch_update_w),
+        ):
+            eqns = program_size(fn, plain_x, plain_y, plain_w, **static)
+            spu_device.clear_compile_cache()
+            w = spu_device(_init_w, static_argnames=('base', 'num_feat'))(
+                base=0, num_feat=args.features
+            )
+            sf.wait([w])
+            start = time.perf_counter()
+            first_call = None
+            for _ in range(args.epochs):
+                w = spu_device(fn, static_argnames=tuple(static.keys()))(
+                    x, y, w, 0.1, 0.5, **static
+                )
+                if first_call is None:
+                    sf.wait([w])
+                    first_call = time.perf_counter() - start
+            sf.wait([w])
+            fit = time.perf_counter() - start
+            print(
+                f'{batch_size:>6} {name:>9} {eqns:>7} {first_call:>14.2f} {fit:>8.2f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# Copyright 2022 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of worker side memory of SS-XGB buckets maps.
+
+Compares the peak memory of building the dense 0-1 buckets map by repeated
+np.concatenate used before with build_buckets_map. The buckets map is the
+array secret shared into SPU, its element count is reported as the SPU input
+size. The compact mode sends the order map itself, see
+benchmark.ss_xgb_buckets_map_spu for its cost inside SPU.
+
+Usage:
+    python -m benchmark.ss_xgb_buckets_map --rows 100000 --features 10 50 100 --buckets 64
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from secretflow.ml.boost.ss_xgb_v.core.tree_worker import (
+    bins_dtype,
+    build_buckets_map,
+)
+
+
+def concatenate_buckets_map(order_map, feature_buckets):
+    buckets_map = np.zeros((order_map.shape[0], 0), dtype=np.int8)
+    for f, total_buckets in enumerate(feature_buckets):
+        bins = order_map[:, f]
+        f_buckets_map = np.zeros((order_map.shape[0], total_buckets), dtype=np.int8)
+        sum_bin_idx = np.array([], dtype=np.int64)
+        for b in range(total_buckets):
+            bin_idx = np.flatnonzero(bins == b)
+            sum_bin_idx = np.concatenate((sum_bin_idx, bin_idx), axis=None)
+            f_buckets_map[sum_bin_idx, b] = 1
+        buckets_map = np.concatenate((buckets_map, f_buckets_map), axis=1)
+    return buckets_map
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--features', type=int, nargs='+', default=[10, 50, 100])
+    parser.add_argument('--buckets', type=int, default=64)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(
+        f'{"features":>9} {"mode":>12} {"peak(MB)":>9} {"time(s)":>8} {"spu input":>12}'
+    )
+    for features in args.features:
+        # qcut gives buckets + 1 buckets at most.
+        feature_buckets = [args.buckets + 1] * features
+        order_map = rng.integers(
+            0, args.buckets + 1, size=(args.rows, features)
+        ).astype(bins_dtype(args.buckets))
+
+        expected = None
+        for mode, fn in (
+            ('concatenate', concatenate_buckets_map),
+            ('dense', build_buckets_map),
+        ):
+            result, peak, elapsed = measure(fn, order_map, feature_buckets)
+            if expected is None:
+                expected = result
+            else:
+                assert np.array_equal(result, expected)
+            print(
+                f'{features:>9} {mode:>12} {peak / 2**20:>9.1f} {elapsed:>8.2f} '
+                f'{result.size:>12}'
+            )
+            del result
+        del expected
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# Copyright 2022 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of gradient sums of one SS-XGB tree level in SPU mode.
+
+Compares the dense samples x buckets map (default) with the samples x features
+bucket ids of compact_buckets=True, both run by a two party SEMI2K SPU
+simulator. The input column is the bytes of secret shares sent by the data
+owners, the run column is the bytes sent by one party during execution, as
+reported by SPU profiling. Each run is in a new process, the peak column is
+the peak resident memory of that process.
+
+Usage:
+    python -m benchmark.ss_xgb_buckets_map_spu --rows 10000 --features 10 50 --buckets 16 64
+"""
+
+import argparse
+import multiprocessing
+import resource
+from concurrent.futures import ProcessPoolExecutor
+
+import jax.numpy as jnp
+import numpy as np
+import spu
+from spu.utils.simulation import Simulator
+
+from benchmark.woe_binning_spu import run_profiled
+from secretflow.ml.boost.ss_xgb_v.core.node_split import bucket_ids_gradient_sums
+from secretflow.ml.boost.ss_xgb_v.core.tree_worker import build_buckets_map
+
+
+def run_level(mode, sgh, bucket_ids, feature_buckets):
+    sim = Simulator.simple(
+        2, spu.spu_pb2.ProtocolKind.SEMI2K, spu.spu_pb2.FieldType.FM64
+    )
+    sim.rt_config.enable_pphlo_profile = True
+    if mode == 'dense':
+        fn = lambda sgh, m: jnp.matmul(sgh, m)
+        data = build_buckets_map(bucket_ids, feature_buckets)
+    else:
+        fn = lambda sgh, ids: bucket_ids_gradient_sums(sgh, ids, feature_buckets)
+        data = bucket_ids
+    result, elapsed, sent = run_profiled(sim, fn, sgh, data)
+    # kilobytes on linux.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 2**10
+    return result, data.size, elapsed, sent, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--features', type=int, nargs='+', default=[10, 50])
+    parser.add_argument('--buckets', type=int, nargs='+', default=[16, 64])
+    # left children of the level, sgh has their g and h rows.
+    parser.add_argument('--nodes', type=int, default=8)
+    args = parser.parse_args()
+
+    # FM64 share of one element, sent to the other party.
+    share_bytes = 8
+    rng = np.random.default_rng(0)
+    sgh = rng.standard_normal((2 * args.nodes, args.rows)).astype(np.float32)
+    print(
+        f'{"features":>9} {"buckets":>8} {"mode":>8} {"input(MB)":>10} '
+        f'{"run(MB)":>8} {"time(s)":>8} {"peak(MB)":>9} {"same sums":>10}'
+    )
+    for features in args.features:
+        for buckets in args.buckets:
+            # qcut gives buckets + 1 buckets at most.
+            feature_buckets = (buckets + 1,) * features
+            bucket_ids = rng.integers(
+                0, buckets + 1, size=(args.rows, features)
+            ).astype(np.int8)
+
+            expected = None
+            for mode in ('dense', 'compact'):
+                with ProcessPoolExecutor(
+                    1, mp_context=multiprocessing.get_context('spawn')
+                ) as pool:
+                    result, size, elapsed, sent, peak = pool.submit(
+                        run_level, mode, sgh, bucket_ids, feature_buckets
+                    ).result()
+                if expected is None:
+                    expected = result
+                run_mb = f'{sent / 2**20:.1f}' if sent is not None else 'n/a'
+                same = np.allclose(result, expected, rtol=1e-3, atol=1e-2)
+                print(
+                    f'{features:>9} {buckets:>8} {mode:>8} '
+                    f'{size * share_bytes / 2**20:>10.1f} {run_mb:>8} '
+                    f'{elapsed:>8.2f} {peak / 2**20:>9.1f} {str(same):>10}'
+                )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+# Copyright 2022 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of gradient sums of one tree level in SS-XGB.
+
+Compares the per node loop used before, which runs two matmuls for every left
+child node and gathers the sampled buckets map on every level, with the level
+batched find_best_split_bucket on one tree. Secret multiplications (mul and
+dot_general in the traced program) are counted as a proxy of communication
+rounds, each of them needs at least one round in SPU.
+
+Usage:
+    python -m benchmark.ss_xgb_level_split --rows 100000 --buckets 1000 --depth 6
+"""
+
+import argparse
+import time
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+import spu
+
+import secretflow as sf
+from secretflow.device.device.base import MoveConfig
+from secretflow.device.device.spu import SPUCompilerNumReturnsPolicy
+from secretflow.ml.boost.ss_xgb_v.core import node_split as split_fn
+from secretflow.utils.testing import unused_tcp_port
+
+
+def per_node_find_best_split_bucket(context, nodes_s, last_level):
+    l_nodes_s = [s for idx, s in enumerate(nodes_s) if idx % 2 == 0]
+    if 'cache' in context:
+        GL_cache, HL_cache = context['cache']
+    else:
+        GL_cache, HL_cache = None, None
+
+    buckets_map = context['buckets_map']
+    if 'col_choices' in context:
+        buckets_map = buckets_map[:, context['col_choices']]
+    if 'sub_choices' in context:
+        buckets_map = buckets_map[context['sub_choices'], :]
+
+    level_nodes_G = list()
+    level_nodes_H = list()
+    for idx, s in enumerate(l_nodes_s):
+        if 'sub_choices' in context:
+            s = s[:, context['sub_choices']]
+        lchild_GL = jnp.matmul(context['g'] * s, buckets_map)
+        lchild_HL = jnp.matmul(context['h'] * s, buckets_map)
+        level_nodes_G.append(lchild_GL)
+        level_nodes_H.append(lchild_HL)
+        if GL_cache is not None:
+            level_nodes_G.append(GL_cache[idx] - lchild_GL)
+            level_nodes_H.append(HL_cache[idx] - lchild_HL)
+
+    if not last_level:
+        context['cache'] = (level_nodes_G, level_nodes_H)
+    elif 'cache' in context:
+        del context['cache']
+
+    GL = jnp.concatenate(level_nodes_G, axis=0)
+    HL = jnp.concatenate(level_nodes_H, axis=0)
+    GR = GL[:, -1].reshape(-1, 1) - GL
+    HR = HL[:, -1].reshape(-1, 1) - HL
+    obj_l = split_fn.compute_obj(GL, HL, context['reg_lambda'])
+    obj_r = split_fn.compute_obj(GR, HR, context['reg_lambda'])
+    gain = obj_l + obj_r - obj_l[:, -1].reshape(-1, 1)
+    return jnp.argmax(gain, axis=1), context
+
+
+def secret_muls(fn, context, nodes_s, last_level):
+    jaxpr = jax.make_jaxpr(lambda c, s: fn(c, s, last_level))(context, nodes_s)
+    return sum(e.primitive.name in ('mul', 'dot_general') for e in jaxpr.eqns)
+
+
+def plain_tree_context(args, col_choices, level):
+    # shapes of a tree context at the level, to trace the programs only.
+    sub_rows = int(args.rows * args.subsample)
+    context = {
+        'buckets_map': np.zeros((args.rows, args.buckets), np.int8),
+        'col_choices': col_choices,
+        'sub_choices': np.arange(sub_rows),
+        'g': np.zeros((1, sub_rows)),
+        'h': np.zeros((1, sub_rows)),
+        'reg_lambda': 0.1,
+    }
+    context['tree_buckets_map'] = np.zeros((sub_rows, len(col_choices)), np.int8)
+    if level:
+        cache = np.zeros((2 ** (level - 1), len(col_choices)))
+        context['cache'] = (cache, cache)
+    return context
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--buckets', type=int, default=1000)
+    parser.add_argument('--depth', type=int, default=6)
+    parser.add_argument('--subsample', type=float, default=0.8)
+    parser.add_argument('--colsample', type=float, default=0.8)
+    args = parser.parse_args()
+
+    sf.init(['alice', 'bob'], num_cpus=16, log_to_driver=False)
+    cluster_def = {
+        'nodes': [
+            {
+                'party': p,
+                'id': f'local:{i}',
+                'address': f'127.0.0.1:{unused_tcp_port()}',
+            }
+            for i, p in enumerate(['alice', 'bob'])
+        ],
+        'runtime_config': {
+            'protocol': spu.spu_pb2.SEMI2K,
+            'field': spu.spu_pb2.FM128,
+        },
+    }
+    spu_device = sf.SPU(cluster_def)
+    alice, bob = sf.PYU('alice'), sf.PYU('bob')
+
+    rng = np.random.default_rng(0)
+    buckets_map = alice(
+        lambda: (rng.random((args.rows, args.buckets)) < 0.5).astype(np.int8)
+    )()
+    y = bob(lambda: (rng.random(args.rows) < 0.5).astype(np.float32))()
+    col_choices = np.sort(
+        rng.choice(args.buckets, int(args.buckets * args.colsample), replace=False)
+    )
+    context = spu_device(split_fn.global_setup)(
+        [buckets_map.to(spu_device)], y.to(spu_device), 42, 0.1, 0.3
+    )
+    pred = spu_device(split_fn.init_pred, static_argnames=('base', 'samples'))(
+        base=0.0, samples=args.rows
+    )
+    context = spu_device(
+        split_fn.tree_setup, static_argnames=('objective', 'samples', 'subsample')
+    )(
+        context,
+        pred,
+        [alice(lambda: col_choices)().to(spu_device, MoveConfig(spu_vis='public'))],
+        objective=split_fn.RegType.Logistic,
+        samples=args.rows,
+        subsample=args.subsample,
+    )
+    sf.wait([context])
+
+    print(
+        f'{"level":>6} {"nodes":>6} {"muls old":>9} {"muls new":>9} '
+        f'{"old(s)":>8} {"new(s)":>8} {"speedup":>8} {"same split":>11}'
+    )
+    old_context, new_context = context, context
+    for level in range(args.depth):
+        last_level = level == args.depth - 1
+        nodes_s = [
+            bob(lambda: (rng.random((1, args.rows)) < 0.5).astype(np.int8))().to(
+                spu_device
+            )
+            for _ in range(2**level)
+        ]
+        plain_s = [np.zeros((1, args.rows), np.int8)] * 2**level
+        plain_context = plain_tree_context(args, col_choices, level)
+        muls_old = secret_muls(
+            per_node_find_best_split_bucket, plain_context, plain_s, last_level
+        )
+        plain_context = plain_tree_context(args, col_choices, level)
+        muls_new = secret_muls(
+            split_fn.find_best_split_bucket, plain_context, plain_s, last_level
+        )
+
+        start = time.perf_counter()
+        expected, old_context = spu_device(
+            per_node_find_best_split_bucket,
+            static_argnames='last_level',
+            num_returns_policy=SPUCompilerNumReturnsPolicy.FROM_USER,
+            user_specified_num_returns=2,
+        )(old_context, nodes_s, last_level=last_level)
+        expected = sf.reveal(expected)
+        t_old = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result, new_context = spu_device(
+            split_fn.find_best_split_bucket,
+            static_argnames='last_level',
+            num_returns_policy=SPUCompilerNumReturnsPolicy.FROM_USER,
+            user_specified_num_returns=2,
+        )(new_context, nodes_s, last_level=last_level)
+        result = sf.reveal(result)
+        t_new = time.perf_counter() - start
+
+        print(
+            f'{level:>6} {2**level:>6} {muls_old:>9} {muls_new:>9} '
+            f'{t_old:>8.2f} {t_new:>8.2f} {t_old / t_new:>7.1f}x '
+            f'{np.mean(result == expected):>11.3f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
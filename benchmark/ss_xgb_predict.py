@@ -0,0 +1,146 @@
+# Copyright 2022 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of SS-XGB inference with many trees.
+
+Compares the per tree loop used before, which runs one spu call and waits for
+every tree, with XgbModel.predict which evaluates a batch of trees by one spu
+call. Trees are random full trees of the given depth.
+
+Usage:
+    python -m benchmark.ss_xgb_predict --rows 10000 --trees 10 100 500 --depth 5
+"""
+
+import argparse
+import time
+
+import jax.numpy as jnp
+import numpy as np
+import spu
+
+import secretflow as sf
+from secretflow.data import FedNdarray, PartitionWay
+from secretflow.ml.boost.ss_xgb_v import XgbModel
+from secretflow.ml.boost.ss_xgb_v.core import node_split as split_fn
+from secretflow.ml.boost.ss_xgb_v.core.node_split import RegType
+from secretflow.ml.boost.ss_xgb_v.core.tree_worker import XgbTreeWorker
+from secretflow.ml.boost.ss_xgb_v.core.xgb_tree import XgbTree
+from secretflow.utils.testing import unused_tcp_port
+
+
+def per_tree_predict(model, x):
+    workers = [XgbTreeWorker(0, device=pyu) for pyu in x.partitions]
+    preds = []
+    for tree, weight in zip(model.trees, model.weights):
+        selects = [
+            w.predict_weight_select(x.partitions[w.device].data, tree[w.device]).to(
+                model.spu
+            )
+            for w in workers
+        ]
+        pred = model.spu(split_fn.predict_tree_weight)(selects, weight)
+        sf.wait([pred])
+        preds.append(pred)
+    return model.spu(lambda ps: jnp.sum(jnp.concatenate(ps, axis=0), axis=0))(preds)
+
+
+def random_tree(seed, features, depth, known):
+    rng = np.random.default_rng(seed)
+    tree = XgbTree()
+    for _ in range(2**depth - 1):
+        if rng.random() < known:
+            tree.insert_split_node(int(rng.integers(features)), float(rng.normal()))
+        else:
+            tree.insert_split_node(-1, float('inf'))
+    return tree
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--features', type=int, default=10)
+    parser.add_argument('--trees', type=int, nargs='+', default=[10, 100, 500])
+    parser.add_argument('--depth', type=int, default=5)
+    parser.add_argument('--trees-per-batch', type=int, default=None)
+    args = parser.parse_args()
+
+    sf.init(['alice', 'bob'], num_cpus=16, log_to_driver=False)
+    cluster_def = {
+        'nodes': [
+            {
+                'party': p,
+                'id': f'local:{i}',
+                'address': f'127.0.0.1:{unused_tcp_port()}',
+            }
+            for i, p in enumerate(['alice', 'bob'])
+        ],
+        'runtime_config': {
+            'protocol': spu.spu_pb2.SEMI2K,
+            'field': spu.spu_pb2.FM128,
+        },
+    }
+    spu_device = sf.SPU(cluster_def)
+    alice, bob = sf.PYU('alice'), sf.PYU('bob')
+
+    x = FedNdarray(
+        {
+            pyu: pyu(
+                lambda seed: np.random.default_rng(seed).normal(
+                    size=(args.rows, args.features)
+                )
+            )(i)
+            for i, pyu in enumerate((alice, bob))
+        },
+        partition_way=PartitionWay.VERTICAL,
+    )
+
+    print(
+        f'{"trees":>6} {"per tree(s)":>12} {"batched(s)":>11} {"speedup":>8} '
+        f'{"max err":>8}'
+    )
+    for trees in args.trees:
+        model = XgbModel(spu_device, RegType.Linear, 0.0)
+        for t in range(trees):
+            model.trees.append(
+                {
+                    pyu: pyu(random_tree)(t * 2 + i, args.features, args.depth, 0.5)
+                    for i, pyu in enumerate((alice, bob))
+                }
+            )
+            model.weights.append(
+                alice(
+                    lambda seed: np.random.default_rng(seed).normal(
+                        size=(2**args.depth, 1)
+                    )
+                )(t).to(spu_device)
+            )
+        sf.wait(model.weights)
+
+        start = time.perf_counter()
+        expected = sf.reveal(per_tree_predict(model, x))
+        t_old = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = sf.reveal(model.predict(x, trees_per_batch=args.trees_per_batch))
+        t_new = time.perf_counter() - start
+
+        err = np.max(np.abs(result.reshape(-1) - expected.reshape(-1)))
+        print(
+            f'{trees:>6} {t_old:>12.2f} {t_new:>11.2f} {t_old / t_new:>7.1f}x '
+            f'{err:>8.1e}'
+        )
+
+
+if __name__ == '__main__':
+    main()
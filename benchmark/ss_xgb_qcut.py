@@ -0,0 +1,137 @@
+# Copyright 2022 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of quantile bucketing in SS-XGB global setup.
+
+Compares the per sample python walk and np.vectorize binary search used before
+with qcut, run feature by feature and by a thread pool across features, and
+checks that both produce the same split points and buckets.
+
+Usage:
+    python -m benchmark.ss_xgb_qcut --rows 100000 --features 10 100 --buckets 10 64
+"""
+
+import argparse
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from secretflow.ml.boost.ss_xgb_v.core.tree_worker import qcut
+
+
+def loop_qcut(x, buckets):
+    sorted_x = np.sort(x, axis=0)
+    remained_count = len(sorted_x)
+    assert remained_count > 0, 'can not qcut empty x'
+
+    value_category = list()
+    last_value = None
+
+    split_points = list()
+    expected_bin_count = math.ceil(remained_count / buckets)
+    current_bin_count = 0
+    for v in sorted_x:
+        if v != last_value:
+            if len(value_category) <= buckets:
+                value_category.append(v)
+
+            if current_bin_count >= expected_bin_count:
+                split_points.append(v)
+                if len(split_points) == buckets - 1:
+                    break
+                remained_count -= current_bin_count
+                expected_bin_count = math.ceil(
+                    remained_count / (buckets - len(split_points))
+                )
+                current_bin_count = 0
+
+            last_value = v
+        current_bin_count += 1
+
+    if len(value_category) <= buckets:
+        # full dataset category count <= buckets
+        # use category as split point.
+        split_points = value_category[1:]
+    elif split_points[-1] != sorted_x[-1]:
+        # add max sample value into split_points like xgboost.
+        split_points.append(sorted_x[-1])
+
+    split_points = list(map(float, split_points))
+
+    def upper_bound_bin(x: float):
+        count = len(split_points)
+        pos = 0
+        while count > 0:
+            step = math.floor(count / 2)
+            v = split_points[pos + step]
+            if x == v:
+                return pos + step + 1
+            elif x > v:
+                pos = pos + step + 1
+                count -= step + 1
+            else:
+                count = step
+        return pos
+
+    bins = np.vectorize(upper_bound_bin)(x)
+
+    return bins, split_points
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--features', type=int, nargs='+', default=[10, 100])
+    parser.add_argument('--buckets', type=int, nargs='+', default=[10, 64])
+    parser.add_argument('--threads', type=int, default=None)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(
+        f'{"features":>9} {"buckets":>8} {"loop(s)":>8} {"qcut(s)":>8} '
+        f'{"threads(s)":>11} {"speedup":>8}'
+    )
+    for features in args.features:
+        x = rng.normal(size=(args.rows, features))
+        # some discrete features with less distinct values than buckets.
+        x[:, ::4] = np.round(x[:, ::4])
+        for buckets in args.buckets:
+            start = time.perf_counter()
+            expected = [loop_qcut(x[:, f], buckets) for f in range(features)]
+            t_loop = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = [qcut(x[:, f], buckets) for f in range(features)]
+            t_qcut = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(args.threads) as executor:
+                result = list(
+                    executor.map(lambda f: qcut(x[:, f], buckets), range(features))
+                )
+            t_threads = time.perf_counter() - start
+
+            for (e_bins, e_points), (bins, points) in zip(expected, result):
+                assert e_points == points
+                assert np.array_equal(e_bins, bins)
+            print(
+                f'{features:>9} {buckets:>8} {t_loop:>8.2f} {t_qcut:>8.2f} '
+                f'{t_threads:>11.2f} {t_loop / t_threads:>7.1f}x'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+# Copyright 2022 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of computing leaf selects of one SS-XGB tree in a worker.
+
+The row by row traversal is only run on a sample of rows and extrapolated,
+since it takes hours on large datasets.
+
+Usage:
+    python -m benchmark.ss_xgb_tree_select --rows 1000000 --depths 3 6 10 16
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from secretflow.ml.boost.ss_xgb_v.core.tree_worker import predict_tree_select
+
+
+def row_by_row_select(x, split_features, split_values):
+    split_nodes = len(split_features)
+    select = np.zeros((x.shape[0], split_nodes + 1), dtype=np.int8)
+    for r in range(x.shape[0]):
+        row = x[r, :]
+        idxs = [0]
+        while len(idxs):
+            idx = idxs.pop(0)
+            if idx < split_nodes:
+                f = split_features[idx]
+                if f == -1:
+                    idxs.append(idx * 2 + 1)
+                    idxs.append(idx * 2 + 2)
+                elif row[f] < split_values[idx]:
+                    idxs.append(idx * 2 + 1)
+                else:
+                    idxs.append(idx * 2 + 2)
+            else:
+                select[r, idx - split_nodes] = 1
+    return select
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--features', type=int, default=50)
+    parser.add_argument('--depths', type=int, nargs='+', default=[3, 6, 10, 16])
+    parser.add_argument('--sample_rows', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=None)
+    parser.add_argument(
+        '--other_ratio',
+        type=float,
+        default=0.5,
+        help='ratio of nodes split by other partitions',
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(args.rows, args.features))
+    print(f'{"depth":>6} {"old(s, est.)":>14} {"new(s)":>10} {"speedup":>8}')
+    for depth in args.depths:
+        nodes = 2**depth - 1
+        split_features = rng.integers(0, args.features, size=nodes)
+        split_features[rng.random(nodes) < args.other_ratio] = -1
+        split_values = rng.normal(size=nodes)
+
+        sample = x[: args.sample_rows]
+        start = time.perf_counter()
+        expected = row_by_row_select(sample, split_features, split_values)
+        t_old = (time.perf_counter() - start) * args.rows / len(sample)
+
+        start = time.perf_counter()
+        select = predict_tree_select(
+            x, split_features, split_values, threads=args.threads
+        )
+        t_new = time.perf_counter() - start
+
+        np.testing.assert_array_equal(select[: len(sample)], expected)
+        print(f'{depth:>6} {t_old:>14.3f} {t_new:>10.3f} {t_old / t_new:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
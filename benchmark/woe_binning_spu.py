@@ -0,0 +1,113 @@
+# Copyright 2022 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of bin sums of vertical WOE binning in SPU mode.
+
+Compares the dense samples x bins select matrix (default) with the samples x
+features bin ids of compact_bins=True, both run by a two party SEMI2K SPU
+simulator. The input column is the bytes of secret shares sent by the data
+owner, the run column is the bytes sent by one party during execution, as
+reported by SPU profiling.
+
+Usage:
+    python -m benchmark.woe_binning_spu --rows 100000 --features 10 --bins 10 100 1000
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+import jax.numpy as jnp
+import numpy as np
+import spu
+from spu.utils.simulation import Simulator, sim_jax
+
+from secretflow.preprocessing.binning.vert_woe_binning import bin_ids_positive_sums
+
+
+def run_profiled(sim, fn, *args):
+    # SPU logs profiling from C++, capture stdout and stderr by their fds.
+    sys.stdout.flush()
+    with tempfile.TemporaryFile() as log:
+        saved = [os.dup(fd) for fd in (1, 2)]
+        for fd in (1, 2):
+            os.dup2(log.fileno(), fd)
+        try:
+            start = time.perf_counter()
+            result = sim_jax(sim, fn)(*args)
+            elapsed = time.perf_counter() - start
+        finally:
+            for fd, saved_fd in zip((1, 2), saved):
+                os.dup2(saved_fd, fd)
+                os.close(saved_fd)
+        log.seek(0)
+        sent = re.findall(rb'Link details: total send bytes (\d+)', log.read())
+    return np.asarray(result), elapsed, int(sent[-1]) if sent else None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--features', type=int, default=10)
+    parser.add_argument('--bins', type=int, nargs='+', default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    sim = Simulator.simple(
+        2, spu.spu_pb2.ProtocolKind.SEMI2K, spu.spu_pb2.FieldType.FM64
+    )
+    sim.rt_config.enable_pphlo_profile = True
+    # FM64 share of one element, sent to the other party.
+    share_bytes = 8
+
+    rng = np.random.default_rng(0)
+    label = (rng.random(args.rows) < 0.5).astype(np.float32)
+    print(
+        f'{"bins":>6} {"mode":>8} {"input(MB)":>10} {"run(MB)":>8} '
+        f'{"time(s)":>8} {"same sums":>10}'
+    )
+    for bins in args.bins:
+        # the last id of each feature is its np.nan bin.
+        bin_ids = rng.integers(0, bins + 1, size=(args.rows, args.features))
+        feature_bins = (bins,) * args.features
+        else_bins = (1,) * args.features
+        select = np.concatenate(
+            [bin_ids[:, f, None] == np.arange(bins) for f in range(args.features)]
+            + [bin_ids[:, f, None] == bins for f in range(args.features)],
+            axis=1,
+        ).astype(np.float32)
+
+        expected = None
+        for mode, fn, data in (
+            ('dense', lambda l, s: jnp.matmul(l, s), select),
+            (
+                'compact',
+                lambda l, ids: bin_ids_positive_sums(l, ids, feature_bins, else_bins),
+                bin_ids.astype(np.int32),
+            ),
+        ):
+            result, elapsed, sent = run_profiled(sim, fn, label, data)
+            if expected is None:
+                expected = result
+            run_mb = f'{sent / 2**20:.1f}' if sent is not None else 'n/a'
+            print(
+                f'{bins:>6} {mode:>8} {data.size * share_bytes / 2**20:>10.1f} '
+                f'{run_mb:>8} {elapsed:>8.2f} {str(np.allclose(result, expected)):>10}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -14,7 +14,7 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Union, List, Callable
+from typing import Callable, List, Tuple, Union
 
 import pandas as pd
 from pandas.core.indexes.base import Index
@@ -58,16 +58,78 @@ class DataFrameBase(ABC):
         pass
 
 
+@dataclass
+class PartitionMeta:
+    """Metadata of a partition, which is cached in driver.
+
+    Attributes:
+        columns (Index): column labels, None if the partition is a Series.
+        dtypes (pd.Series): dtypes of columns.
+        shape (Tuple): shape of the partition.
+    """
+
+    columns: Index
+    dtypes: pd.Series
+    shape: Tuple
+
+
+def _get_meta(df: Union[pd.DataFrame, pd.Series]) -> PartitionMeta:
+    if isinstance(df, pd.DataFrame):
+        return PartitionMeta(df.columns, df.dtypes, df.shape)
+    return PartitionMeta(None, pd.Series({df.name: df.dtype}), df.shape)
+
+
+def fetch_meta(partitions: List['Partition']):
+    """Fetch metadata of partitions whose cache is missing or stale.
+
+    The metadata of all partitions are revealed together, so parties compute
+    them in parallel and the driver waits only once.
+
+    Args:
+        partitions (List[Partition]): partitions to fetch metadata.
+    """
+    stale = [part for part in partitions if not part._meta_valid()]
+    if not stale:
+        return
+    metas = reveal([part.data.device(_get_meta)(part.data) for part in stale])
+    for part, meta in zip(stale, metas):
+        part._set_meta(meta)
+
+
 @dataclass
 class Partition(DataFrameBase):
     """Slice of data that makes up horizontal, vertical and mixed partitioned DataFrame.
 
+    Metadata (columns, dtypes and shape) is revealed once and cached in driver.
+    The cache is bound to the referred data, so it is invalidated whenever
+    `data` is replaced, e.g. by `__setitem__` or inplace operations.
+
     Attributes:
         data (PYUObject): Reference to pandas.DataFrame located in local node.
     """
 
     data: PYUObject = None
 
+    def __post_init__(self):
+        self._meta = None
+        self._meta_data = None
+        self._index = None
+        self._index_data = None
+
+    def _meta_valid(self) -> bool:
+        return self._meta is not None and self._meta_data is self.data
+
+    def _set_meta(self, meta: PartitionMeta):
+        self._meta = meta
+        self._meta_data = self.data
+
+    @property
+    def meta(self) -> PartitionMeta:
+        """Returns the cached metadata, fetch it if the cache is missing or stale."""
+        if not self._meta_valid():
+            fetch_meta([self])
+        return self._meta
+
     def __partition_wrapper(self, fn: Callable, *args, **kwargs) -> 'Partition':
         return Partition(self.data.device(fn)(self.data, *args, **kwargs))
 
@@ -257,21 +319,18 @@ class Partition(DataFrameBase):
         return self.data.device(lambda df: df.values)(self.data)
 
     @property
-    @reveal
     def index(self):
         """Returns the index (row labels) of the DataFrame."""
-        return self.data.device(lambda df: df.index)(self.data)
+        if self._index is None or self._index_data is not self.data:
+            self._index = reveal(self.data.device(lambda df: df.index)(self.data))
+            self._index_data = self.data
+        return self._index
 
     @property
-    @reveal
     def dtypes(self):
         """Returns the dtypes in the DataFrame."""
         # return series always.
-        return self.data.device(
-            lambda df: df.dtypes
-            if isinstance(df, pd.DataFrame)
-            else pd.Series({df.name: df.types})
-        )(self.data)
+        return self.meta.dtypes.copy()
 
     def astype(self, dtype, copy: bool = True, errors: str = "raise"):
         """
@@ -284,16 +343,18 @@ class Partition(DataFrameBase):
         )
 
     @property
-    @reveal
     def columns(self):
         """Returns the column labels of the DataFrame."""
-        return self.data.device(lambda df: df.columns)(self.data)
+        columns = self.meta.columns
+        if columns is None:
+            # not a DataFrame, let the underlying object raise.
+            return reveal(self.data.device(lambda df: df.columns)(self.data))
+        return columns
 
     @property
-    @reveal
     def shape(self):
         """Returns a tuple representing the dimensionality of the DataFrame."""
-        return self.data.device(lambda df: df.shape)(self.data)
+        return self.meta.shape
 
     def iloc(self, index: Union[int, slice, List[int]]) -> 'Partition':
         """Integer-location based indexing for selection by position.
@@ -421,10 +482,9 @@ class Partition(DataFrameBase):
         """Save DataFrame to csv file."""
         return self.data.device(to_csv_wrapper)(self.data, filepath, **kwargs)
 
-    @reveal
     def __len__(self):
         """Returns the number of rows."""
-        return self.data.device(lambda df: len(df))(self.data)
+        return self.meta.shape[0]
 
     def __getitem__(self, item: Union[str, List[str]]) -> 'Partition':
         """Get columns from DataFrame.
@@ -440,7 +500,22 @@ class Partition(DataFrameBase):
         item_list = item
         if not isinstance(item, (list, tuple, Index)):
             item_list = [item_list]
-        return self.__partition_wrapper(pd.DataFrame.__getitem__, item_list)
+        new_part = self.__partition_wrapper(pd.DataFrame.__getitem__, item_list)
+        if (
+            self._meta_valid()
+            and self._meta.columns is not None
+            and self._meta.columns.is_unique
+            and all(col in self._meta.columns for col in item_list)
+        ):
+            # derive metadata locally instead of revealing again.
+            new_part._set_meta(
+                PartitionMeta(
+                    self._meta.columns.take(self._meta.columns.get_indexer(item_list)),
+                    self._meta.dtypes[list(item_list)],
+                    (self._meta.shape[0], len(item_list)),
+                )
+            )
+        return new_part
 
     def __setitem__(self, key, value):
         """Assign values to columns.
@@ -466,4 +541,7 @@ class Partition(DataFrameBase):
 
     def copy(self):
         """Shallow copy."""
-        return Partition(self.data)
+        new_part = Partition(self.data)
+        if self._meta_valid():
+            new_part._set_meta(self._meta)
+        return new_part
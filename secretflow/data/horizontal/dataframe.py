@@ -18,7 +18,7 @@ from typing import Dict, Union
 import numpy as np
 import pandas as pd
 
-from secretflow.data.base import DataFrameBase, Partition
+from secretflow.data.base import DataFrameBase, Partition, fetch_meta
 from secretflow.data.ndarray import FedNdarray, PartitionWay
 from secretflow.device import PYU, reveal
 from secretflow.security.aggregation.aggregator import Aggregator
@@ -288,6 +288,7 @@ class HDataFrame(DataFrameBase):
     def shape(self):
         """Return a tuple representing the dimensionality of the DataFrame."""
         self._check_parts()
+        fetch_meta(list(self.partitions.values()))
         shapes = [part.shape for part in self.partitions.values()]
         return (sum([shape[0] for shape in shapes]), shapes[0][1])
 
@@ -426,6 +427,7 @@ class HDataFrame(DataFrameBase):
         ]
 
     def __len__(self):
+        fetch_meta(list(self.partitions.values()))
         return sum([len(part) for part in self.partitions.values()])
 
     def __getitem__(self, item) -> 'HDataFrame':
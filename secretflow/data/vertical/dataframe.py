@@ -17,7 +17,7 @@ from typing import Callable, Dict, List, Union
 
 import pandas as pd
 from pandas.core.indexes.base import Index
-from secretflow.data.base import DataFrameBase, Partition
+from secretflow.data.base import DataFrameBase, Partition, fetch_meta
 from secretflow.data.ndarray import FedNdarray, PartitionWay
 from secretflow.device import PYU, Device, reveal
 from secretflow.utils.errors import InvalidArgumentError, NotFoundError
@@ -235,6 +235,7 @@ class VDataFrame(DataFrameBase):
         Returns:
             pd.Series: the data type of each column.
         """
+        fetch_meta(list(self.partitions.values()))
         return pd.concat([part.dtypes for part in self.partitions.values()])
 
     def astype(self, dtype, copy: bool = True, errors: str = "raise"):
@@ -274,6 +275,7 @@ class VDataFrame(DataFrameBase):
         The column labels of the DataFrame.
         """
         self._check_parts()
+        fetch_meta(list(self.partitions.values()))
         cols = None
         for part in self.partitions.values():
             if cols is None:
@@ -286,6 +288,7 @@ class VDataFrame(DataFrameBase):
     def shape(self):
         """Return a tuple representing the dimensionality of the DataFrame."""
         self._check_parts()
+        fetch_meta(list(self.partitions.values()))
         shapes = [part.shape for part in self.partitions.values()]
         return (shapes[0][0], sum([shape[1] for shape in shapes]))
 
@@ -571,6 +574,7 @@ class VDataFrame(DataFrameBase):
         """Return the max length if not aligned."""
         parts = list(self.partitions.values())
         assert parts, 'No partitions in VDataFrame.'
+        fetch_meta(parts)
         return max([len(part) for part in parts])
 
     def _col_index(self, col) -> Dict[Device, Union[str, List[str]]]:
@@ -581,10 +585,12 @@ class VDataFrame(DataFrameBase):
         listed_col = col.tolist() if isinstance(col, Index) else col
         if not isinstance(listed_col, (list, tuple)):
             listed_col = [listed_col]
+        fetch_meta(list(self.partitions.values()))
+        part_dtypes = {pyu: part.meta.dtypes for pyu, part in self.partitions.items()}
         for key in listed_col:
             found = False
-            for pyu, part in self.partitions.items():
-                if key not in part.dtypes:
+            for pyu, dtypes in part_dtypes.items():
+                if key not in dtypes:
                     continue
 
                 found = True
@@ -648,6 +654,7 @@ class VDataFrame(DataFrameBase):
         Returns:
             a dict of {pyu: shape}
         """
+        fetch_meta(list(self.partitions.values()))
         return {
             device: partition.shape for device, partition in self.partitions.items()
         }
@@ -660,6 +667,7 @@ class VDataFrame(DataFrameBase):
             a dict of {pyu: columns}
         """
         assert len(self.partitions) > 0, 'Partitions in the dataframe is None or empty.'
+        fetch_meta(list(self.partitions.values()))
         return {
             device: partition.columns for device, partition in self.partitions.items()
         }
@@ -88,6 +88,23 @@ class HEUActor:
 
         return self.evaluator.sum(data)
 
+    def batch_select_sum(self, data, indices):
+        """sum of selected data elements for each indices in a batch,
+        equivalent to [data[i].sum() for i in indices] with one call.
+        Falls back to summing indices one by one if heu has no batch_select_sum"""
+        assert isinstance(
+            data, (hnp.PlaintextArray, hnp.CiphertextArray)
+        ), f"data must be hnp.ndarray type, real type={type(data)}"
+        indices = [i.tolist() if isinstance(i, np.ndarray) else i for i in indices]
+        if hasattr(self.evaluator, 'batch_select_sum'):
+            return self.evaluator.batch_select_sum(data, indices)
+
+        # sf-heu before 0.4 has no batch_select_sum.
+        sums = data[[0] * len(indices)]
+        for i, idx in enumerate(indices):
+            sums[i] = self.evaluator.sum(data[idx])
+        return sums
+
     def encode(self, data: np.ndarray, edr=None):
         """encode cleartext to plaintext
 
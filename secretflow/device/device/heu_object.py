@@ -14,6 +14,7 @@
 import ray
 
 from .base import DeviceObject
+from .pyu import PYUObject
 from .register import dispatch
 
 
@@ -105,6 +106,33 @@ class HEUObject(DeviceObject):
             self.is_plain,
         )
 
+    def batch_select_sum(self, indices):
+        """
+        Sum of selected elements for each indices in a batch.
+
+        Args:
+            indices: list of indices arrays, or a PYUObject of it. A PYUObject
+                must be located in the same party as this object, and the
+                indices are sent to the HEU actor directly.
+
+        Returns:
+            HEUObject of the sums, one element for each indices.
+        """
+        if isinstance(indices, PYUObject):
+            assert indices.device.party == self.location, (
+                f"indices must be located in {self.location}, "
+                f"got {indices.device.party}"
+            )
+            indices = indices.data
+        return HEUObject(
+            self.device,
+            self.device.get_participant(self.location).batch_select_sum.remote(
+                self.data, indices
+            ),
+            self.location,
+            self.is_plain,
+        )
+
     def dump(self, path):
         """Dump ciphertext into files."""
         self.device.get_participant(self.location).dump.remote(self.data, path)
@@ -13,8 +13,11 @@
 # limitations under the License.
 
 import functools
+import hashlib
+import io
 import json
 import logging
+import marshal
 import os
 import shutil
 import struct
@@ -22,10 +25,12 @@ import sys
 import time
 import threading
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum, unique
 from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple, Union
 
+import cloudpickle as pickle
 import jax
 import jax.numpy as jnp
 import numpy as np
@@ -41,7 +46,7 @@ from spu import psi
 from heu import phe
 
 from secretflow.utils.errors import InvalidArgumentError
-from secretflow.utils.ndarray_bigint import BigintNdArray
+from secretflow.utils import ndarray_bigint
 
 from .base import Device, DeviceObject, DeviceType
 from .pyu import PYUObject
@@ -319,20 +324,57 @@ class SPURuntime:
         )
 
         size = spu_fxp_size(self.conf.field)
-        value = BigintNdArray(
-            [
-                int.from_bytes(
-                    value.content[i * size : (i + 1) * size],
-                    sys.byteorder,
-                    signed=True,
-                )
-                for i in range(len(value.content) // size)
-            ],
-            value.shape.dims,
+        value = ndarray_bigint.frombuffer(
+            value.content, size, value.shape.dims, sys.byteorder
         )
 
         return value.to_hnp(encoder=phe.BigintEncoder(schema))
 
+    def _get_rank(self, party: str) -> int:
+        for i, node in enumerate(self.cluster_def['nodes']):
+            if node['party'] == party:
+                return i
+        return -1
+
+    @staticmethod
+    def _psi_items(data: pd.DataFrame, key: List[str]) -> pd.Series:
+        """Join key columns of each row into a single string as PSI item."""
+        missing = [k for k in key if k not in data.columns]
+        if missing:
+            raise RuntimeError(f"can't find feature names {missing} in data.")
+        items = data[key[0]].astype(str)
+        for k in key[1:]:
+            items = items + ',' + data[k].astype(str)
+        return items
+
+    def _mem_psi(
+        self,
+        items: pd.Series,
+        receiver_rank: int,
+        protocol: str,
+        precheck_input: bool,
+        broadcast_result: bool,
+        curve_type: str,
+    ) -> np.ndarray:
+        """Run PSI over in-memory items.
+
+        Returns:
+            np.ndarray: a boolean mask of items in the intersection.
+        """
+        if precheck_input and items.duplicated().any():
+            raise RuntimeError(
+                f'found duplicated keys, e.g. {items[items.duplicated()].iloc[0]}'
+            )
+
+        config = psi.MemoryPsiConfig(
+            psi_type=psi.PsiType.Value(protocol),
+            receiver_rank=receiver_rank,
+            broadcast_result=broadcast_result,
+            curve_type=curve_type,
+        )
+        intersection = psi.mem_psi(self.link, config, items.tolist())
+        return items.isin(intersection).to_numpy()
+
     def psi_df(
         self,
         key: Union[str, List[str]],
@@ -344,6 +386,7 @@ class SPURuntime:
         broadcast_result=True,
         bucket_size=1 << 20,
         curve_type="CURVE_25519",
+        in_memory=False,
     ):
         """Private set intersection with DataFrame.
 
@@ -357,10 +400,25 @@ class SPURuntime:
             broadcast_result (bool): Whether to broadcast joined data to all parties.
             bucket_size (int): Specified the hash bucket size used in psi. Larger values consume more memory.
             curve_type (str): curve for ecdh psi
+            in_memory (bool): Whether to feed keys to PSI from memory and select
+                joined rows by index, which avoids csv round-trips. bucket_size
+                is ignored in this mode.
 
         Returns:
             pd.DataFrame or None: joined DataFrame.
         """
+        if in_memory:
+            return self._psi_df_in_memory(
+                key,
+                data,
+                receiver,
+                protocol,
+                precheck_input,
+                sort,
+                broadcast_result,
+                curve_type,
+            )
+
         # save key dataframe to temp file for streaming psi
         data_dir = f'.data/{self.rank}-{uuid.uuid4()}'
         os.makedirs(data_dir, exist_ok=True)
@@ -393,6 +451,44 @@ class SPURuntime:
         finally:
             shutil.rmtree(data_dir, ignore_errors=True)
 
+    def _psi_df_in_memory(
+        self,
+        key: Union[str, List[str]],
+        data: pd.DataFrame,
+        receiver: str,
+        protocol: str,
+        precheck_input: bool,
+        sort: bool,
+        broadcast_result: bool,
+        curve_type: str,
+    ):
+        if isinstance(key, str):
+            key = [key]
+
+        receiver_rank = self._get_rank(receiver)
+        assert receiver_rank >= 0, f'invalid receiver {receiver}'
+
+        items = self._psi_items(data, key)
+        mask = self._mem_psi(
+            items,
+            receiver_rank,
+            protocol,
+            precheck_input,
+            broadcast_result,
+            curve_type,
+        )
+
+        if not broadcast_result and self.rank != receiver_rank:
+            # can not get result, return None
+            return None
+
+        indices = np.flatnonzero(mask)
+        if sort:
+            indices = indices[
+                np.argsort(items.to_numpy()[indices].astype(str), kind='stable')
+            ]
+        return data.iloc[indices].reset_index(drop=True)
+
     def psi_csv(
         self,
         key: Union[str, List[str]],
@@ -472,6 +568,7 @@ class SPURuntime:
         precheck_input=True,
         bucket_size=1 << 20,
         curve_type="CURVE_25519",
+        in_memory=False,
     ):
         """Private set intersection with DataFrame.
 
@@ -488,10 +585,18 @@ class SPURuntime:
             precheck_input (bool): Whether to check input data before join.
             bucket_size (int): Specified the hash bucket size used in psi. Larger values consume more memory.
             curve_type (str): curve for ecdh psi
+            in_memory (bool): Whether to feed keys to PSI from memory and join
+                rows in memory, which avoids csv round-trips. bucket_size is
+                ignored in this mode.
 
         Returns:
             pd.DataFrame or None: joined DataFrame.
         """
+        if in_memory:
+            return self._psi_join_df_in_memory(
+                key, data, receiver, join_party, protocol, precheck_input, curve_type
+            )
+
         # save key dataframe to temp file for streaming psi
         data_dir = f'.data/{self.rank}-{uuid.uuid4()}'
         os.makedirs(data_dir, exist_ok=True)
@@ -523,6 +628,112 @@ class SPURuntime:
         finally:
             shutil.rmtree(data_dir, ignore_errors=True)
 
+    def _psi_join_df_in_memory(
+        self,
+        key: Union[str, List[str]],
+        data: pd.DataFrame,
+        receiver: str,
+        join_party: str,
+        protocol: str,
+        precheck_input: bool,
+        curve_type: str,
+    ):
+        if isinstance(key, str):
+            key = [key]
+
+        receiver_rank = self._get_rank(receiver)
+        assert receiver_rank >= 0, f'invalid receiver {receiver}'
+        join_rank = self._get_rank(join_party)
+        assert join_rank >= 0, f'invalid receiver {join_party}'
+
+        table_nodup = data.drop_duplicates(subset=key)
+        items = self._psi_items(table_nodup, key)
+        # psi join case, need sort and broadcast set True
+        mask = self._mem_psi(
+            items, receiver_rank, protocol, precheck_input, True, curve_type
+        )
+        indices = np.flatnonzero(mask)
+        indices = indices[
+            np.argsort(items.to_numpy()[indices].astype(str), kind='stable')
+        ]
+        df_psi_out = table_nodup[key].iloc[indices]
+        del table_nodup
+
+        df_psi_join = data.join(
+            df_psi_out.set_index(key), on=key, how='inner', sort="False"
+        )
+        in_file = io.BytesIO(df_psi_join[key].to_csv(index=False).encode())
+        out_file = io.BytesIO()
+        self._exchange_stream(in_file, in_file.getbuffer().nbytes, out_file)
+
+        if out_file.tell() > 0:
+            out_file.seek(0)
+            peer_psi = pd.read_csv(out_file)
+            peer_psi.columns = key
+            peer_psi = peer_psi.astype(data[key].dtypes.to_dict())
+            if join_rank == self.rank:
+                df_psi_join = data.join(
+                    peer_psi.set_index(key), on=key, how='inner', sort="True"
+                )
+            else:
+                df_psi_join = peer_psi.join(
+                    data.set_index(key), on=key, how='inner', sort="True"
+                )
+        else:
+            df_psi_join = pd.DataFrame(columns=key)
+
+        return df_psi_join.reset_index(drop=True)
+
+    def _exchange_stream(self, in_file, in_file_bytes: int, out_file):
+        """Send content of in_file to the next rank and write what the next rank
+        sends into out_file."""
+
+        def send_proc():
+            max_read_bytes = 20480
+            read_bytes = 0
+            while read_bytes < in_file_bytes:
+                current_read_bytes = min(max_read_bytes, in_file_bytes - read_bytes)
+                current_read = in_file.read(current_read_bytes)
+                assert current_read_bytes == len(
+                    current_read
+                ), f'invalid recv msg {current_read_bytes}!={len(current_read)}'
+
+                packed_bytes = struct.pack(
+                    f'?i{len(current_read)}s', False, len(current_read), current_read
+                )
+
+                read_bytes += current_read_bytes
+
+                self.link.send(self.link.next_rank(), packed_bytes)
+                logging.warning(f"rank:{self.rank} send {len(packed_bytes)}")
+
+            # send last batch
+            packed_bytes = struct.pack('?is', True, 1, b'\x00')
+            self.link.send(self.link.next_rank(), packed_bytes)
+            logging.warning(f"rank:{self.rank} send last {len(packed_bytes)}")
+
+        def recv_proc():
+            batch_count = 0
+            while True:
+                recv_bytes = self.link.recv(self.link.next_rank())
+                batch_count += 1
+                logging.warning(f"rank:{self.rank} recv {len(recv_bytes)}")
+
+                r1, r2, r3 = struct.unpack(f'?i{len(recv_bytes)-8}s', recv_bytes)
+                assert r2 == len(r3), f'invalid recv msg {r2}!={len(r3)}'
+                # check if last batch
+                if r1:
+                    logging.warning(f"rank:{self.rank} recv last {len(recv_bytes)}")
+                    break
+                out_file.write(r3)
+
+        if self.rank == 1:
+            send_proc()
+            recv_proc()
+        else:
+            recv_proc()
+            send_proc()
+
     def psi_join_csv(
         self,
         key: Union[str, List[str]],
@@ -630,51 +841,7 @@ class SPURuntime:
         in_file = open(output_path1, "rb")
         out_file = open(output_path2, "wb")
 
-        def send_proc():
-            max_read_bytes = 20480
-            read_bytes = 0
-            while read_bytes < in_file_bytes:
-                current_read_bytes = min(max_read_bytes, in_file_bytes - read_bytes)
-                current_read = in_file.read(current_read_bytes)
-                assert current_read_bytes == len(
-                    current_read
-                ), f'invalid recv msg {current_read_bytes}!={len(current_read)}'
-
-                packed_bytes = struct.pack(
-                    f'?i{len(current_read)}s', False, len(current_read), current_read
-                )
-
-                read_bytes += current_read_bytes
-
-                self.link.send(self.link.next_rank(), packed_bytes)
-                logging.warning(f"rank:{self.rank} send {len(packed_bytes)}")
-
-            # send last batch
-            packed_bytes = struct.pack('?is', True, 1, b'\x00')
-            self.link.send(self.link.next_rank(), packed_bytes)
-            logging.warning(f"rank:{self.rank} send last {len(packed_bytes)}")
-
-        def recv_proc():
-            batch_count = 0
-            while True:
-                recv_bytes = self.link.recv(self.link.next_rank())
-                batch_count += 1
-                logging.warning(f"rank:{self.rank} recv {len(recv_bytes)}")
-
-                r1, r2, r3 = struct.unpack(f'?i{len(recv_bytes)-8}s', recv_bytes)
-                assert r2 == len(r3), f'invalid recv msg {r2}!={len(r3)}'
-                # check if last batch
-                if r1:
-                    logging.warning(f"rank:{self.rank} recv last {len(recv_bytes)}")
-                    break
-                out_file.write(r3)
-
-        if self.rank == 1:
-            send_proc()
-            recv_proc()
-        else:
-            recv_proc()
-            send_proc()
+        self._exchange_stream(in_file, in_file_bytes, out_file)
 
         in_file.close()
         out_file.close()
@@ -736,13 +903,7 @@ def _generate_output_uuid(name):
     return f'{name}-output-{uuid.uuid4()}'
 
 
-@ray.remote(num_returns=2)
-def _spu_compile(spu_name, fn, *meta_args, **meta_kwargs):
-    meta_args, meta_kwargs = jax.tree_util.tree_map(
-        lambda x: ray.get(x) if isinstance(x, ray.ObjectRef) else x,
-        (meta_args, meta_kwargs),
-    )
-
+def _compile(spu_name, fn, meta_args, meta_kwargs):
     # prepare inputs and metatdata.
     input_name = []
     input_vis = []
@@ -771,8 +932,179 @@ def _spu_compile(spu_name, fn, *meta_args, **meta_kwargs):
     return executable, output_tree
 
 
+def _resolve_meta(meta_args, meta_kwargs):
+    return jax.tree_util.tree_map(
+        lambda x: ray.get(x) if isinstance(x, ray.ObjectRef) else x,
+        (meta_args, meta_kwargs),
+    )
+
+
+@ray.remote(num_returns=2)
+def _spu_compile(spu_name, fn, *meta_args, **meta_kwargs):
+    meta_args, meta_kwargs = _resolve_meta(meta_args, meta_kwargs)
+    return _compile(spu_name, fn, meta_args, meta_kwargs)
+
+
+def _fn_fingerprint(fn: Callable, h) -> None:
+    """Feed the identity of fn into hash h.
+
+    cloudpickle serializes functions of importable modules by reference, so
+    the bytecode is hashed as well to tell apart edited functions sharing
+    the same qualified name.
+    """
+    h.update(pickle.dumps(fn))
+    while isinstance(fn, functools.partial):
+        fn = fn.func
+    code = getattr(fn, '__code__', None)
+    if code is not None:
+        h.update(marshal.dumps(code))
+
+
+def _compile_cache_key(spu_name, fn, meta_args, meta_kwargs) -> str:
+    """Key of a compiled executable: the function, its static args (bound via
+    functools.partial) and the shape, dtype and visibility of every input."""
+    h = hashlib.sha256()
+    h.update(f"{getattr(spu, '__version__', '')};{spu_name};".encode())
+    _fn_fingerprint(fn, h)
+    flat_meta, tree = jax.tree_util.tree_flatten((meta_args, meta_kwargs))
+    h.update(str(tree).encode())
+    for meta in flat_meta:
+        h.update(
+            f'{tuple(meta.shape)}|{np.dtype(meta.dtype).str}|{int(meta.vtype)};'.encode()
+        )
+    return h.hexdigest()
+
+
+class SPUCompileCache:
+    def __init__(self, capacity: int = 256, cache_dir: str = None):
+        """A LRU cache of SPU executables with an optional on-disk layer.
+
+        Args:
+            capacity (int): max number of executables kept in memory.
+            cache_dir (str, optional): directory to persist executables, so
+                they survive across processes and sessions. Defaults to None,
+                i.e. in-memory only.
+        """
+        assert capacity > 0, f'capacity shall be positive but got {capacity}.'
+        self.capacity = capacity
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.pkl')
+
+    def get(self, key: str):
+        """Get the cached (executable, output_tree) or None."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+        if self.cache_dir and os.path.exists(self._path(key)):
+            try:
+                with open(self._path(key), 'rb') as f:
+                    value = pickle.load(f)
+            except Exception as error:
+                logging.warning(f'Failed to load spu executable {key}: {error}')
+            else:
+                self._put_in_memory(key, value)
+                self.hits += 1
+                self.disk_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, value):
+        """Put (executable, output_tree) into cache."""
+        self._put_in_memory(key, value)
+        if self.cache_dir:
+            # write to a temp file first so that concurrent readers never
+            # see a partial executable.
+            tmp_path = f'{self._path(key)}.{uuid.uuid4()}'
+            try:
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(value, f)
+                os.replace(tmp_path, self._path(key))
+            except Exception as error:
+                logging.warning(f'Failed to save spu executable {key}: {error}')
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    def _put_in_memory(self, key: str, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Clear in-memory entries and counters, on-disk entries are kept."""
+        self._entries.clear()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+        }
+
+
+@ray.remote
+class SPUCompiler:
+    def __init__(self, capacity: int = 256, cache_dir: str = None):
+        """Compile functions to SPU executables with a compile cache.
+
+        Repeated calls of the same function with inputs of identical shapes,
+        dtypes and visibilities reuse the executable instead of compiling again.
+
+        Args:
+            capacity (int): max number of executables kept in memory.
+            cache_dir (str, optional): directory of the on-disk cache.
+        """
+        self.cache = SPUCompileCache(capacity, cache_dir)
+
+    def compile(self, spu_name, fn, *meta_args, **meta_kwargs):
+        meta_args, meta_kwargs = _resolve_meta(meta_args, meta_kwargs)
+        try:
+            key = _compile_cache_key(spu_name, fn, meta_args, meta_kwargs)
+        except Exception as error:
+            # fn is not fingerprintable, e.g. some closure can not be
+            # pickled again. Just compile without cache.
+            logging.warning(f'Skip spu compile cache: {error}')
+            return _compile(spu_name, fn, meta_args, meta_kwargs)
+
+        value = self.cache.get(key)
+        if value is None:
+            value = _compile(spu_name, fn, meta_args, meta_kwargs)
+            self.cache.put(key, value)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        return self.cache.stats()
+
+    def clear(self):
+        self.cache.clear()
+
+
 class SPU(Device):
-    def __init__(self, cluster_def: Dict, link_desc: Dict = None, name: str = 'SPU'):
+    def __init__(
+        self,
+        cluster_def: Dict,
+        link_desc: Dict = None,
+        name: str = 'SPU',
+        compile_cache: bool = True,
+        compile_cache_size: int = 256,
+        compile_cache_dir: str = None,
+    ):
         """SPU device constructor.
 
         Args:
@@ -824,16 +1156,29 @@ class SPU(Device):
                     7. brpc_channel_protocol refer to `https://github.com/apache/incubator-brpc/blob/master/docs/en/client.md#protocols`
 
                     8. brpc_channel_connection_type refer to `https://github.com/apache/incubator-brpc/blob/master/docs/en/client.md#connection-type`
+            name: optional. Name of the SPU device. Defaults to 'SPU'.
+            compile_cache: optional. Whether to cache compiled executables.
+                Calls of the same function with the same static args and inputs
+                of the same shape, dtype and visibility skip compilation.
+                Defaults to True.
+            compile_cache_size: optional. Max number of executables cached
+                in memory. Defaults to 256.
+            compile_cache_dir: optional. Directory on the first party to persist
+                compiled executables. Defaults to None, i.e. in-memory only.
         """
         super().__init__(DeviceType.SPU)
         self.cluster_def = cluster_def
         self.link_desc = link_desc
+        self.compile_cache = compile_cache
+        self.compile_cache_size = compile_cache_size
+        self.compile_cache_dir = compile_cache_dir
         self.conf = json_format.Parse(
             json.dumps(cluster_def['runtime_config']), spu.RuntimeConfig()
         )
         self.world_size = len(self.cluster_def['nodes'])
         self.name = name
         self.actors = {}
+        self.compiler = None
         self._task_id = -1
         self.io = SPUIO(self.conf, self.world_size)
         self.init()
@@ -845,10 +1190,19 @@ class SPU(Device):
                 resources={node['party']: 1}
             ).remote(rank, self.cluster_def, self.link_desc)
 
+        if self.compile_cache:
+            # it's ok to choose any party to compile,
+            # here we choose party 0.
+            self.compiler = SPUCompiler.options(
+                resources={self.cluster_def['nodes'][0]['party']: 1}
+            ).remote(self.compile_cache_size, self.compile_cache_dir)
+
     def reset(self):
         """Reset spu to clear corrupted internal state, for test only"""
         for actor in self.actors.values():
             ray.kill(actor)
+        if self.compiler is not None:
+            ray.kill(self.compiler)
         time.sleep(0.5)
         self.init()
 
@@ -864,6 +1218,35 @@ class SPU(Device):
 
         return jax.tree_util.tree_map(place, (args, kwargs))
 
+    def compile_cache_stats(self) -> Dict[str, int]:
+        """Get counters of the compile cache.
+
+        Returns:
+            Dict[str, int]: a dict with `hits` (including `disk_hits`), `misses`
+            and `size` (number of executables in memory). An empty dict if
+            the compile cache is disabled.
+        """
+        if self.compiler is None:
+            return {}
+        return ray.get(self.compiler.stats.remote())
+
+    def clear_compile_cache(self):
+        """Clear in-memory executables and counters of the compile cache."""
+        if self.compiler is not None:
+            ray.get(self.compiler.clear.remote())
+
+    def _compile(self, fn, *meta_args, **meta_kwargs):
+        if self.compiler is not None:
+            return self.compiler.compile.options(num_returns=2).remote(
+                self.name, fn, *meta_args, **meta_kwargs
+            )
+
+        # it's ok to choose any party to compile,
+        # here we choose party 0.
+        return _spu_compile.options(
+            resources={self.cluster_def['nodes'][0]['party']: 1}
+        ).remote(self.name, fn, *meta_args, **meta_kwargs)
+
     def __call__(
         self,
         func: Callable,
@@ -886,11 +1269,7 @@ class SPU(Device):
             num_returns = user_specified_num_returns
             meta_args = list(meta_args)
 
-            # it's ok to choose any party to compile,
-            # here we choose party 0.
-            executable, out_shape = _spu_compile.options(
-                resources={self.cluster_def['nodes'][0]['party']: 1}
-            ).remote(self.name, fn, *meta_args, **meta_kwargs)
+            executable, out_shape = self._compile(fn, *meta_args, **meta_kwargs)
 
             if num_returns_policy == SPUCompilerNumReturnsPolicy.FROM_COMPILER:
                 # Since user choose to use num of returns from compiler result,
@@ -951,6 +1330,7 @@ class SPU(Device):
         broadcast_result=True,
         bucket_size=1 << 20,
         curve_type="CURVE_25519",
+        in_memory=False,
     ):
         """Private set intersection with DataFrame.
 
@@ -966,6 +1346,9 @@ class SPU(Device):
             bucket_size (int): Specified the hash bucket size used in psi.
             Larger values consume more memory.
             curve_type (str): curve for ecdh psi
+            in_memory (bool): Whether to feed keys to PSI from memory and select
+            joined rows by index instead of round-tripping through csv files.
+            bucket_size is ignored in this mode.
 
         Returns:
             List[PYUObject]: Joined DataFrames with order reserved.
@@ -982,6 +1365,7 @@ class SPU(Device):
             broadcast_result,
             bucket_size,
             curve_type,
+            in_memory,
         )
 
     def psi_csv(
@@ -1042,6 +1426,7 @@ class SPU(Device):
         precheck_input=True,
         bucket_size=1 << 20,
         curve_type="CURVE_25519",
+        in_memory=False,
     ):
         """Private set intersection with csv file.
 
@@ -1054,6 +1439,7 @@ class SPU(Device):
             precheck_input (bool): Whether check input data before joining, for now, it will check if key duplicate.
             bucket_size (int): Specified the hash bucket size used in psi. Larger values consume more memory.
             curve_type (str): curve for ecdh psi
+            in_memory (bool): Whether to feed keys to PSI from memory and join rows in memory instead of round-tripping through csv files. bucket_size is ignored in this mode.
 
         Returns:
             List[PYUObject]: Joined DataFrames with order reserved.
@@ -1070,6 +1456,7 @@ class SPU(Device):
             precheck_input,
             bucket_size,
             curve_type,
+            in_memory,
         )
 
     def psi_join_csv(
@@ -94,6 +94,7 @@ def psi_df(
     broadcast_result=True,
     bucket_size=1 << 20,
     curve_type="CURVE_25519",
+    in_memory=False,
 ) -> List[PYUObject]:
     assert isinstance(device, SPU), f'device must be SPU device'
     assert isinstance(
@@ -129,6 +130,7 @@ def psi_df(
                     broadcast_result,
                     bucket_size,
                     curve_type,
+                    in_memory,
                 ),
             )
         )
@@ -243,6 +245,7 @@ def psi_join_df(
     precheck_input=True,
     bucket_size=1 << 20,
     curve_type="CURVE_25519",
+    in_memory=False,
 ) -> List[PYUObject]:
     assert isinstance(device, SPU), f'device must be SPU device'
     assert isinstance(
@@ -277,6 +280,7 @@ def psi_join_df(
                     precheck_input,
                     bucket_size,
                     curve_type,
+                    in_memory,
                 ),
             )
         )
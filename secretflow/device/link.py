@@ -12,10 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import dataclasses
 import logging
 import threading
-from threading import Condition
-from typing import Any, Dict, List, Union
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+import ray
 
 from .device import PYU, Device
 
@@ -91,20 +97,121 @@ def recv_from_server(name, version):
     return thread_local.link.recv(name, thread_local.link._server, version)
 
 
+@dataclass
+class _CompressedArray:
+    """A zlib compressed numpy.ndarray in transit."""
+
+    dtype: str
+    shape: Tuple[int, ...]
+    data: bytes
+
+
+def _is_dataclass_instance(value: Any) -> bool:
+    return dataclasses.is_dataclass(value) and not isinstance(value, type)
+
+
+def _map_message(fn, value: Any) -> Any:
+    """Rebuild a (nested) message container with fn applied to its items."""
+    if isinstance(value, tuple) and hasattr(value, '_fields'):
+        # namedtuple takes items as positional arguments.
+        return type(value)(*(fn(v) for v in value))
+    if isinstance(value, (list, tuple)):
+        return type(value)(fn(v) for v in value)
+    if isinstance(value, dict):
+        return {k: fn(v) for k, v in value.items()}
+    if _is_dataclass_instance(value):
+        return dataclasses.replace(
+            value,
+            **{
+                f.name: fn(getattr(value, f.name))
+                for f in dataclasses.fields(value)
+                if f.init
+            },
+        )
+    return value
+
+
+def _compress(value: Any, threshold: int) -> Any:
+    """Compress ndarrays not smaller than threshold bytes in a (nested) message."""
+    if isinstance(value, np.ndarray):
+        if value.dtype != object and value.nbytes >= threshold:
+            return _CompressedArray(
+                value.dtype.str,
+                value.shape,
+                zlib.compress(np.ascontiguousarray(value).data, 1),
+            )
+        return value
+    return _map_message(lambda v: _compress(v, threshold), value)
+
+
+def _decompress(value: Any) -> Any:
+    if isinstance(value, _CompressedArray):
+        return np.frombuffer(
+            zlib.decompress(value.data), dtype=np.dtype(value.dtype)
+        ).reshape(value.shape)
+    return _map_message(_decompress, value)
+
+
+def _payload_size(value: Any) -> int:
+    """Rough size of a message, only large buffers are counted."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, _CompressedArray):
+        return len(value.data)
+    if isinstance(value, (list, tuple)):
+        return sum(_payload_size(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_payload_size(v) for v in value.values())
+    if _is_dataclass_instance(value):
+        return sum(
+            _payload_size(getattr(value, f.name)) for f in dataclasses.fields(value)
+        )
+    return 0
+
+
 class Link:
-    def __init__(self, device: PYU):
+    def __init__(
+        self,
+        device: PYU,
+        batch_delay: float = 0.0,
+        batch_bytes: int = 1 << 20,
+        compress_threshold: int = None,
+        max_inflight: int = 64,
+    ):
         """Initialize
 
         Args:
             device: where this Link instance located, PYU
+            batch_delay: seconds a message may wait to be coalesced with following
+                messages to the same device, 0 means sending at once.
+            batch_bytes: a batch is sent at once when its payload reaches this size.
+            compress_threshold: ndarrays not smaller than this many bytes are
+                compressed with zlib, None means no compression.
+            max_inflight: max batches sent to a device but not yet received, send
+                blocks when reaching the limit. None means unlimited.
         """
         self._device = device
         self._comm: Dict[Device, 'Link'] = {}
         self._initialized = False
         self._messages = {}
-        self._cv = Condition()
+        # receiving side, per key waiters so that a message only wakes up its
+        # receiver.
+        self._recv_lock = threading.Lock()
+        self._waiters: Dict[str, threading.Event] = {}
         self._clients = None
         self._server = None
+        # sending side.
+        self._batch_delay = batch_delay
+        self._batch_bytes = batch_bytes
+        self._compress_threshold = compress_threshold
+        self._max_inflight = max_inflight
+        self._send_lock = threading.RLock()
+        self._batches: Dict[Device, List[Tuple[str, Any]]] = {}
+        self._batch_sizes: Dict[Device, int] = {}
+        self._timers: Dict[Device, threading.Timer] = {}
+        self._inflight: Dict[Device, deque] = {}
 
     def initialize(self, comm: Dict[Device, 'Link']):
         """Initialize networking
@@ -169,11 +276,57 @@ class Link:
         key = self.__create_key(self._device, dst_device, name, step_id)
         logging.debug(f'send message: {key}')
 
+        if self._compress_threshold is not None:
+            value = _compress(value, self._compress_threshold)
         if isinstance(key, str):
-            self._comm[dst_device].recv_message.remote(key, value)
+            self._enqueue(dst_device, key, value)
         else:
             for k, device in zip(key, dst_device):
-                self._comm[device].recv_message.remote(k, value)
+                self._enqueue(device, k, value)
+
+    def _enqueue(self, dst_device: PYU, key: str, value: Any):
+        with self._send_lock:
+            batch = self._batches.setdefault(dst_device, [])
+            batch.append((key, value))
+            self._batch_sizes[dst_device] = self._batch_sizes.get(
+                dst_device, 0
+            ) + _payload_size(value)
+            if (
+                self._batch_delay <= 0
+                or self._batch_sizes[dst_device] >= self._batch_bytes
+            ):
+                self._flush(dst_device)
+            elif dst_device not in self._timers:
+                timer = threading.Timer(self._batch_delay, self._flush, [dst_device])
+                timer.daemon = True
+                self._timers[dst_device] = timer
+                timer.start()
+
+    def _flush(self, dst_device: PYU):
+        with self._send_lock:
+            timer = self._timers.pop(dst_device, None)
+            if timer is not None:
+                timer.cancel()
+            batch = self._batches.pop(dst_device, None)
+            self._batch_sizes.pop(dst_device, None)
+            if not batch:
+                return
+
+            inflight = self._inflight.setdefault(dst_device, deque())
+            if self._max_inflight is not None and len(inflight) >= self._max_inflight:
+                # backpressure: wait until the receiver catches up.
+                _, not_ready = ray.wait(
+                    list(inflight), num_returns=len(inflight) - self._max_inflight + 1
+                )
+                inflight.clear()
+                inflight.extend(not_ready)
+            inflight.append(self._comm[dst_device].recv_messages.remote(batch))
+
+    def flush(self):
+        """Send all coalesced messages at once."""
+        with self._send_lock:
+            for dst_device in list(self._batches.keys()):
+                self._flush(dst_device)
 
     def recv_message(self, key: str, value: Any):
         """Receive message
@@ -183,10 +336,21 @@ class Link:
                 message name, and unique identifier
             value: message body
         """
-        logging.debug(f'receive message from remote: {key}')
-        with self._cv:
-            self._messages[key] = value
-            self._cv.notifyAll()
+        self.recv_messages([(key, value)])
+
+    def recv_messages(self, messages: List[Tuple[str, Any]]):
+        """Receive a batch of messages
+
+        Args:
+            messages: list of (key, value), see recv_message.
+        """
+        with self._recv_lock:
+            for key, value in messages:
+                logging.debug(f'receive message from remote: {key}')
+                self._messages[key] = _decompress(value)
+                waiter = self._waiters.pop(key, None)
+                if waiter is not None:
+                    waiter.set()
 
     def recv(
         self, name: str, src_device: Union[PYU, List[PYU]], step_id: int = 0
@@ -209,10 +373,14 @@ class Link:
         key = self.__create_key(src_device, self._device, name, step_id)
         logging.debug(f'receive message: {key}')
 
+        # messages waiting to be coalesced may be what the peer is waiting for.
+        self.flush()
+
         keys = {key} if isinstance(key, str) else set(key)
         vals = {}
-        with self._cv:
-            while True:
+        waiter = threading.Event()
+        while True:
+            with self._recv_lock:
                 recv_keys = []
                 for k in keys:
                     if k in self._messages:
@@ -221,10 +389,15 @@ class Link:
 
                 for k in recv_keys:
                     keys.remove(k)
+                    self._waiters.pop(k, None)
 
                 if len(keys) == 0:
                     break
 
-                self._cv.wait()
+                waiter.clear()
+                for k in keys:
+                    self._waiters[k] = waiter
+
+            waiter.wait()
 
         return vals[key] if isinstance(key, str) else [vals[k] for k in key]
@@ -12,8 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import logging
 import os
+import tempfile
 import uuid
 from typing import Callable, Dict, List, Union
 
@@ -35,6 +37,13 @@ class FedBooster(xgb_core.Booster):
         params : Parameters for boosters.
         cache : List of cache items.
         model_file : Path to the model file if it's string or PathLike.
+
+    Trees are appended to an in-memory json model and loaded into the booster
+    from memory, the model file is only written every `checkpoint_freq`
+    rounds (set in params, 0 means never) or by calling `checkpoint`. The
+    file is `{device}_{uuid}.json` in `checkpoint_dir` (set in params,
+    defaults to the working directory), its path is `model_path` and is
+    logged on each write.
     """
 
     def __init__(
@@ -43,7 +52,6 @@ class FedBooster(xgb_core.Booster):
         cache: List = (),
         model_file: Union[str, os.PathLike, xgb_core.Booster, bytearray] = None,
     ):
-        self.model_path = f"./{link.get_device()}_{uuid.uuid1()}.json"
         if 'hess_key' in params:
             self.hess_key = params.pop("hess_key")
         else:
@@ -56,11 +64,28 @@ class FedBooster(xgb_core.Booster):
             self.label_key = params.pop("label_key")
         else:
             raise InvalidArgumentError("label_key must be assignd")
+        self.checkpoint_freq = params.pop("checkpoint_freq", 0)
+        if not isinstance(self.checkpoint_freq, int) or self.checkpoint_freq < 0:
+            raise InvalidArgumentError(
+                f"checkpoint_freq must be a non-negative int, but got {self.checkpoint_freq}"
+            )
+        checkpoint_dir = params.pop("checkpoint_dir", ".")
+        self.model_path = os.path.join(
+            checkpoint_dir, f"{link.get_device()}_{uuid.uuid1()}.json"
+        )
         self.role = link.get_role()
         super(FedBooster, self).__init__(
             params=params, cache=cache, model_file=model_file
         )
-        self.save_model(self.model_path)
+        # json model of all trees, built by appending trees of each round.
+        self.json_model = None
+        if self.num_boosted_rounds() > 0:
+            # save_raw only outputs binary format in xgboost 1.5.
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                tmp_path = os.path.join(tmp_dir, "model.json")
+                self.save_model(tmp_path)
+                with open(tmp_path, "r") as load_f:
+                    self.json_model = json.load(load_f)
 
     def federate_update(
         self,
@@ -153,14 +178,31 @@ class FedBooster(xgb_core.Booster):
             decision_tree.fit()
 
             if self.role == link.CLIENT:
-                if tree_id == 0:
-                    decision_tree.init_xgboost_model(self.model_path)
-                decision_tree.save_xgboost_model(
-                    self.model_path, decision_tree.tree_node
+                if tree_id == 0 or self.json_model is None:
+                    self.json_model = decision_tree.gen_xgboost_model()
+                decision_tree.append_xgboost_tree(
+                    self.json_model, decision_tree.tree_node
                 )
         logging.info(f"fit for iter_round={iter_round} done")
         if self.role == link.CLIENT:
-            self.load_model(self.model_path)
+            self.load_model(bytearray(json.dumps(self.json_model).encode()))
+            if self.checkpoint_freq and (iter_round + 1) % self.checkpoint_freq == 0:
+                self.checkpoint()
+
+    def checkpoint(self, fname: Union[str, os.PathLike] = None):
+        """Serialize the in-memory model to a json file.
+
+        Attributes:
+            fname : string or os.PathLike, defaults to the model path of this booster
+        """
+        if self.json_model is None:
+            return
+        fname = os.fspath(os.path.expanduser(fname or self.model_path))
+        with open(fname, "w") as dump_f:
+            json.dump(self.json_model, dump_f)
+        logging.info(
+            f"checkpoint of {self.num_boosted_rounds()} rounds saved to {fname}"
+        )
 
     def save_model(self, fname: Union[str, os.PathLike]):
         """Save the model to a file.
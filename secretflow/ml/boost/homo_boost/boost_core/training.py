@@ -154,6 +154,8 @@ def _train_internal(
             break
 
     bst = callbacks.after_training(bst)
+    if role == link.CLIENT and bst.checkpoint_freq:
+        bst.checkpoint()
 
     if evals_result is not None and is_new_callback:
         evals_result.update(callbacks.history)
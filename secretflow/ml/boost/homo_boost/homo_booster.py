@@ -68,6 +68,8 @@ class SFXgboost:
             rules['colsample_bytree'] = [Range(0, 1, inclusive=True)]
         if 'colsample_bylevel' in params:
             rules['colsample_bylevel'] = [Range(0, 1, inclusive=True)]
+        if 'checkpoint_freq' in params:
+            rules['checkpoint_freq'] = [Not(LessThan(0))]
         if 'objective' == "multi:softmax":
             rules['num_class'] = [GreaterThan(0)]
             rules['eval_metric'] = [In(["merror", "mlogloss"])]
@@ -209,18 +211,21 @@ class SFXgboost:
         """Federated xgboost eval interface
 
         Args:
-            model_path: Path of the model stored
+            model_path: Path of the model stored, None means to evaluate the
+                trained model in memory.
             hdata: Horizontal dataframe to be evaluated
             params: Xgboost params
 
         Returns:
             result: Dict evaluate result
         """
-        assert isinstance(
+        assert model_path is None or isinstance(
             model_path, (str, Dict)
         ), f'Model path accepts string or dict but got {type(model_path)}.'
-        if isinstance(model_path, str):
-            model_path = {device: model_path for device in self._workers.keys()}
+        if model_path is None:
+            assert self.fed_bst, "FedBooster must be train before eval"
+        if not isinstance(model_path, Dict):
+            model_path = {worker.device: model_path for worker in self._workers}
 
         res = {}
         for worker in self._workers:
@@ -29,6 +29,7 @@ from secretflow.device.device import PYU
 from secretflow.ml.boost.homo_boost.boost_core.core import FedBooster
 from secretflow.ml.boost.homo_boost.boost_core.training import train
 from secretflow.ml.boost.homo_boost.tree_core.loss_function import LossFunction
+from secretflow.utils.errors import InvalidArgumentError
 
 
 @proxy(PYUObject, max_concurrency=2)
@@ -159,18 +160,26 @@ class HomoBooster(link.Link):
         self,
         eval_hdf: pd.DataFrame,
         params: Dict,
-        model_path: str,
+        model_path: str = None,
     ):
         link.set_mesh(self)
 
         if self.role == link.CLIENT:
-            if not os.path.exists(model_path):
-                raise FileNotFoundError(f"model file {model_path} can not found")
-            try:
-                bst = xgb.Booster(params)
-                bst.load_model(model_path)
-            except Exception as e:
-                raise InterruptedError(f"Load model interrupted! detail:{e}")
+            if model_path is None:
+                # evaluate trained model in memory, no need to reload from disk.
+                if self.bst is None:
+                    raise InvalidArgumentError(
+                        "model_path must be assigned before training"
+                    )
+                bst = self.bst
+            else:
+                if not os.path.exists(model_path):
+                    raise FileNotFoundError(f"model file {model_path} can not found")
+                try:
+                    bst = xgb.Booster(params)
+                    bst.load_model(model_path)
+                except Exception as e:
+                    raise InterruptedError(f"Load model interrupted! detail:{e}")
             deval = xgb.DMatrix(
                 eval_hdf.drop(columns=[params["label_key"]]),
                 eval_hdf[params["label_key"]],
@@ -189,8 +189,11 @@ class HomoDecisionTree(DecisionTree):
         grad_key,
         hess_key,
         thread_pool,
+        parent_histograms=None,
+        batch_size=None,
     ):
-        local_histograms = FeatureHistogram.calculate_histogram(
+        local_histograms = FeatureHistogram.calculate_layer_histogram(
+            nodes=cur_to_split,
             data_frame_list=cur_data_frame,
             bin_split_points=bin_split_points,
             valid_features=valid_features,
@@ -198,6 +201,8 @@ class HomoDecisionTree(DecisionTree):
             grad_key=grad_key,
             hess_key=hess_key,
             thread_pool=thread_pool,
+            parent_histograms=parent_histograms,
+            batch_size=batch_size,
         )
         local_hist_bags = []
         for idx, node in enumerate(cur_to_split):
@@ -244,6 +249,8 @@ class HomoDecisionTree(DecisionTree):
         self.get_valid_features_by_tree()
         self.cal_root_node()
         tree_height = self.max_depth + 1  # non-leaf node height + 1 layer leaf
+        # local histograms of last layer, used to derive sibling histograms.
+        parent_histograms = None
 
         for dep in range(tree_height):
             if self.colsample_by_level < 1:
@@ -259,23 +266,23 @@ class HomoDecisionTree(DecisionTree):
                 break
             if self.role == link.CLIENT:
                 logging.debug(f'start to fit layer {dep}')
-                agg_local_histograms = []
-
-                for batch_id, idx in enumerate(
-                    range(0, len(self.cur_layer_node), self.max_split_nodes)
-                ):
-
-                    local_hist_bags = HomoDecisionTree.cal_local_hist_bags(
-                        self.cur_layer_node[idx : idx + self.max_split_nodes],
-                        self.cur_layer_datas[idx : idx + self.max_split_nodes],
-                        self.bin_split_points,
-                        self.valid_features,
-                        self.use_missing,
-                        self.grad_key,
-                        self.hess_key,
-                        thread_pool,
-                    )
-                    agg_local_histograms.extend(local_hist_bags)
+                agg_local_histograms = HomoDecisionTree.cal_local_hist_bags(
+                    self.cur_layer_node,
+                    self.cur_layer_datas,
+                    self.bin_split_points,
+                    self.valid_features,
+                    self.use_missing,
+                    self.grad_key,
+                    self.hess_key,
+                    thread_pool,
+                    parent_histograms,
+                    self.max_split_nodes,
+                )
+                # valid features change by level, parent histograms are useless.
+                if self.colsample_by_level >= 1:
+                    parent_histograms = {
+                        bag.hid: bag.histogram for bag in agg_local_histograms
+                    }
 
                 link.send_to_server(
                     name=self.key("agg_local_histograms"),
@@ -18,7 +18,7 @@
 
 import json
 import logging
-from typing import List
+from typing import Dict, List
 
 import numpy as np
 import pandas
@@ -217,6 +217,8 @@ class DecisionTree(object):
         self.cur_layer_datas = [self.data]
 
         tree_height = self.max_depth + 1  # non-leaf node height + 1 layer leaf
+        # histograms of last layer, used to derive sibling histograms.
+        parent_histograms = None
         for dep in range(tree_height):
             if self.colsample_by_level < 1:
                 self.valid_features = self.feature_col_sample(
@@ -230,28 +232,23 @@ class DecisionTree(object):
 
             logging.debug(f'start to fit layer {dep}')
 
-            agg_histograms = []
-            for batch_id, i in enumerate(
-                range(0, len(self.cur_layer_node), self.max_split_nodes)
-            ):
-                cur_to_split = self.cur_layer_node[i : i + self.max_split_nodes]
-                cur_data_frame = self.cur_layer_datas[i : i + self.max_split_nodes]
-                assert len(cur_to_split) == len(
-                    cur_data_frame
-                ), "node_to_split and data_frame_list must be aligned"
-                logging.debug(
-                    'computing histogram for batch{} at depth{}'.format(batch_id, dep)
-                )
-                local_histograms = self.hist_computer.calculate_histogram(
-                    data_frame_list=cur_data_frame,
-                    bin_split_points=self.bin_split_points,
-                    valid_features=self.valid_features,
-                    use_missing=self.use_missing,
-                    grad_key=self.grad_key,
-                    hess_key=self.hess_key,
-                )
-
-                agg_histograms += local_histograms
+            agg_histograms = self.hist_computer.calculate_layer_histogram(
+                nodes=self.cur_layer_node,
+                data_frame_list=self.cur_layer_datas,
+                bin_split_points=self.bin_split_points,
+                valid_features=self.valid_features,
+                use_missing=self.use_missing,
+                grad_key=self.grad_key,
+                hess_key=self.hess_key,
+                parent_histograms=parent_histograms,
+                batch_size=self.max_split_nodes,
+            )
+            # valid features change by level, parent histograms are useless.
+            if self.colsample_by_level >= 1:
+                parent_histograms = {
+                    node.id: histogram
+                    for node, histogram in zip(self.cur_layer_node, agg_histograms)
+                }
             split_info_list = self.splitter.find_split(
                 agg_histograms, self.valid_features, self.use_missing
             )
@@ -366,6 +363,14 @@ class DecisionTree(object):
         Args:
             model_path: model path
         """
+        with open(model_path, "w") as dump_f:
+            json.dump(self.gen_xgboost_model(), dump_f)
+
+    def gen_xgboost_model(self) -> Dict:
+        """Generate an empty standard xgboost model in memory
+        Returns:
+            model: xgboost json model as dict without any tree
+        """
         model = {}
 
         json_objection = {}
@@ -407,9 +412,7 @@ class DecisionTree(object):
         }
         model["learner"]["objective"] = json_objection["objective"]
         model["version"] = self.xgb_version
-
-        with open(model_path, "w") as dump_f:
-            json.dump(model, dump_f)
+        return model
 
     def save_xgboost_model(self, model_path: str, tree_nodes: List[Node]):
         """Transform tree info to standard xgboost model
@@ -422,6 +425,16 @@ class DecisionTree(object):
         """
         with open(model_path, 'r') as load_f:
             json_model = json.load(load_f)
+        self.append_xgboost_tree(json_model, tree_nodes)
+        with open(model_path, "w") as dump_f:
+            json.dump(json_model, dump_f)
+
+    def append_xgboost_tree(self, json_model: Dict, tree_nodes: List[Node]):
+        """Append tree to a standard xgboost model in memory
+        Args:
+            json_model: xgboost json model as dict, from gen_xgboost_model
+            tree_nodes: federate decision tree internal model
+        """
         tree_param = {
             "base_weights": [],
             "categories": [],
@@ -472,26 +485,12 @@ class DecisionTree(object):
             self.iter_round + 1
         )
 
-        json_model["learner"]["gradient_booster"]["model"]["tree_info"].append(
-            self.group_id
+        gbtree_model = json_model["learner"]["gradient_booster"]["model"]
+        gbtree_model["tree_info"].append(self.group_id)
+        gbtree_model["trees"].append(tree_param)
+        gbtree_model["gbtree_model_param"]["num_trees"] = str(
+            int(gbtree_model["gbtree_model_param"]["num_trees"]) + 1
         )
-        json_model["learner"]["gradient_booster"]["model"]["trees"].append(tree_param)
-        json_model["learner"]["gradient_booster"]["model"]["gbtree_model_param"][
-            "num_trees"
-        ] = str(
-            int(
-                json_model["learner"]["gradient_booster"]["model"][
-                    "gbtree_model_param"
-                ]["num_trees"]
-            )
-            + 1
-        )
-        json_model["learner"]["gradient_booster"]["model"]["gbtree_model_param"][
-            "size_leaf_vector"
-        ] = str(
-            json_model["learner"]["gradient_booster"]["model"]["gbtree_model_param"][
-                "size_leaf_vector"
-            ]
+        gbtree_model["gbtree_model_param"]["size_leaf_vector"] = str(
+            gbtree_model["gbtree_model_param"]["size_leaf_vector"]
         )
-        with open(model_path, "w") as dump_f:
-            json.dump(json_model, dump_f)
@@ -19,7 +19,6 @@
 from dataclasses import dataclass
 from typing import Dict, List
 from operator import add, sub
-import copy
 from concurrent.futures import ThreadPoolExecutor
 
 import numpy
@@ -52,27 +51,16 @@ class HistogramBag(object):
             other
         ), f"Expect two same length factors, but got {len(self.histogram)} and {len(other)}"
 
-        histogram = self.histogram
-        new_histogram = None
-        if not inplace:
-            new_histogram = copy.deepcopy(other)
-            histogram = new_histogram.histogram
-        for f_idx in range(len(self.histogram)):
-            for hist_idx in range(len(self.histogram[f_idx])):
-                # grad
-                histogram[f_idx][hist_idx][0] = func(
-                    self.histogram[f_idx][hist_idx][0], other[f_idx][hist_idx][0]
-                )
-                # hess
-                histogram[f_idx][hist_idx][1] = func(
-                    self.histogram[f_idx][hist_idx][1], other[f_idx][hist_idx][1]
-                )
-                # sample
-                histogram[f_idx][hist_idx][2] = func(
-                    self.histogram[f_idx][hist_idx][2], other[f_idx][hist_idx][2]
-                )
-
-        return self if inplace else new_histogram
+        # each feature's histogram is a contiguous [bins, 3] array of
+        # grad, hess and sample count, so the op is applied per feature.
+        histogram = [
+            func(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64))
+            for a, b in zip(self.histogram, other.histogram)
+        ]
+        if inplace:
+            self.histogram = histogram
+            return self
+        return HistogramBag(histogram, other.hid, other.p_hid)
 
     def __add__(self, other):
         return self.binary_op(other, add, inplace=False)
@@ -162,6 +150,83 @@ class FeatureHistogram:
 
         return node_histograms
 
+    @staticmethod
+    def calculate_layer_histogram(
+        nodes: List,
+        data_frame_list: List[pandas.DataFrame],
+        bin_split_points: numpy.ndarray,
+        valid_features: Dict = None,
+        use_missing: bool = False,
+        grad_key: str = "grad",
+        hess_key: str = "hess",
+        thread_pool: ThreadPoolExecutor = None,
+        parent_histograms: Dict[int, List] = None,
+        batch_size: int = None,
+    ):
+        """
+        Calculate histograms of all nodes in a layer with sibling subtraction.
+
+        If both children of a node are in this layer and the parent histogram
+        is known, only the child with fewer samples is calculated, the other
+        one is derived by parent - sibling.
+
+        Args:
+            nodes: nodes of this layer
+            data_frame_list: data frame of each node, which contain grad and hess
+            bin_split_points: global split point dicts
+            valid_features: valid feature names Dict[id:bool]
+            use_missing: whether missing value participate in train
+            grad_key: unique column name for grad value
+            hess_key: unique column name for hess value
+            thread_pool: thread pool to calculate features in parallel
+            parent_histograms: histograms of last layer, Dict[node id: histogram].
+                They must be calculated with the same valid features.
+            batch_size: max nodes to calculate at once, None means all.
+        Returns:
+            node_histograms: List[histogram1, histogram2, ...] aligned with nodes.
+        """
+        assert len(nodes) == len(
+            data_frame_list
+        ), "nodes and data_frame_list must be aligned"
+        pos = {node.id: idx for idx, node in enumerate(nodes)}
+        derived = {}
+        if parent_histograms:
+            for idx, node in enumerate(nodes):
+                sibling_idx = pos.get(node.sibling_nodeid)
+                if (
+                    node.is_left_node
+                    and sibling_idx is not None
+                    and node.parent_nodeid in parent_histograms
+                ):
+                    if len(data_frame_list[idx]) <= len(data_frame_list[sibling_idx]):
+                        derived[sibling_idx] = idx
+                    else:
+                        derived[idx] = sibling_idx
+
+        to_compute = [idx for idx in range(len(nodes)) if idx not in derived]
+        batch_size = batch_size or max(len(to_compute), 1)
+        node_histograms = [None] * len(nodes)
+        for i in range(0, len(to_compute), batch_size):
+            batch = to_compute[i : i + batch_size]
+            histograms = FeatureHistogram.calculate_histogram(
+                [data_frame_list[idx] for idx in batch],
+                bin_split_points,
+                valid_features,
+                use_missing,
+                grad_key,
+                hess_key,
+                thread_pool,
+            )
+            for idx, histogram in zip(batch, histograms):
+                node_histograms[idx] = histogram
+
+        for idx, sibling_idx in derived.items():
+            parent = HistogramBag(parent_histograms[nodes[idx].parent_nodeid])
+            sibling = HistogramBag(node_histograms[sibling_idx])
+            node_histograms[idx] = (parent - sibling).histogram
+
+        return node_histograms
+
     @staticmethod
     def _generate_empty_histogram(
         bin_split_points: Dict, valid_features: Dict, missing_bin: int
@@ -178,12 +243,12 @@ class FeatureHistogram:
         for fid in range(len(bin_split_points)):
             # if is not valid features, skip generating
             if valid_features is not None and valid_features[fid] is False:
-                feature_histogram_template.append([])
+                feature_histogram_template.append(np.array([]))
                 continue
             else:
                 # [0, 0, 0] -> [grad, hess, sample count]
                 feature_histogram_template.append(
-                    [[0, 0, 0] for j in range(len(bin_split_points[fid]) + missing_bin)]
+                    np.zeros((len(bin_split_points[fid]) + missing_bin, 3))
                 )
 
         # check feature num
@@ -193,24 +258,35 @@ class FeatureHistogram:
 
         return feature_histogram_template
 
-    @staticmethod
-    def _cal_point_hist(data_slice):
-        sum_mat = data_slice.sum(axis=0)
-        sum_grad = sum_mat[1]
-        sum_hess = sum_mat[2]
-        sum_count = data_slice.shape[0]
-        return [sum_grad, sum_hess, sum_count]
-
     @staticmethod
     def calculate_single_histogram(data: np.ndarray, bin_split_point: np.ndarray):
-        f_histogram = []
+        """Calculate cumulative histogram of one feature.
 
-        for bin_t in bin_split_point:
-            f_histogram.append(
-                FeatureHistogram._cal_point_hist(data[data[:, 0] < bin_t])
-            )
+        The i-th row sums grad, hess and count of samples whose value is less
+        than bin_split_point[i]. Samples are binned by one searchsorted and
+        summed by bincount, so the cost is O(n) regardless of bins.
 
-        return f_histogram
+        Args:
+            data: [n, 3] array of feature value, grad and hess.
+            bin_split_point: ascending split points of this feature.
+
+        Returns:
+            np.ndarray: [len(bin_split_point), 3] array of grad, hess and count.
+        """
+        bin_split_point = np.asarray(bin_split_point, dtype=np.float64)
+        n_bins = len(bin_split_point)
+        if n_bins > 1 and (np.diff(bin_split_point) < 0).any():
+            raise InvalidArgumentError("bin split points must be in ascending order")
+
+        # bins[j] = number of split points <= x[j], so x[j] < bin_split_point[i]
+        # iff bins[j] <= i. nan values fall into the last bin and never count.
+        bins = np.searchsorted(bin_split_point, data[:, 0], side='right')
+        hist = np.empty((n_bins, 3))
+        for col, weights in enumerate((data[:, 1], data[:, 2], None)):
+            hist[:, col] = np.cumsum(
+                np.bincount(bins, weights=weights, minlength=n_bins + 1)[:n_bins]
+            )
+        return hist
 
     @staticmethod
     def _node_calculate_histogram(
@@ -259,7 +335,7 @@ class FeatureHistogram:
             )
 
         for ret in futures.values():
-            single_histogram.append(np.array(ret.result()))
+            single_histogram.append(np.asarray(ret.result(), dtype=np.float64))
         return single_histogram
 
     @staticmethod
@@ -274,15 +350,16 @@ class FeatureHistogram:
         use_missing,
     ):
         if fid in valid_features_list:
-            t_data = data[:, [fid, header.index(grad_key), header.index(hess_key)]]
+            t_data = data[
+                :, [fid, header.index(grad_key), header.index(hess_key)]
+            ].astype(np.float64)
             f_histogram = FeatureHistogram.calculate_single_histogram(
                 t_data, bin_split_points[fid]
             )
             if use_missing:
-                miss_grad = t_data[1:].sum() - f_histogram[-1][0]
-                miss_hess = t_data[2:].sum() - f_histogram[-1][1]
-                miss_count = len(t_data) - f_histogram[-1][2]
-                f_histogram.append([miss_grad, miss_hess, miss_count])
+                total = np.array([t_data[:, 1].sum(), t_data[:, 2].sum(), len(t_data)])
+                last = f_histogram[-1] if len(f_histogram) else np.zeros(3)
+                f_histogram = np.vstack((f_histogram, total - last))
         else:
             f_histogram = []
         return f_histogram
@@ -125,12 +125,20 @@ def global_setup(
     seed: int,
     reg_lambda: float,
     learning_rate: float,
+    compact: bool = False,
 ) -> Dict[str, Any]:
     '''
     Set up global context.
+
+    if compact, buckets_map are bucket index of samples in each feature
+    (samples x features) rather than the dense 0-1 maps, see
+    bucket_ids_gradient_sums.
     '''
     context = dict()
-    context['buckets_map'] = jnp.concatenate(buckets_map, axis=1)
+    if compact:
+        context['bucket_ids'] = jnp.concatenate(buckets_map, axis=1)
+    else:
+        context['buckets_map'] = jnp.concatenate(buckets_map, axis=1)
     # transpose 2D-array or reshape 1D-array to 2D
     context['y'] = y.reshape((1, y.shape[0]))
     context['prng_key'] = jax.random.PRNGKey(seed)
@@ -172,11 +180,55 @@ def tree_setup(
     context['g'] = gh[0]
     context['h'] = gh[1]
 
+    # gather column and row sampled buckets map once for all levels of this tree.
+    if 'bucket_ids' in context:
+        # columns of bucket ids are features, col_choices apply to gradient sums.
+        if 'sub_choices' in context:
+            context['tree_bucket_ids'] = context['bucket_ids'][
+                context['sub_choices'], :
+            ]
+    elif 'col_choices' in context or 'sub_choices' in context:
+        buckets_map = context['buckets_map']
+        if 'col_choices' in context:
+            buckets_map = buckets_map[:, context['col_choices']]
+        if 'sub_choices' in context:
+            buckets_map = buckets_map[context['sub_choices'], :]
+        context['tree_buckets_map'] = buckets_map
+
     return context
 
 
+def bucket_ids_gradient_sums(
+    sgh: np.ndarray, bucket_ids: np.ndarray, feature_buckets: Tuple[int]
+) -> np.ndarray:
+    '''
+    compute sgh @ buckets_map without the dense samples x buckets map.
+
+    the 0-1 map of one feature is built from its bucket index column at a
+    time, so peak memory is samples x buckets of one feature, at the cost of
+    comparing each bucket index with every bucket on each level.
+
+    Args:
+        sgh: masked gradients, one row per node.
+        bucket_ids: bucket index of each sample in each feature.
+        feature_buckets: how many buckets in each feature.
+
+    Return:
+        gradient sums of each bucket of all features.
+    '''
+    assert bucket_ids.shape[1] == len(feature_buckets)
+    sums = list()
+    for f, buckets in enumerate(feature_buckets):
+        f_buckets_map = bucket_ids[:, f].reshape(-1, 1) <= jnp.arange(buckets)
+        sums.append(jnp.matmul(sgh, f_buckets_map.astype(sgh.dtype)))
+    return jnp.concatenate(sums, axis=1)
+
+
 def find_best_split_bucket(
-    context: Dict[str, Any], nodes_s: List[np.ndarray], last_level: bool
+    context: Dict[str, Any],
+    nodes_s: List[np.ndarray],
+    last_level: bool,
+    feature_buckets: Tuple[int] = None,
 ) -> Tuple[np.ndarray, Dict[str, Any]]:
     '''
     compute the gradient sums of the containing instances in each split bucket
@@ -186,6 +238,8 @@ def find_best_split_bucket(
         context: comparison context.
         nodes_s: sample select indexes of each node from same tree level.
         last_level: if this split is last level, next level is leaf nodes.
+        feature_buckets: how many buckets in each feature of all partitions,
+            required if context is set up in compact mode.
 
     Return:
         idx of split bucket for each node.
@@ -203,38 +257,40 @@ def find_best_split_bucket(
         GL_cache = None
         HL_cache = None
 
-    buckets_map = context['buckets_map']
-    if 'col_choices' in context:
-        buckets_map = buckets_map[:, context['col_choices']]
+    # stack all left children's masked g and h, so the gradient sums of each
+    # buckets in all nodes are computed by one matmul.
+    s = jnp.concatenate(l_nodes_s, axis=0)
     if 'sub_choices' in context:
-        buckets_map = buckets_map[context['sub_choices'], :]
-
-    # current level nodes' gradient sums of each buckets
-    level_nodes_G = list()
-    level_nodes_H = list()
-    for idx, s in enumerate(l_nodes_s):
-        if 'sub_choices' in context:
-            s = s[:, context['sub_choices']]
-        sg = context['g'] * s
-        sh = context['h'] * s
-        # compute the gradient sums of each buckets in this node
-        lchild_GL = jnp.matmul(sg, buckets_map)
-        lchild_HL = jnp.matmul(sh, buckets_map)
-        level_nodes_G.append(lchild_GL)
-        level_nodes_H.append(lchild_HL)
-        if GL_cache is not None:
-            level_nodes_G.append(GL_cache[idx] - lchild_GL)
-            level_nodes_H.append(HL_cache[idx] - lchild_HL)
+        s = s[:, context['sub_choices']]
+    sgh = jnp.concatenate((context['g'] * s, context['h'] * s), axis=0)
+    if 'bucket_ids' in context:
+        assert feature_buckets is not None, "compact mode needs feature_buckets"
+        bucket_ids = context.get('tree_bucket_ids', context['bucket_ids'])
+        lchild_GHL = bucket_ids_gradient_sums(sgh, bucket_ids, feature_buckets)
+        if 'col_choices' in context:
+            lchild_GHL = lchild_GHL[:, context['col_choices']]
+    else:
+        buckets_map = context.get('tree_buckets_map', context['buckets_map'])
+        lchild_GHL = jnp.matmul(sgh, buckets_map)
+    lchild_GL = lchild_GHL[: len(l_nodes_s)]
+    lchild_HL = lchild_GHL[len(l_nodes_s) :]
+
+    # gradient sums of left child nodes after splitting by each bucket for
+    # current level nodes, in order of lchild 0, rchild 0, lchild 1, ...
+    if GL_cache is not None:
+        GL = jnp.stack((lchild_GL, GL_cache - lchild_GL), axis=1)
+        HL = jnp.stack((lchild_HL, HL_cache - lchild_HL), axis=1)
+        GL = GL.reshape((-1, lchild_GL.shape[1]))
+        HL = HL.reshape((-1, lchild_HL.shape[1]))
+    else:
+        GL = lchild_GL
+        HL = lchild_HL
 
     if not last_level:
-        context['cache'] = (level_nodes_G, level_nodes_H)
+        context['cache'] = (GL, HL)
     elif 'cache' in context:
         del context['cache']
 
-    # gradient sums of left child nodes after splitting by each bucket
-    GL = jnp.concatenate(level_nodes_G, axis=0)
-    HL = jnp.concatenate(level_nodes_H, axis=0)
-
     # last buckets is the total gradient sum of all samples belong to current level nodes.
     GA = GL[:, -1].reshape(-1, 1)
     HA = HL[:, -1].reshape(-1, 1)
@@ -317,6 +373,25 @@ def predict_tree_weight(selects: List[np.ndarray], weights: np.ndarray) -> np.nd
     return jnp.matmul(select, weights).reshape((1, select.shape[0]))
 
 
+def predict_forest_weight(
+    selects: List[np.ndarray], weights: List[np.ndarray]
+) -> np.ndarray:
+    '''
+    get sum of preds of a group of trees.
+
+    leaves of all trees are concatenated, so preds of all trees are summed by
+    one matmul.
+
+    Args:
+        selects: leaf nodes' sample selects of all trees from each model handler.
+        weights: leaf weights of each tree in secure share.
+
+    Return:
+        pred
+    '''
+    return predict_tree_weight(selects, jnp.concatenate(weights, axis=0))
+
+
 def do_leaf(context: Dict[str, Any], ss: List[np.ndarray]) -> np.ndarray:
     # see get_weight.
     s = jnp.concatenate(ss, axis=0)
@@ -13,11 +13,195 @@
 # limitations under the License.
 
 import math
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, List
 import numpy as np
 from .xgb_tree import XgbTree
 from secretflow.device import PYUObject, proxy
 
+# rows traversed by one thread in predict_tree_select.
+_PREDICT_CHUNK_ROWS = 1 << 16
+
+
+def _tree_select(
+    x: np.ndarray, split_features: np.ndarray, split_values: np.ndarray
+) -> np.ndarray:
+    '''
+    traverse the tree level by level for all rows at once.
+
+    (rows[i], nodes[i]) pairs mark that row rows[i] may arrive at node nodes[i].
+    nodes split by this partition's feature move the pair to one child, nodes
+    split by other partition's feature duplicate it into both children.
+
+    Args:
+        x: dataset from this partition.
+        split_features: split feature of each split node, -1 if unknown.
+        split_values: split value of each split node.
+
+    Return:
+        leaf nodes' selects
+    '''
+    split_nodes = len(split_features)
+    select = np.zeros((x.shape[0], split_nodes + 1), dtype=np.int8)
+    rows = np.arange(x.shape[0])
+    nodes = np.zeros(x.shape[0], dtype=np.int64)
+    while len(rows):
+        is_leaf = nodes >= split_nodes
+        select[rows[is_leaf], nodes[is_leaf] - split_nodes] = 1
+        rows = rows[~is_leaf]
+        nodes = nodes[~is_leaf]
+
+        features = split_features[nodes]
+        unknown = features == -1
+        known_rows, known_nodes = rows[~unknown], nodes[~unknown]
+        go_right = ~(x[known_rows, features[~unknown]] < split_values[known_nodes])
+        unknown_rows, unknown_nodes = rows[unknown], nodes[unknown]
+        rows = np.concatenate((known_rows, unknown_rows, unknown_rows))
+        nodes = np.concatenate(
+            (
+                known_nodes * 2 + 1 + go_right,
+                unknown_nodes * 2 + 1,
+                unknown_nodes * 2 + 2,
+            )
+        )
+
+    return select
+
+
+def predict_tree_select(
+    x: np.ndarray,
+    split_features: List[int],
+    split_values: List[float],
+    threads: int = None,
+) -> np.ndarray:
+    '''
+    computer leaf nodes' sample selects of one tree, rows are split into chunks
+    and traversed by a thread pool.
+
+    Args:
+        x: dataset from this partition.
+        split_features: split feature of each split node, -1 if unknown.
+        split_values: split value of each split node.
+        threads: number of threads, defaults to the cpu count.
+
+    Return:
+        leaf nodes' selects
+    '''
+    split_features = np.array(split_features, dtype=np.int64)
+    split_values = np.array(split_values, dtype=np.float64)
+    if x.shape[0] <= _PREDICT_CHUNK_ROWS:
+        return _tree_select(x, split_features, split_values)
+
+    with ThreadPoolExecutor(threads) as executor:
+        selects = list(
+            executor.map(
+                lambda start: _tree_select(
+                    x[start : start + _PREDICT_CHUNK_ROWS],
+                    split_features,
+                    split_values,
+                ),
+                range(0, x.shape[0], _PREDICT_CHUNK_ROWS),
+            )
+        )
+    return np.concatenate(selects, axis=0)
+
+
+def qcut(x: np.ndarray, buckets: int) -> Tuple[np.ndarray, List[float]]:
+    '''
+    split one feature into buckets of about the same number of samples.
+
+    walking runs of distinct values in order, a split point is the first value
+    of the run where the samples since last split reach ceil(remained samples /
+    remained buckets). The walk only visits run starts found by searchsorted on
+    cumulative counts, so it costs O(buckets * log(n)) after the sort. nan is
+    sorted last and each nan is a run of its own.
+
+    Args:
+        x: values of one feature.
+        buckets: max buckets count.
+
+    Return:
+        bucket index of each sample and split points.
+    '''
+    sorted_x = np.sort(x, axis=0)
+    samples = len(sorted_x)
+    assert samples > 0, 'can not qcut empty x'
+
+    # start position of each run of distinct values, nan != nan starts new run.
+    run_starts = np.flatnonzero(
+        np.concatenate(([True], sorted_x[1:] != sorted_x[:-1]), axis=None)
+    )
+    runs = len(run_starts)
+
+    split_runs = list()
+    last_start = 0
+    expected_bin_count = math.ceil(samples / buckets)
+    # runs visited before reaching buckets - 1 split points.
+    visited_runs = runs
+    while True:
+        run = np.searchsorted(run_starts, last_start + expected_bin_count)
+        if run >= runs:
+            break
+        split_runs.append(run)
+        if len(split_runs) == buckets - 1:
+            visited_runs = run + 1
+            break
+        last_start = run_starts[run]
+        expected_bin_count = math.ceil(
+            (samples - last_start) / (buckets - len(split_runs))
+        )
+
+    if visited_runs <= buckets:
+        # full dataset category count <= buckets
+        # use category as split point.
+        split_points = sorted_x[run_starts[1:visited_runs]].tolist()
+    else:
+        split_points = sorted_x[run_starts[split_runs]].tolist()
+        if split_points[-1] != sorted_x[-1]:
+            # add max sample value into split_points like xgboost.
+            split_points.append(sorted_x[-1])
+
+    split_points = list(map(float, split_points))
+
+    # bucket index is count of split points <= value, nan goes to bucket 0.
+    bins = np.searchsorted(np.array(split_points), x, side='right')
+    bins[np.isnan(x)] = 0
+
+    return bins, split_points
+
+
+def bins_dtype(buckets: int) -> np.dtype:
+    '''
+    smallest int dtype holds bucket index of features split into buckets.
+    '''
+    # qcut gives at most buckets split points, so index is in [0, buckets].
+    return np.int8 if buckets < np.iinfo(np.int8).max else np.int16
+
+
+def build_buckets_map(order_map: np.ndarray, feature_buckets: List[int]) -> np.ndarray:
+    '''
+    build the dense 0-1 buckets map from bucket index of samples.
+
+    Args:
+        order_map: bucket index of each sample in each feature.
+        feature_buckets: how many buckets in each feature.
+
+    Return:
+        samples x sum(feature_buckets) array, column b of a feature is 1 if
+        the sample's bucket index of this feature <= b.
+    '''
+    buckets_map = np.empty((order_map.shape[0], sum(feature_buckets)), dtype=np.int8)
+    start = 0
+    for f, total_buckets in enumerate(feature_buckets):
+        np.less_equal(
+            order_map[:, f, None],
+            np.arange(total_buckets),
+            out=buckets_map[:, start : start + total_buckets],
+            casting='unsafe',
+        )
+        start += total_buckets
+    return buckets_map
+
 
 @proxy(PYUObject)
 class XgbTreeWorker:
@@ -29,158 +213,114 @@ class XgbTreeWorker:
     def __init__(self, idx: int) -> None:
         self.work_idx = idx
 
-    def predict_weight_select(self, x: np.ndarray, tree: XgbTree) -> np.ndarray:
+    def predict_weight_select(
+        self, x: np.ndarray, tree: XgbTree, threads: int = None
+    ) -> np.ndarray:
         '''
         computer leaf nodes' sample selects known by this partition.
 
         Args:
             x: dataset from this partition.
             tree: tree model store by this partition.
+            threads: number of threads that traverse row chunks in parallel.
+                Defaults to the cpu count.
 
         Return:
             leaf nodes' selects
         '''
         x = x if isinstance(x, np.ndarray) else np.array(x)
-        split_nodes = len(tree.split_features)
-
-        select = np.zeros((x.shape[0], split_nodes + 1), dtype=np.int8)
-        # should parallel in c++
-        for r in range(x.shape[0]):
-            row = x[r, :]
-            idxs = list()
-            idxs.append(0)
-            while len(idxs):
-                idx = idxs.pop(0)
-                if idx < split_nodes:
-                    f = tree.split_features[idx]
-                    v = tree.split_values[idx]
-                    if f == -1:
-                        # if node split by others partition's feature
-                        # mark all split paths in tree.
-                        idxs.append(idx * 2 + 1)
-                        idxs.append(idx * 2 + 2)
-                    else:
-                        # if node split by this partition's feature
-                        # mark the clearly split path in tree.
-                        if row[f] < v:
-                            idxs.append(idx * 2 + 1)
-                        else:
-                            idxs.append(idx * 2 + 2)
-                else:
-                    leaf_idx = idx - split_nodes
-                    select[r, leaf_idx] = 1
-
-        return select
-
-    def _qcut(self, x: np.ndarray) -> Tuple[np.ndarray, List]:
-        sorted_x = np.sort(x, axis=0)
-        remained_count = len(sorted_x)
-        assert remained_count > 0, 'can not qcut empty x'
-
-        value_category = list()
-        last_value = None
-
-        split_points = list()
-        expected_bin_count = math.ceil(remained_count / self.buckets)
-        current_bin_count = 0
-        for v in sorted_x:
-            if v != last_value:
-                if len(value_category) <= self.buckets:
-                    value_category.append(v)
-
-                if current_bin_count >= expected_bin_count:
-                    split_points.append(v)
-                    if len(split_points) == self.buckets - 1:
-                        break
-                    remained_count -= current_bin_count
-                    expected_bin_count = math.ceil(
-                        remained_count / (self.buckets - len(split_points))
-                    )
-                    current_bin_count = 0
+        return predict_tree_select(
+            x, tree.split_features, tree.split_values, threads=threads
+        )
 
-                last_value = v
-            current_bin_count += 1
-
-        if len(value_category) <= self.buckets:
-            # full dataset category count <= buckets
-            # use category as split point.
-            split_points = value_category[1:]
-        elif split_points[-1] != sorted_x[-1]:
-            # add max sample value into split_points like xgboost.
-            split_points.append(sorted_x[-1])
-
-        split_points = list(map(float, split_points))
-
-        def upper_bound_bin(x: float):
-            count = len(split_points)
-            pos = 0
-            while count > 0:
-                step = math.floor(count / 2)
-                v = split_points[pos + step]
-                if x == v:
-                    return pos + step + 1
-                elif x > v:
-                    pos = pos + step + 1
-                    count -= step + 1
-                else:
-                    count = step
-            return pos
-
-        bins = np.vectorize(upper_bound_bin)(x)
+    def predict_weight_selects(
+        self, x: np.ndarray, trees: List[XgbTree], threads: int = None
+    ) -> np.ndarray:
+        '''
+        computer leaf nodes' sample selects of a group of trees known by this
+        partition, leaves of all trees are concatenated in order.
 
-        return bins, split_points
+        Args:
+            x: dataset from this partition.
+            trees: tree models store by this partition.
+            threads: number of threads that traverse row chunks in parallel.
+                Defaults to the cpu count.
 
-    def build_maps(self, x: np.ndarray) -> np.ndarray:
+        Return:
+            leaf nodes' selects
+        '''
+        x = x if isinstance(x, np.ndarray) else np.array(x)
+        return np.concatenate(
+            [
+                predict_tree_select(
+                    x, tree.split_features, tree.split_values, threads=threads
+                )
+                for tree in trees
+            ],
+            axis=1,
+        )
+
+    def build_maps(
+        self, x: np.ndarray, compact: bool = False, threads: int = None
+    ) -> np.ndarray:
         '''
         split features into buckets and build maps use in train.
 
         Args:
             x: dataset from this partition.
+            compact: return bucket index of samples instead of the dense
+                buckets map.
+            threads: number of threads that qcut features in parallel.
+                Defaults to the cpu count.
 
         Return:
-            leaf nodes' selects
+            the dense buckets map, or the order map if compact.
         '''
         # order_map: record sample belong to which bucket of all features.
-        self.order_map = np.zeros((x.shape[0], x.shape[1]), dtype=np.int8)
+        self.order_map = np.zeros(
+            (x.shape[0], x.shape[1]), dtype=bins_dtype(self.buckets)
+        )
         # split_points: bucket split points for all features.
         self.split_points = []
         # feature_buckets: how many buckets in each feature.
         self.feature_buckets = []
         # features: how many features in dataset.
         self.features = x.shape[1]
-        # buckets_map: a sparse 0-1 array use in compute the gradient sums.
-        buckets_map = np.zeros((x.shape[0], 0), dtype=np.int8)
-        for f in range(x.shape[1]):
-            bins, split_point = self._qcut(x[:, f])
+        with ThreadPoolExecutor(threads) as executor:
+            qcuts = list(
+                executor.map(lambda f: qcut(x[:, f], self.buckets), range(x.shape[1]))
+            )
+        for f, (bins, split_point) in enumerate(qcuts):
             self.order_map[:, f] = bins
-            total_buckets = len(split_point) + 1
-            f_buckets_map = np.zeros((x.shape[0], total_buckets), dtype=np.int8)
-
-            sum_bin_idx = np.array([], dtype=np.int64)
-            for b in range(total_buckets):
-                bin_idx = np.flatnonzero(bins == b)
-                sum_bin_idx = np.concatenate((sum_bin_idx, bin_idx), axis=None)
-                f_buckets_map[sum_bin_idx, b] = 1
-
-            buckets_map = np.concatenate((buckets_map, f_buckets_map), axis=1)
-            self.feature_buckets.append(total_buckets)
+            self.feature_buckets.append(len(split_point) + 1)
             # last bucket is split all samples into left child.
             # using infinity to simulation xgboost pruning.
             split_point.append(float('inf'))
             self.split_points.append(split_point)
 
-        return buckets_map
+        if compact:
+            return self.order_map
+        # buckets_map: a sparse 0-1 array use in compute the gradient sums.
+        return build_buckets_map(self.order_map, self.feature_buckets)
 
-    def global_setup(self, x: np.ndarray, buckets: int, seed: int) -> np.ndarray:
+    def global_setup(
+        self, x: np.ndarray, buckets: int, seed: int, compact: bool = False
+    ) -> np.ndarray:
         '''
         Set up global context.
         '''
         np.random.seed(seed)
         x = x if isinstance(x, np.ndarray) else np.array(x)
         self.buckets = buckets
-        buckets_map = self.build_maps(x)
+        buckets_map = self.build_maps(x, compact)
         return buckets_map
 
+    def get_feature_buckets(self) -> List[int]:
+        '''
+        how many buckets in each feature, used as static shapes of compact mode.
+        '''
+        return self.feature_buckets
+
     def update_buckets_count(self, buckets_count: List[int]) -> None:
         '''
         save how many buckets in each partition's all features.
@@ -15,7 +15,10 @@
 import math
 import time
 import logging
-from typing import Dict, Union, Tuple
+from pathlib import Path
+from typing import Any, Dict, List, Union, Tuple
+
+import cloudpickle as pickle
 
 import jax.numpy as jnp
 
@@ -23,6 +26,7 @@ from .core.node_split import RegType
 from .core.utils import prepare_dataset
 from .core import node_split as split_fn
 from .core.tree_worker import XgbTreeWorker as Worker
+from .core.xgb_tree import XgbTree
 
 from secretflow.data import FedNdarray, PartitionWay
 from secretflow.data.vertical import VDataFrame
@@ -32,11 +36,52 @@ from secretflow.device import (
     PYU,
     PYUObject,
     SPUObject,
+    reveal,
     wait,
     SPUCompilerNumReturnsPolicy,
 )
 
 
+def _save_party_model(
+    path: str,
+    objective: str,
+    base: float,
+    trees: List[XgbTree],
+    weights: List[Tuple[Any, Any]],
+) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        pickle.dump(
+            {
+                'objective': objective,
+                'base': base,
+                # split tables known by this party, None if it holds no feature.
+                'trees': trees,
+                # (meta, share) of each tree's leaf weights, None if not a spu node.
+                'weights': weights,
+            },
+            f,
+        )
+
+
+def _load_party_model(path: str) -> Dict[str, Any]:
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def _party_model_header(model: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'objective': model['objective'],
+        'base': model['base'],
+        'trees': None if model['trees'] is None else len(model['trees']),
+        'weights': None if model['weights'] is None else len(model['weights']),
+    }
+
+
+# default trees evaluated by one spu call in XgbModel.predict.
+PREDICT_TREES_PER_BATCH = 16
+
+
 class XgbModel:
     '''
     SS Xgb Model & predict.
@@ -50,25 +95,29 @@ class XgbModel:
         self.trees = list()
         # List[SPUObject of np.array], owned by spu and not reveal to any one
         self.weights = list()
-        # TODO how to ser/der ?
 
-    def _tree_pred(self, tree: Dict[PYU, PYUObject], weight: SPUObject) -> SPUObject:
-        assert len(tree) == len(self.x)
+    def _trees_pred(
+        self, trees: List[Dict[PYU, PYUObject]], weights: List[SPUObject]
+    ) -> SPUObject:
+        assert all(len(tree) == len(self.x) for tree in trees)
 
         weight_selects = list()
         for worker in self.workers:
             device = worker.device
-            assert device in tree
-            s = worker.predict_weight_select(self.x[device].data, tree[device])
+            assert all(device in tree for tree in trees)
+            s = worker.predict_weight_selects(
+                self.x[device].data, [tree[device] for tree in trees]
+            )
             weight_selects.append(s.to(self.spu))
 
-        pred = self.spu(split_fn.predict_tree_weight)(weight_selects, weight)
+        pred = self.spu(split_fn.predict_forest_weight)(weight_selects, weights)
         return pred
 
     def predict(
         self,
         dtrain: Union[FedNdarray, VDataFrame],
         to_pyu: PYU = None,
+        trees_per_batch: int = None,
     ) -> Union[SPUObject, FedNdarray]:
         '''
         predict on dtrain with this model.
@@ -82,6 +131,11 @@ class XgbModel:
                 if not None predict result is reveal to to_pyu device and save as FedNdarray
                 otherwise, keep predict result in secret and save as SPUObject.
 
+            trees_per_batch: how many trees are evaluated by one spu call.
+                each party's leaf selects of a batch take samples x leaves of
+                all trees in the batch, i.e. trees_per_batch times the memory of
+                predicting one tree. Defaults to None, PREDICT_TREES_PER_BATCH (16).
+
         Return:
             Pred values store in spu object or FedNdarray.
         '''
@@ -91,11 +145,14 @@ class XgbModel:
         assert len(x.partitions) == len(self.trees[0])
         self.workers = [Worker(0, device=pyu) for pyu in x.partitions]
         self.x = x.partitions
+        trees_per_batch = trees_per_batch or PREDICT_TREES_PER_BATCH
+        assert trees_per_batch > 0, f"trees_per_batch should > 0, got {trees_per_batch}"
         preds = []
-        for idx in range(len(self.trees)):
-            pred = self._tree_pred(self.trees[idx], self.weights[idx])
-            wait([pred])
-            preds.append(pred)
+        for start in range(0, len(self.trees), trees_per_batch):
+            end = start + trees_per_batch
+            preds.append(
+                self._trees_pred(self.trees[start:end], self.weights[start:end])
+            )
 
         pred = self.spu(
             lambda ps, base: (jnp.sum(jnp.concatenate(ps, axis=0), axis=0) + base).reshape(-1, 1)
@@ -115,6 +172,114 @@ class XgbModel:
         else:
             return pred
 
+    def save_model(self, model_path: Dict[PYU, str]) -> None:
+        '''
+        save model, each party writes its own part of the model to its path:
+        split tables of all trees if it holds features, and its share of all
+        leaf weights if it is a node of spu. Nothing leaves its owner.
+
+        Args:
+            model_path: path of the model file of each party, must contain all
+                feature holders and spu nodes.
+        '''
+        assert len(self.trees), "can not save an empty model"
+        holders = list(self.trees[0].keys())
+        ranks = {
+            node['party']: rank
+            for rank, node in enumerate(self.spu.cluster_def['nodes'])
+        }
+        parties = set(holders) | {PYU(party) for party in ranks}
+        missing = parties - set(model_path.keys())
+        assert len(missing) == 0, f"model_path of {missing} is missing"
+
+        saves = []
+        for device in parties:
+            trees = None
+            if device in holders:
+                trees = [tree[device] for tree in self.trees]
+            weights = None
+            if device.party in ranks:
+                rank = ranks[device.party]
+                weights = [(w.meta, w.shares[rank]) for w in self.weights]
+            saves.append(
+                device(_save_party_model)(
+                    model_path[device],
+                    self.objective.value,
+                    self.base,
+                    trees,
+                    weights,
+                )
+            )
+        wait(saves)
+
+    @staticmethod
+    def load_model(spu: SPU, model_path: Dict[PYU, str]) -> 'XgbModel':
+        '''
+        load model saved by save_model.
+
+        Args:
+            spu: spu with the same nodes and runtime config as the spu that
+                trained the model, otherwise shares of leaf weights are useless.
+            model_path: path of the model file of each party, must contain all
+                feature holders and spu nodes.
+
+        Return:
+            XgbModel
+        '''
+        models = {
+            device: device(_load_party_model)(path)
+            for device, path in model_path.items()
+        }
+        headers = reveal(
+            {device: device(_party_model_header)(m) for device, m in models.items()}
+        )
+        header = next(iter(headers.values()))
+        trees_count = max(h['trees'] or 0 for h in headers.values())
+        assert trees_count > 0, "no feature holder in model_path"
+        for device, h in headers.items():
+            assert (
+                h['objective'] == header['objective'] and h['base'] == header['base']
+            ), f"model of {device} is not from the same model"
+            assert h['trees'] in (None, trees_count) and h['weights'] in (
+                None,
+                trees_count,
+            ), f"model of {device} is not from the same model"
+
+        model = XgbModel(spu, RegType(header['objective']), header['base'])
+        holders = [d for d, h in headers.items() if h['trees'] is not None]
+        holder_trees = dict()
+        for device in holders:
+            trees = device(
+                lambda m: m['trees'] if len(m['trees']) > 1 else m['trees'][0],
+                num_returns=trees_count,
+            )(models[device])
+            # num_returns=1 returns the object itself instead of a list.
+            holder_trees[device] = trees if trees_count > 1 else [trees]
+        shares = []
+        for node in spu.cluster_def['nodes']:
+            device = PYU(node['party'])
+            assert (
+                device in headers and headers[device]['weights'] is not None
+            ), f"share of leaf weights of spu node {device} is missing"
+            shares.append(
+                device(
+                    lambda m: [w for pair in m['weights'] for w in pair],
+                    num_returns=trees_count * 2,
+                )(models[device])
+            )
+        for idx in range(trees_count):
+            model.trees.append(
+                {device: trees[idx] for device, trees in holder_trees.items()}
+            )
+            model.weights.append(
+                SPUObject(
+                    spu,
+                    shares[0][idx * 2].data,
+                    [share[idx * 2 + 1].data for share in shares],
+                )
+            )
+        return model
+
 
 class Xgb:
     '''
@@ -206,21 +371,40 @@ class Xgb:
         assert sketch > 0 and sketch <= 1, f"sketch_eps should in (0, 1], got {sketch}"
         self.buckets = math.ceil(1.0 / sketch)
         self.seed = int(params.pop('seed', 42))
+        self.compact_buckets = bool(params.pop('compact_buckets', False))
 
         assert len(params) == 0, f"Unknown params {list(params.keys())}"
 
     def _global_setup(self) -> None:
         buckets_maps = list()
         for worker in self.workers:
-            m = worker.global_setup(self.x[worker.device].data, self.buckets, self.seed)
+            m = worker.global_setup(
+                self.x[worker.device].data,
+                self.buckets,
+                self.seed,
+                self.compact_buckets,
+            )
             buckets_maps.append(m.to(self.spu))
 
-        self.spu_context = self.spu(split_fn.global_setup)(
+        if self.compact_buckets:
+            # buckets count of each feature are static shapes of spu functions.
+            self.feature_buckets = tuple(
+                b
+                for worker_buckets in reveal(
+                    [worker.get_feature_buckets() for worker in self.workers]
+                )
+                for b in worker_buckets
+            )
+        else:
+            self.feature_buckets = None
+
+        self.spu_context = self.spu(split_fn.global_setup, static_argnames='compact')(
             buckets_maps,
             self.y.to(self.spu),
             self.seed,
             self.reg_lambda,
             self.lr,
+            compact=self.compact_buckets,
         )
         self.pred = self.spu(split_fn.init_pred, static_argnames=('base', 'samples'))(
             base=self.base, samples=self.samples
@@ -303,6 +487,19 @@ class Xgb:
                 default: 0
             'seed': Pseudorandom number generator seed.
                 default: 42
+            'compact_buckets': Send bucket index of samples in each feature
+                (samples x features) to spu instead of the dense 0-1 buckets
+                map (samples x buckets). Cuts spu input size by about
+                1 / sketch_eps times, but compares bucket index with buckets
+                in secret on each level. In a SEMI2K simulator with 10000
+                samples and 8 nodes per level, one level sends about 8x the
+                bytes of the dense map input and runs 10x to 35x slower,
+                peak memory drops from 0.55 - 4.3 GB to 0.36 - 0.57 GB for
+                10 - 50 features of 17 - 65 buckets
+                (benchmark/ss_xgb_buckets_map_spu.py). Use it when memory,
+                not time, is the limit. Buckets count of each feature become
+                public.
+                default: False
 
         Return:
             XgbModel
@@ -337,10 +534,15 @@ class Xgb:
 
         spu_split_buckets, self.spu_context = self.spu(
             split_fn.find_best_split_bucket,
-            static_argnames='last_level',
+            static_argnames=('last_level', 'feature_buckets'),
             num_returns_policy=SPUCompilerNumReturnsPolicy.FROM_USER,
             user_specified_num_returns=2,
-        )(self.spu_context, nodes_s, last_level=last_level)
+        )(
+            self.spu_context,
+            nodes_s,
+            last_level=last_level,
+            feature_buckets=self.feature_buckets,
+        )
 
         lchild_ss = []
         for worker in self.workers:
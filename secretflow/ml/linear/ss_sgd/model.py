@@ -17,13 +17,14 @@ import math
 import logging
 import numpy as np
 from enum import Enum, unique
+import jax
 import jax.numpy as jnp
 from typing import Union, List, Tuple
 
 from secretflow.utils.sigmoid import sigmoid, SigType
 from secretflow.data import FedNdarray, PartitionWay
 from secretflow.data.vertical import VDataFrame
-from secretflow.device import SPU, SPUObject, wait, PYUObject, PYU
+from secretflow.device import SPU, SPUObject, wait, reveal, PYUObject, PYU
 from secretflow.ml.linear.linear_model import RegType, LinearModel
 
 
@@ -117,10 +118,14 @@ def _batch_update_w(
     penalty: Penalty,
     total_batch: int,
     batch_size: int,
+    perm: np.ndarray = None,
 ) -> np.ndarray:
     """
     update weights on dataset in one iteration.
 
+    mini batches are visited by a rolled loop, so the compiled program does not
+    grow with total_batch.
+
     Args:
         dataset: input datasets.
         w: base model weights.
@@ -130,6 +135,7 @@ def _batch_update_w(
         reg_type: Linear or Logistic regression.
         penalty: The penalty (aka regularization term) to be used.
         l2_norm: L2 regularization term.
+        perm: optional public permutation of rows to shuffle x and y.
 
     Return:
         W after update.
@@ -146,13 +152,22 @@ def _batch_update_w(
         len(y.shape) == 2 and y.shape[1] == 1
     ), "Y should be be list or 1D array"
     y = y.reshape((y.shape[0], 1))
+    if perm is not None:
+        # perm is public, so the shuffle is a local gather of shares.
+        x = x[perm]
+        y = y[perm]
 
-    for idx in range(total_batch):
+    def update_w(idx, w):
         begin = idx * batch_size
-        end = (idx + 1) * batch_size
         # padding one col for bias in w
-        x_slice = jnp.concatenate((x[begin:end, :], jnp.ones((batch_size, 1))), axis=1)
-        y_slice = y[begin:end, :]
+        x_slice = jnp.concatenate(
+            (
+                jax.lax.dynamic_slice(x, (begin, 0), (batch_size, num_feat)),
+                jnp.ones((batch_size, 1)),
+            ),
+            axis=1,
+        )
+        y_slice = jax.lax.dynamic_slice(y, (begin, 0), (batch_size, 1))
 
         pred = jnp.matmul(x_slice, w)
         if reg_type == RegType.Logistic:
@@ -171,9 +186,14 @@ def _batch_update_w(
 
         step = (learning_rate * grad) / batch_size
 
-        w = w - step
+        return (w - step).astype(w.dtype)
+
+    return jax.lax.fori_loop(0, total_batch, update_w, w)
 
-    return w
+
+def _converged(w: np.ndarray, last_w: np.ndarray, tol: float) -> np.ndarray:
+    # only this bit is revealed in early stop check.
+    return jnp.max(jnp.abs(w - last_w)) < tol
 
 
 class SSRegression:
@@ -317,20 +337,23 @@ class SSRegression:
         lr_total_batch = math.floor(rows / self.lr_batch_size)
         return ds[being:end], lr_total_batch
 
-    def _epoch(self, spu_w: SPUObject, epoch_idx: int) -> SPUObject:
+    def _epoch(self, spu_w: SPUObject, rng: np.random.Generator = None) -> SPUObject:
         """
         Complete one iteration
 
         Args:
-            spu_dataset: infeed dataset.
             spu_w: base W to do iteration.
-            sig_type: sigmoid approximation type.
+            rng: if not None, shuffle order of infeed batches and rows in each
+                infeed batch by public permutations from rng.
 
         Return:
             W after update in SPUObject.
         """
-        for infeed_step in range(self.infeed_total_batch):
-            if epoch_idx == 0:
+        infeed_steps = range(self.infeed_total_batch)
+        if rng is not None:
+            infeed_steps = rng.permutation(self.infeed_total_batch)
+        for infeed_step in infeed_steps:
+            if infeed_step not in self.batch_cache:
                 x, lr_total_batch = self._next_infeed_batch(self.x, infeed_step)
                 y, lr_total_batch = self._next_infeed_batch(self.y, infeed_step)
                 spu_x = self.spu(_concatenate, static_argnames=('axis'))(
@@ -341,6 +364,14 @@ class SSRegression:
             else:
                 spu_x, spu_y, lr_total_batch = self.batch_cache[infeed_step]
 
+            shuffle = dict()
+            if rng is not None:
+                rows = min(
+                    self.infeed_batch_size,
+                    self.samples - infeed_step * self.infeed_batch_size,
+                )
+                shuffle['perm'] = rng.permutation(rows)
+
             spu_w = self.spu(
                 _batch_update_w,
                 static_argnames=(
@@ -361,6 +392,7 @@ class SSRegression:
                 penalty=self.penalty,
                 total_batch=lr_total_batch,
                 batch_size=self.lr_batch_size,
+                **shuffle,
             )
 
         return spu_w
@@ -376,6 +408,10 @@ class SSRegression:
         reg_type: str = 'logistic',
         penalty: str = 'None',
         l2_norm: float = 0.5,
+        tol: float = 0.0,
+        check_interval: int = 1,
+        shuffle: bool = False,
+        random_state: int = None,
     ) -> None:
         """
         Fit the model according to the given training data.
@@ -401,6 +437,18 @@ class SSRegression:
                 The penalty (aka regularization term) to be used.
             l2_norm : float, default=0.5
                 L2 regularization term.
+            tol : float, default=0.0
+                stop training early if the max absolute change of weights in
+                the last check_interval epochs is less than tol. Only whether
+                it converged is revealed. 0 disables early stop.
+            check_interval : int, default=1
+                check early stop every check_interval epochs, each check waits
+                for the training in spu.
+            shuffle : bool, default=False
+                shuffle order of infeed batches and rows in each infeed batch
+                every epoch. The permutations are public and from random_state.
+            random_state : int, default=None
+                seed of the shuffle.
 
         Return:
             Final weights in SPUObject.
@@ -421,13 +469,26 @@ class SSRegression:
             base=0, num_feat=self.num_feat
         )
 
+        assert tol >= 0, f"tol should >=0, got {tol}"
+        assert check_interval > 0, f"check_interval should >0, got {check_interval}"
+        rng = np.random.default_rng(random_state) if shuffle else None
+
         self.batch_cache = {}
+        start = time.time()
+        last_w = spu_w
         for epoch_idx in range(epochs):
-            start = time.time()
-            spu_w = self._epoch(spu_w, epoch_idx)
-            wait([spu_w])
-            logging.info(f"epoch {epoch_idx + 1} times: {time.time() - start}s")
-            # todo: do early stop
+            spu_w = self._epoch(spu_w, rng)
+            if tol > 0 and (epoch_idx + 1) % check_interval == 0:
+                converged = reveal(
+                    self.spu(_converged, static_argnames='tol')(spu_w, last_w, tol=tol)
+                )
+                logging.info(f"epoch {epoch_idx + 1} times: {time.time() - start}s")
+                if converged:
+                    logging.info(f"early stop at epoch {epoch_idx + 1}")
+                    break
+                last_w = spu_w
+        wait([spu_w])
+        logging.info(f"fit times: {time.time() - start}s")
         self.batch_cache = {}
         self.spu_w = spu_w
 
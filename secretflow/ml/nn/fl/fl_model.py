@@ -26,6 +26,7 @@ import secrets
 from typing import Callable, Dict, List, Tuple, Union
 
 import numpy as np
+import ray
 from tqdm import tqdm
 
 from secretflow.data.horizontal.dataframe import HDataFrame
@@ -36,6 +37,15 @@ from secretflow.ml.nn.fl.compress import COMPRESS_STRATEGY, do_compress
 from secretflow.ml.nn.fl.metrics import Metric, aggregate_metrics
 from secretflow.ml.nn.fl.strategy_dispatcher import dispatch_strategy
 from secretflow.ml.nn.fl.utils import History
+from secretflow.security.aggregation import SecureAggregator
+
+# strategies whose clients upload full model weights, so a client missing some
+# aggregations is still able to catch up with the latest global weights.
+ASYNC_STRATEGY = ['fed_avg_w', 'fed_prox']
+
+
+def _staleness_mixing(alpha, staleness):
+    return alpha / (1 + staleness)
 
 
 class FLModel:
@@ -250,6 +260,8 @@ class FLModel:
         random_seed=None,
         dp_spent_step_freq=None,
         audit_log_dir=None,
+        max_staleness=None,
+        async_alpha=0.5,
     ) -> History:
         """Horizontal federated training interface
 
@@ -274,6 +286,15 @@ class FLModel:
             random_seed: Prg seed for shuffling
             dp_spent_step_freq: specifies how many training steps to check the budget of dp
             audit_log_dir: path of audit log dir, checkpoint will be save if audit_log_dir is not None
+            max_staleness: None means synchronous aggregation, which waits for all clients
+                every round. Otherwise aggregation is asynchronous: each round merges the
+                updates which have finished into the global model as
+                `(1 - a) * global + a * average`, finished clients start next round at
+                once while stragglers keep training. An update is waited for only when it
+                falls `max_staleness` rounds behind. Only supported by weight-based
+                strategies and non-secure aggregators.
+            async_alpha: base mixing rate of asynchronous aggregation in (0, 1), the
+                rate of an update is `a = async_alpha / (1 + staleness)`.
         Returns:
             A history object. It's history.global_history attribute is a
             aggregated record of training loss values and metrics, while
@@ -293,6 +314,19 @@ class FLModel:
             assert (
                 isinstance(dp_spent_step_freq, int) and dp_spent_step_freq >= 1
             ), 'dp_spent_step_freq should be a integer and greater than or equal to 1!'
+        if max_staleness is not None:
+            assert (
+                isinstance(max_staleness, int) and max_staleness >= 0
+            ), 'max_staleness should be a integer and greater than or equal to 0!'
+            assert (
+                self.strategy in ASYNC_STRATEGY
+            ), f'Asynchronous aggregation only supports {ASYNC_STRATEGY}, but got {self.strategy}'
+            assert not isinstance(
+                self._aggregator, SecureAggregator
+            ), 'Asynchronous aggregation does not support SecureAggregator'
+            assert (
+                0 < async_alpha < 1
+            ), f'async_alpha should in (0, 1), got {async_alpha}'
 
         # build dataset
         if isinstance(x, Dict):
@@ -352,11 +386,18 @@ class FLModel:
             # do train
             report_list.append(f"epoch: {epoch+1}/{epochs} - ")
             [worker.on_epoch_begin(epoch) for worker in self._workers.values()]
-            for step in range(0, self.steps_per_epoch, aggregate_freq):
+            # client updates not aggregated yet: device -> (params, sample num, round).
+            inflight = {}
+            for cur_round, step in enumerate(
+                range(0, self.steps_per_epoch, aggregate_freq)
+            ):
                 if verbose == 1:
                     pbar.update(aggregate_freq)
-                client_param_list, sample_num_list = [], []
+                # all clients are dispatched before any synchronization, the
+                # aggregation is the only point waiting for clients.
                 for device, worker in self._workers.items():
+                    if device in inflight:
+                        continue
                     client_params = (
                         model_params.to(device) if model_params is not None else None
                     )
@@ -368,12 +409,19 @@ class FLModel:
                         else self.steps_per_epoch - step,
                         **self.kwargs,
                     )
-                    client_param_list.append(client_params)
-                    sample_num_list.append(sample_num)
+                    inflight[device] = (client_params, sample_num, cur_round)
 
-                model_params = self._aggregator.average(
-                    client_param_list, axis=0, weights=sample_num_list
-                )
+                if max_staleness is None:
+                    model_params = self._aggregator.average(
+                        [params for params, _, _ in inflight.values()],
+                        axis=0,
+                        weights=[sample_num for _, sample_num, _ in inflight.values()],
+                    )
+                    inflight = {}
+                else:
+                    model_params = self._async_aggregate(
+                        model_params, inflight, cur_round, max_staleness, async_alpha
+                    )
 
                 # Do weight sparsify
                 if self.strategy in COMPRESS_STRATEGY:
@@ -402,6 +450,17 @@ class FLModel:
                         )
                         logging.debug(f'DP privacy accountant {privacy_spent}')
 
+            # stragglers of asynchronous aggregation are drained before epoch end.
+            if inflight:
+                model_params = self._async_aggregate(
+                    model_params,
+                    inflight,
+                    cur_round,
+                    max_staleness,
+                    async_alpha,
+                    drain=True,
+                )
+
             local_metrics_obj = []
             for device, worker in self._workers.items():
                 worker.on_epoch_end(epoch)
@@ -448,14 +507,84 @@ class FLModel:
             if verbose == 1:
                 pbar.set_postfix_str(report)
                 pbar.close()
-            stop_trainings = [
-                reveal(worker.get_stop_training()) for worker in self._workers.values()
-            ]
+            stop_trainings = reveal(
+                [worker.get_stop_training() for worker in self._workers.values()]
+            )
             if sum(stop_trainings) >= self.consensus_num:
                 break
 
         return history
 
+    def _async_aggregate(
+        self,
+        model_params: PYUObject,
+        inflight: Dict[PYU, Tuple[PYUObject, PYUObject, int]],
+        cur_round: int,
+        max_staleness: int,
+        alpha: float,
+        drain: bool = False,
+    ) -> PYUObject:
+        """Merge finished client updates into the global model.
+
+        The updates which have finished are merged, the driver only waits for the first
+        one to finish if there is none. Updates falling `max_staleness` rounds behind
+        are merged as well, which waits for them. Average of the merged updates weighted
+        by sample num is mixed into the global model by a = alpha / (1 + staleness).
+        Merged updates are removed from inflight.
+
+        Args:
+            model_params: global model params, None before the first aggregation.
+            inflight: client updates not aggregated yet, device -> (params, sample num,
+                round the update started).
+            cur_round: current round.
+            max_staleness: max rounds an update is allowed to fall behind.
+            alpha: base mixing rate.
+            drain: whether to merge all updates.
+
+        Returns:
+            global model params.
+        """
+        if drain:
+            ready = list(inflight.keys())
+        else:
+            refs = {device: params.data for device, (params, _, _) in inflight.items()}
+            overdue = [
+                device
+                for device, (_, _, start_round) in inflight.items()
+                if cur_round - start_round >= max_staleness
+            ]
+            ready_refs, _ = ray.wait(
+                list(refs.values()), num_returns=len(refs), timeout=0
+            )
+            if not ready_refs and not overdue:
+                ready_refs, _ = ray.wait(list(refs.values()), num_returns=1)
+            ready_refs = set(ready_refs)
+            ready = [
+                device
+                for device, ref in refs.items()
+                if ref in ready_refs or device in overdue
+            ]
+
+        client_param_list, weight_list, staleness = [], [], 0
+        for device in ready:
+            params, sample_num, start_round = inflight.pop(device)
+            client_param_list.append(params)
+            weight_list.append(sample_num)
+            staleness = max(staleness, cur_round - start_round)
+        logging.debug(
+            f'Asynchronous aggregation of round {cur_round}: {[d.party for d in ready]}, '
+            f'staleness {staleness}'
+        )
+        avg_params = self._aggregator.average(
+            client_param_list, axis=0, weights=weight_list
+        )
+        if model_params is None:
+            return avg_params
+        mixing = _staleness_mixing(alpha, staleness)
+        return self._aggregator.average(
+            [model_params, avg_params], axis=0, weights=[1 - mixing, mixing]
+        )
+
     def predict(
         self,
         x: Union[HDataFrame, FedNdarray, Dict],
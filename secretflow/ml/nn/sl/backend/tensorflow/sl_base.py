@@ -19,7 +19,10 @@
 """sl model base
 """
 import copy
+import time
 from abc import ABC, abstractmethod
+from collections import deque
+from functools import wraps
 from pathlib import Path
 from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
@@ -40,6 +43,20 @@ from secretflow.security.privacy import DPStrategy
 from secretflow.utils.compressor import Compressor, SparseCompressor
 
 
+def _record_busy_time(method):
+    """Accumulate wall time spent inside the method to `self.busy_time`."""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.busy_time += time.perf_counter() - start
+
+    return wrapper
+
+
 class SLBaseModel(ABC):
     def __init__(self, builder_base: Callable, builder_fuse: Callable = None):
         self.model_base = builder_base() if builder_base is not None else None
@@ -137,6 +154,12 @@ class SLBaseTFModel(SLBaseModel):
         self.epoch_logs = None
         self.training_logs = None
         self.steps_per_epoch = None
+        # forward results of train batches waiting for backward, in batch order.
+        # More than one batch is pending when fit runs in pipeline mode.
+        self._pending_forwards = deque()
+        self._pending_labels = deque()
+        # seconds spent in forward, backward and fuse net.
+        self.busy_time = 0.0
 
     @staticmethod
     @tf.custom_gradient
@@ -236,6 +259,18 @@ class SLBaseTFModel(SLBaseModel):
                 h = self.embedding_dp(h)
         return h
 
+    def get_busy_time(self, reset: bool = False) -> float:
+        """Get seconds spent in forward, backward and fuse net.
+
+        Args:
+            reset: Whether to reset the counter after reading.
+        """
+        busy_time = self.busy_time
+        if reset:
+            self.busy_time = 0.0
+        return busy_time
+
+    @_record_busy_time
     def base_forward(self, stage="train", compress: bool = False):
         """compute hidden embedding
         Args:
@@ -298,6 +333,10 @@ class SLBaseTFModel(SLBaseModel):
                 data_x,
                 self.h,
             )
+        if stage == "train":
+            self._pending_forwards.append((self.tape, self.h))
+            if self.has_y:
+                self._pending_labels.append((self.train_y, self.train_sample_weight))
         if compress:
             if self.compressor:
                 return self.compressor.compress(self.h.numpy())
@@ -312,15 +351,24 @@ class SLBaseTFModel(SLBaseModel):
 
         self.model_base.optimizer.apply_gradients(zip(gradients, trainable_vars))
 
+    @_record_busy_time
     def base_backward(self, gradient, compress: bool = False):
         """backward on fusenet
 
+        Backward is applied to the oldest train batch which has not been
+        backwarded yet.
+
         Args:
             gradient: gradient of fusenet hidden layer
             compress: Whether to decompress gradient.
         """
 
         return_hiddens = []
+        tape, h = (
+            self._pending_forwards.popleft()
+            if self._pending_forwards
+            else (self.tape, self.h)
+        )
 
         if compress:
             if self.compressor:
@@ -329,16 +377,16 @@ class SLBaseTFModel(SLBaseModel):
                 raise Exception(
                     'can not find compressor when decompress data in base_backward'
                 )
-        with self.tape:
-            if len(gradient) == len(self.h):
+        with tape:
+            if len(gradient) == len(h):
                 for i in range(len(gradient)):
-                    return_hiddens.append(self.fuse_op(self.h[i], gradient[i]))
+                    return_hiddens.append(self.fuse_op(h[i], gradient[i]))
             else:
                 gradient = gradient[0]
-                return_hiddens.append(self.fuse_op(self.h, gradient))
+                return_hiddens.append(self.fuse_op(h, gradient))
 
         trainable_vars = self.model_base.trainable_variables
-        gradients = self.tape.gradient(return_hiddens, trainable_vars)
+        gradients = tape.gradient(return_hiddens, trainable_vars)
 
         self._base_backword_internal(gradients, trainable_vars)
 
@@ -408,6 +456,7 @@ class SLBaseTFModel(SLBaseModel):
         else:
             raise Exception("Illegal Argument")
 
+    @_record_busy_time
     def fuse_net(self, *hidden_features, _num_returns=2, compress=False):
         """Fuses the hidden layer and calculates the reverse gradient
         only on the side with the label
@@ -446,10 +495,16 @@ class SLBaseTFModel(SLBaseModel):
 
         logs = {}
 
+        # labels of the oldest train batch which has not been fused yet.
+        train_y, train_sample_weight = (
+            self._pending_labels.popleft()
+            if self._pending_labels
+            else (self.train_y, self.train_sample_weight)
+        )
         gradient = self._fuse_net_internal(
             hiddens,
-            self.train_y,
-            self.train_sample_weight,
+            train_y,
+            train_sample_weight,
         )
 
         for m in self.model_fuse.metrics:
@@ -24,6 +24,8 @@ import logging
 import math
 import os
 import secrets
+import time
+from collections import deque
 from typing import Callable, Dict, Iterable, List, Tuple, Union
 
 from tqdm import tqdm
@@ -164,6 +166,8 @@ class SLModel:
         dataset_builder: Callable[[List], Tuple[int, Iterable]] = None,
         audit_log_dir: str = None,
         random_seed: int = None,
+        pipeline: bool = False,
+        pipeline_staleness: int = 1,
     ):
         """Vertical split learning training interface
 
@@ -187,6 +191,14 @@ class SLModel:
             dataset_builder: Callable function, its input is `x` or `[x, y]` if y is set, it should return a
                 iterable dataset which should has `steps_per_epoch` property. Dataset builder is mainly for
                 building graph dataset.
+            pipeline: Whether to overlap base forward of following batches with backward of
+                current batch. Base models then compute forward with weights which miss the
+                updates of at most `pipeline_staleness` batches.
+            pipeline_staleness: How many batches base forward can run ahead of backward in
+                pipeline mode.
+
+        The wall time per training step and idle time of each device in every epoch are
+        logged and kept in `self.train_time_stats`.
         """
         if random_seed is None:
             random_seed = secrets.randbelow(100000)
@@ -202,6 +214,12 @@ class SLModel:
         assert isinstance(validation_freq, int) and validation_freq >= 1
         if dp_spent_step_freq is not None:
             assert isinstance(dp_spent_step_freq, int) and dp_spent_step_freq >= 1
+        if pipeline:
+            assert (
+                isinstance(pipeline_staleness, int) and pipeline_staleness >= 1
+            ), f"pipeline_staleness should be integer >= 1"
+        # how many batches base forward runs ahead of backward.
+        forward_ahead = pipeline_staleness if pipeline else 0
 
         # get basenet ouput num
         self.basenet_output_num = {
@@ -249,6 +267,7 @@ class SLModel:
         self._workers[self.device_y].on_train_begin()
 
         fuse_net_num_returns = sum(self.basenet_output_num.values())
+        self.train_time_stats = []
 
         for epoch in range(epochs):
             report_list = []
@@ -256,17 +275,29 @@ class SLModel:
             if verbose == 1:
                 pbar = tqdm(total=steps_per_epoch)
             self._workers[self.device_y].on_epoch_begin(epoch)
+            for worker in self._workers.values():
+                worker.get_busy_time(reset=True)
+            epoch_start = time.perf_counter()
+            # hiddens of batches which have been forwarded but not fused yet.
+            pending_hiddens = deque()
             for step in range(0, steps_per_epoch):
                 if verbose == 1:
                     pbar.update(1)
-                hiddens = []
                 self._workers[self.device_y].on_train_batch_begin(step=step)
-                for device, worker in self._workers.items():
-                    # enable compression in fit when model has compressor
-                    hidden = worker.base_forward(
-                        stage="train", compress=self.has_compressor
-                    )
-                    hiddens.append(hidden.to(self.device_y))
+                # in pipeline mode, forward of following batches is issued before
+                # backward of this batch, so that they overlap on base devices.
+                forward_step = step + len(pending_hiddens)
+                while forward_step <= min(step + forward_ahead, steps_per_epoch - 1):
+                    hiddens = []
+                    for device, worker in self._workers.items():
+                        # enable compression in fit when model has compressor
+                        hidden = worker.base_forward(
+                            stage="train", compress=self.has_compressor
+                        )
+                        hiddens.append(hidden.to(self.device_y))
+                    pending_hiddens.append(hiddens)
+                    forward_step += 1
+                hiddens = pending_hiddens.popleft()
 
                 gradients = self._workers[self.device_y].fuse_net(
                     *hiddens,
@@ -293,6 +324,27 @@ class SLModel:
                             privacy_dict = dp_strategy.get_privacy_spent(current_step)
                             privacy_device[device] = privacy_dict
 
+            # wait for all steps of this epoch done.
+            busy_time = reveal(
+                {
+                    device: worker.get_busy_time(reset=True)
+                    for device, worker in self._workers.items()
+                }
+            )
+            epoch_time = time.perf_counter() - epoch_start
+            time_stats = {
+                'step_time': epoch_time / steps_per_epoch,
+                'idle_time': {
+                    device.party: max(epoch_time - busy, 0.0)
+                    for device, busy in busy_time.items()
+                },
+            }
+            self.train_time_stats.append(time_stats)
+            logging.info(f"SL Train epoch {epoch} time stats: {time_stats}")
+            report_list.append(f"step_time:{time_stats['step_time']:.4f}s ")
+            for party, idle in time_stats['idle_time'].items():
+                report_list.append(f"{party}_idle_time:{idle:.4f}s ")
+
             if validation and epoch % validation_freq == 0:
                 # validation
                 self._workers[self.device_y].reset_metrics()
@@ -15,9 +15,8 @@
 """
 driver端程序
 """
-import functools
 import logging
-import operator
+import time
 from typing import Dict, List
 
 import numpy as np
@@ -41,6 +40,10 @@ class HomoBinning(HomoBinningBase):
         allow_duplicate: whether to allow duplicate bucket values
         aggregator:  to aggregate values with aggregator
         max_iter: max iteration round
+        search_points: how many values each split point queries in a round.
+            1 is a bisection search, larger values narrow the search interval
+            by search_points + 1 times per round and need fewer rounds.
+        round_times: seconds of each aggregation round in last fit.
     """
 
     def __init__(
@@ -55,6 +58,7 @@ class HomoBinning(HomoBinningBase):
         allow_duplicate: bool = False,
         max_iter: int = 10,
         aggregator=None,
+        search_points: int = 1,
     ):
         self.bin_num = bin_num
         self.compress_thres = compress_thres
@@ -65,6 +69,9 @@ class HomoBinning(HomoBinningBase):
         self.abnormal_list = abnormal_list
         self.allow_duplicate = allow_duplicate
         self.max_iter = max_iter
+        assert search_points >= 1, f"search_points must >= 1, got {search_points}"
+        self.search_points = search_points
+        self.round_times = []
 
         self._total_count = 0
         self._missing_counts = 0
@@ -84,6 +91,7 @@ class HomoBinning(HomoBinningBase):
                 head_size=self.head_size,
                 allow_duplicate=self.allow_duplicate,
                 abnormal_list=self.abnormal_list,
+                search_points=self.search_points,
                 device=device,
             )
         self.aggregator = hdata.aggregator
@@ -145,32 +153,50 @@ class HomoBinning(HomoBinningBase):
         for device, worker in self._workers.items():
             worker.set_missing_dict(g_missing_count)
             worker.set_aim_rank()
+        self.round_times = []
+        start = time.time()
         local_ranks = [
             worker.query_values() for device, worker in self._workers.items()
         ]
         global_rank = reveal(self.aggregator.sum(local_ranks, axis=0))
+        self._log_round(start)
         n_iter = 0
         logging.info("start recursive")
         while n_iter < self._max_iter:
-            is_coverge = reveal(
-                [
-                    worker.renew_query_points(global_ranks=global_rank)
-                    for device, worker in self._workers.items()
-                ]
-            )
-            g_converge = functools.reduce(operator.and_, is_coverge)
-            if g_converge:
-                break
+            start = time.time()
+            # all workers renew the same query points, so convergence of any
+            # worker is global, and the ranks of next round are queried ahead
+            # to reveal both in one round trip.
+            is_coverge = [
+                worker.renew_query_points(global_ranks=global_rank)
+                for device, worker in self._workers.items()
+            ]
             local_ranks = [
                 worker.query_values() for device, worker in self._workers.items()
             ]
-            global_rank = reveal(self.aggregator.sum(local_ranks, axis=0))
+            g_converge, global_rank = reveal(
+                [is_coverge[0], self.aggregator.sum(local_ranks, axis=0)]
+            )
+            self._log_round(start)
+            if g_converge:
+                break
             n_iter += 1
+        logging.info(
+            f"homo binning finished in {len(self.round_times)} rounds, "
+            f"{sum(self.round_times):.3f}s"
+        )
         bin_results = [
             worker.get_bin_result() for device, worker in self._workers.items()
         ]
         return bin_results[0]
 
+    def _log_round(self, start: float):
+        self.round_times.append(time.time() - start)
+        logging.info(
+            f"homo binning round {len(self.round_times)}: "
+            f"{self.round_times[-1]:.3f}s"
+        )
+
     def setup_header_param(
         self, header: List[str], bin_names: List[str], bin_indexes: List[int]
     ) -> (List[str], List[int], Dict[int, str], Dict[int, str]):
@@ -19,7 +19,7 @@
 import copy
 import functools
 import operator
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Dict, List
 
 import numpy as np
@@ -43,6 +43,7 @@ class SplitPointNode:
         allow_error_rank: error tolerance on ranks
         error: create a new node if the difference is greater than error
         fixed: whether the split position converges
+        centered: whether value is the middle of min_value and max_value
     """
 
     value: float
@@ -52,33 +53,61 @@ class SplitPointNode:
     allow_error_rank: int = 0
     error: float = 1e-4
     fixed: bool = False
+    centered: bool = False
 
-    def create_right_new(self):
-        """Search the right half"""
-        value = (self.value + self.max_value) / 2
-        if (
-            np.fabs(value - self.value)
-            <= (self.max_value - self.min_value) * self.error * 0.1
-        ):
-            self.fixed = True
-            return self
-        min_value = self.value
-        return SplitPointNode(
-            value, min_value, self.max_value, self.aim_rank, self.allow_error_rank
+    def search_values(self, search_points: int = 1) -> np.ndarray:
+        """Values to query in this round.
+
+        Values evenly split (min_value, max_value), the initial value is
+        queried too before the first renew. With one search point this is a
+        bisection search that queries value only.
+
+        Args:
+            search_points: how many values to query for this node in a round.
+        """
+        if self.fixed:
+            return np.full(search_points, self.value)
+        if self.centered:
+            offsets = np.linspace(-1, 1, search_points + 2)[1:-1]
+            return self.value + (self.max_value - self.min_value) / 2 * offsets
+        return np.sort(
+            np.append(
+                np.linspace(self.min_value, self.max_value, search_points + 1)[1:-1],
+                self.value,
+            )
         )
 
-    def create_left_new(self):
-        """Search the left half"""
-        value = (self.value + self.min_value) / 2
-        if (
-            np.fabs(value - self.value)
-            <= (self.max_value - self.min_value) * self.error * 0.1
-        ):
-            self.fixed = True
-            return self
-        max_value = self.value
+    def renew(self, values: np.ndarray, ranks: np.ndarray) -> 'SplitPointNode':
+        """Create the node of next round by the global ranks of search_values.
+
+        The node is fixed on the value whose rank is nearest to aim_rank if it
+        is within allow_error_rank, otherwise the search continues in the
+        middle of the nearest values below and above aim_rank.
+        """
+        if self.fixed:
+            return copy.deepcopy(self)
+        diffs = ranks - self.aim_rank
+        nearest = np.argmin(np.abs(diffs))
+        if np.abs(diffs[nearest]) <= self.allow_error_rank:
+            return replace(self, value=values[nearest], fixed=True)
+
+        lower, upper = diffs < 0, diffs > 0
+        min_value = values[lower].max() if lower.any() else self.min_value
+        max_value = values[upper].min() if upper.any() else self.max_value
+        value = (min_value + max_value) / 2
+        distances = np.abs(values - value)
+        closest = np.argmin(distances)
+        if distances[closest] <= (self.max_value - self.min_value) * self.error * 0.1:
+            # interval can not be narrowed, stay on the closest queried value.
+            return replace(self, value=values[closest], fixed=True)
         return SplitPointNode(
-            value, self.min_value, max_value, self.aim_rank, self.allow_error_rank
+            value,
+            min_value,
+            max_value,
+            self.aim_rank,
+            self.allow_error_rank,
+            error=self.error,
+            centered=True,
         )
 
 
@@ -97,6 +126,7 @@ class HomoBinningBase(BaseBinning):
         min_values: a dict of min values for each features
         total_count: total count
         columns: feature names
+        search_points: how many values each split point queries in a round
     """
 
     def __init__(
@@ -109,6 +139,7 @@ class HomoBinningBase(BaseBinning):
         head_size: int = 10000,
         allow_duplicate: bool = True,
         abnormal_list: List = None,
+        search_points: int = 1,
     ):
         super().__init__(
             bin_names=bin_names,
@@ -130,6 +161,7 @@ class HomoBinningBase(BaseBinning):
         self.missing_dict = {}
         self.split_num = None
         self.query_points = None
+        self.search_points = search_points
 
     def get_missing_count(self) -> Dict[str, int]:
         """statistics of missing count of all parties
@@ -209,10 +241,10 @@ class HomoBinningBase(BaseBinning):
     def query_values(self):
         """Query what is the global rank for each current partition point
         Returns:
-            global_rank: Dict
-            eg: {col1: [g_rank1],
-                 col2: [g_rank2]
-            }
+            global_rank: np.ndarray, search_points ranks of each split point
+            eg: [[col1_rank1, col1_rank2, ...],
+                 [col2_rank1, col2_rank2, ...]
+            ]
 
         """
         columns = self.summary_dict.keys()
@@ -226,26 +258,19 @@ class HomoBinningBase(BaseBinning):
 
     def query_table(
         self,
-        summary: Dict[str, QuantileSummaries],
-        query_points: Dict[str, List[SplitPointNode]],
+        summary: QuantileSummaries,
+        query_points: List[SplitPointNode],
     ) -> np.array:
         """Query the rank of query_points in the local summary
 
         Args:
-            summary: a dict store summary of each features
-            query_points:{
-                col1: [SplitPointNode,...,SplitPointNode],
-                col2: [SplitPointNode,...,SplitPointNode],
-                ...
-            }
+            summary: summary of the feature
+            query_points: [SplitPointNode,...,SplitPointNode] of the feature
         """
-
-        queries = [x.value for x in query_points]
-        original_idx = np.argsort(np.argsort(queries))
-        queries = np.sort(queries)
-        ranks = summary.batch_query_value(queries)
-        ranks = np.array(ranks)[original_idx]
-        return np.array(ranks, dtype=int)
+        queries = np.concatenate(
+            [x.search_values(self.search_points) for x in query_points]
+        )
+        return np.array(summary.batch_query_value(queries), dtype=int)
 
     def set_aim_rank(self):
         for col, split_point_array in self.query_points_dict.items():
@@ -276,32 +301,17 @@ class HomoBinningBase(BaseBinning):
         """Use to update query points
 
         Args:
-            query_points: A list of split points for a column[splitNode0, splitNode1, ... , splitNodeN]
+            global_ranks: global ranks of query_values for all columns.
 
         Returns:
-            List: A list after split
+            bool: whether all query points are fixed.
         """
-        query_idx = 0
-        for col, query_points in self.query_points_dict.items():
-            new_array = []
-            ranks = global_ranks[query_idx]
-            for idx, node in enumerate(query_points):
-                rank = ranks[idx]
-
-                if node.fixed:
-                    new_node = copy.deepcopy(node)
-                elif rank - node.aim_rank > node.allow_error_rank:
-                    new_node = node.create_left_new()
-                elif node.aim_rank - rank > node.allow_error_rank:
-                    new_node = node.create_right_new()
-                else:
-                    new_node = copy.deepcopy(node)
-                    new_node.fixed = True
-                new_node.last_rank = rank
-                new_array.append(new_node)
-
-            self.query_points_dict[col] = new_array
-            query_idx += 1
+        for col_idx, (col, query_points) in enumerate(self.query_points_dict.items()):
+            ranks = np.reshape(global_ranks[col_idx], (len(query_points), -1))
+            self.query_points_dict[col] = [
+                node.renew(node.search_values(self.search_points), rank)
+                for node, rank in zip(query_points, ranks)
+            ]
         return self.check_converge()
 
     def check_converge(self) -> bool:
@@ -66,6 +66,8 @@ class QuantileSummaries(object):
         self.sampled = []
         self.count = 0
         self.missing_count = 0
+        # sorted sample values and the rank of each insert position, see _rank_table.
+        self._rank_table = None
         if abnormal_list is None:
             self.abnormal_list = []
         else:
@@ -93,6 +95,7 @@ class QuantileSummaries(object):
             new_sampled.append(new_stats)
             pre_rank = bin_t
         self.sampled = new_sampled
+        self._rank_table = None
         self.head_sampled = []
         self.count = len(col_data)
         if len(self.sampled) >= self.compress_thres:
@@ -103,6 +106,7 @@ class QuantileSummaries(object):
         merge_threshold = 2 * self.error * self.count
         compressed = self._compress_immut(merge_threshold)
         self.sampled = compressed
+        self._rank_table = None
 
     def query(self, quantile: float) -> float:
         """Use to query the value that specifies the quantile location
@@ -140,47 +144,41 @@ class QuantileSummaries(object):
             i += 1
         return self.sampled[-1].value
 
+    def _build_rank_table(self):
+        """Build sorted sample values and the estimated rank of each insert
+        position, the rank of a value inserted before sampled[k] is the mean of
+        min and max rank of sampled[k - 1]."""
+        values = np.array([s.value for s in self.sampled], dtype=np.float64)
+        w = np.array([s.w for s in self.sampled], dtype=np.int64)
+        delta = np.array([s.delta for s in self.sampled], dtype=np.int64)
+        min_ranks = np.concatenate(([0], np.cumsum(w)))
+        max_ranks = min_ranks + np.concatenate(([0], delta))
+        return values, (min_ranks + max_ranks) // 2
+
     def value_to_rank(self, value: Union[float, int]) -> int:
-        min_rank, max_rank = 0, 0
-        for sample in self.sampled:
-            if sample.value < value:
-                min_rank += sample.w
-                max_rank = min_rank + sample.delta
-            else:
-                return (min_rank + max_rank) // 2
-        return (min_rank + max_rank) // 2
+        values, ranks = (
+            self._rank_table
+            if self._rank_table is not None
+            else self._build_rank_table()
+        )
+        return int(ranks[np.searchsorted(values, value, side='left')])
 
-    def batch_query_value(self, values: List[float]) -> List[int]:
+    def batch_query_value(self, values: List[float]) -> np.ndarray:
         """batch query function
 
+        The summary is compressed once and its rank table is kept until the
+        summary changes, each query is a binary search on the table.
+
         Args:
-            values : List sorted_list of value. eg:[13, 56, 79]
+            values : List of value, need not be sorted. eg:[13, 56, 79]
         Returns:
-            List : output ranks of each query
+            np.ndarray : output ranks of each query
         """
-        self.compress()
-        res = []
-        min_rank, max_rank = 0, 0
-        idx = 0
-        sample_idx = 0
-
-        while sample_idx < len(self.sampled):
-            v = values[idx]
-            sample = self.sampled[sample_idx]
-            if sample.value < v:
-                min_rank += sample.w
-                max_rank = min_rank + sample.delta
-                sample_idx += 1
-            else:
-                res.append((min_rank + max_rank) // 2)
-                idx += 1
-                if idx >= len(values):
-                    break
-
-        while idx < len(values):
-            res.append((min_rank + max_rank) // 2)
-            idx += 1
-        return res
+        if self._rank_table is None:
+            self.compress()
+            self._rank_table = self._build_rank_table()
+        sample_values, ranks = self._rank_table
+        return ranks[np.searchsorted(sample_values, values, side='left')]
 
     def _compress_immut(self, merge_threshold: float) -> List:
         if not self.sampled:
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List, Dict, Union
+from typing import List, Dict, Tuple, Union
 import jax.numpy as jnp
 import numpy as np
 
@@ -25,6 +25,42 @@ from secretflow.data.vertical import VDataFrame
 from secretflow.device import reveal
 
 
+def bin_ids_positive_sums(
+    label: np.ndarray,
+    bin_ids: np.ndarray,
+    feature_bins: Tuple[int],
+    else_bins: Tuple[int],
+) -> np.ndarray:
+    '''
+    sum label over bins of all features by bin ids, used in SPU.
+
+    bin ids are secret, so each feature's bins are selected obliviously by
+    comparing its column with all of its bin ids. Only samples x features ids
+    are fed into SPU instead of a samples x bins select matrix.
+
+    Attributes:
+        label: binarized label.
+        bin_ids: see VertWoeBinningPyuWorker.slave_build_sum_bin_ids.
+        feature_bins: bins count of each feature.
+        else_bins: 1 if np.nan bin of each feature is not empty else 0.
+
+    Return:
+        positive counts of all features' bins, followed by positive counts of
+        all not empty np.nan bins.
+    '''
+    sums = [
+        jnp.matmul(
+            label,
+            (bin_ids[:, f_idx, None] == jnp.arange(b + e)).astype(label.dtype),
+        )
+        for f_idx, (b, e) in enumerate(zip(feature_bins, else_bins))
+    ]
+    return jnp.concatenate(
+        [s[:b] for s, b in zip(sums, feature_bins)]
+        + [s[b:] for s, b in zip(sums, feature_bins)]
+    )
+
+
 class VertWoeBinning:
     """
     woe binning for vertical slice datasets.
@@ -81,6 +117,7 @@ class VertWoeBinning:
         chimerge_target_bins: int = 10,
         chimerge_target_pvalue: float = 0.1,
         audit_log_path: Dict[str, str] = {},
+        compact_bins: bool = False,
     ):
         """
         Build woe substitution rules base on vdata.
@@ -113,6 +150,13 @@ class VertWoeBinning:
                 example: {'alice': '/path/to/alice/audit/filename', 'bob': 'bob/audit/filename'}
                 NOTICE: Please !!DO NOT!! touch this options, leave it empty and disabled.
                         Unless you really know this option's meaning and accept its risk.
+            compact_bins: only used in SPU mode. False feeds a samples x bins select matrix
+                into SPU and sums by one matmul. True feeds samples x features bin ids instead,
+                which cuts the SPU input by bins / features times, but compares every id with
+                all bins of its feature inside SPU, which costs about 15x the communication and
+                10x+ the time of the matmul (see benchmark/woe_binning_spu.py). Only use it
+                when the select matrix does not fit in memory.
+                Default: False
 
         Return:
             Dict[PYU, PYUObject], PYUObject contain a dict for all features' rule in this party.
@@ -221,13 +265,35 @@ class VertWoeBinning:
                     self.secure_device.get_participant(device.party).dump_pk.remote(
                         f'{worker_audit_path}.pk.pickle'
                     )
-                idx_obj = worker.slave_build_sum_indices(vdata.partitions[device].data)
-                # FIXME: avoid reveal, use remote function to calc sum in HEU when HEU support it
-                bin_indices = reveal(idx_obj)
-                bins_positive = [
-                    secure_label[b].sum().to(master_device).to(device)
-                    for b in bin_indices
-                ]
+                bin_indices = worker.slave_build_sum_indices(
+                    vdata.partitions[device].data
+                )
+                # sum all bins in one HEU call and decrypt them in one batch,
+                # bin indices are sent from worker to HEU evaluator directly.
+                bins_positive = (
+                    secure_label.batch_select_sum(bin_indices)
+                    .to(master_device)
+                    .to(device)
+                )
+                bin_stats = worker.slave_sum_bin(bins_positive)
+            elif compact_bins:
+                bin_ids, feature_bins, else_bins = worker.slave_build_sum_bin_ids(
+                    vdata.partitions[device].data
+                )
+                # bins count is public in report, use it as static shape in SPU.
+                feature_bins, else_bins = reveal([feature_bins, else_bins])
+
+                spu_work = self.secure_device(
+                    bin_ids_positive_sums,
+                    static_argnames=('feature_bins', 'else_bins'),
+                )
+                bins_positive = spu_work(
+                    secure_label,
+                    bin_ids.to(self.secure_device),
+                    feature_bins=tuple(feature_bins),
+                    else_bins=tuple(else_bins),
+                ).to(device)
+
                 bin_stats = worker.slave_sum_bin(bins_positive)
             else:
                 bin_select = worker.slave_build_sum_select(
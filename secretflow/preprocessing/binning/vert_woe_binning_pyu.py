@@ -16,12 +16,193 @@ from typing import List, Dict, Union, Tuple
 from scipy.stats import chi2
 import pandas as pd
 import numpy as np
+import heapq
 import math
 
 from secretflow.device import PYUObject, proxy
 from secretflow.data.base import Partition
 
 
+def _codes_dtype(n_groups: int) -> np.dtype:
+    # argsort of small integers is a linear time radix sort.
+    return np.int16 if n_groups < np.iinfo(np.int16).max else np.int64
+
+
+def _group_indices(
+    codes: np.ndarray, n_groups: int
+) -> Tuple[List[np.ndarray], np.ndarray]:
+    '''
+    group sample indices by codes with one stable argsort.
+
+    Attributes:
+        codes: group id of each sample in [0, n_groups), -1 for missing value.
+        n_groups: number of groups.
+
+    Return:
+        First: ascending sample indices for each group, empty groups included.
+        Second: ascending sample indices of missing values.
+    '''
+    order = np.argsort(codes, kind='stable')
+    n_missing = np.count_nonzero(codes < 0)
+    counts = np.bincount(codes[codes >= 0], minlength=n_groups)
+    return np.split(order[n_missing:], np.cumsum(counts)[:-1]), order[:n_missing]
+
+
+def split_feature_bins(
+    f_data: pd.Series, bin_num: int
+) -> Tuple[List[np.ndarray], Union[np.ndarray, List[str]], np.ndarray]:
+    '''
+    split one feature column into {bin_num} bins.
+
+    Attributes:
+        f_data: feature column to be split.
+        bin_num: max bins of number column.
+
+    Return:
+        First: sample indices for each bins.
+        Second: split points for number column (np.array) or
+                categories for string column (List[str])
+        Third: sample indices for np.nan values.
+    '''
+    if f_data.dtype == np.dtype(object):
+        # for string type col, split into bins by categories.
+        missing = pd.isna(f_data).to_numpy()
+        values = f_data.to_numpy()[~missing]
+        value_type = pd.api.types.infer_dtype(values, skipna=True)
+        assert value_type in (
+            "string",
+            "empty",
+        ), f"only support str if dtype == np.obj, but got {value_type}"
+        categories, codes = np.unique(values, return_inverse=True)
+        f_codes = np.full(f_data.size, -1, dtype=_codes_dtype(categories.size))
+        f_codes[~missing] = codes
+        bin_indices, else_indices = _group_indices(f_codes, categories.size)
+        return bin_indices, list(categories), else_indices
+    else:
+        # for number type col, first binning by pd.qcut.
+        bins, split_points = pd.qcut(
+            f_data, bin_num, labels=False, duplicates='drop', retbins=True
+        )
+        assert split_points.size >= 2, f"split_points.size {split_points.size}"
+        n_bins = split_points.size - 1
+        codes = np.nan_to_num(np.asarray(bins, dtype=np.float64), nan=-1).astype(
+            _codes_dtype(n_bins)
+        )
+        bin_indices, else_indices = _group_indices(codes, n_bins)
+        # Then, remove empty bin in pd.qcut's result.
+        empty_bins = [0, split_points.size - 1]
+        empty_bins += [b + 1 for b, idx in enumerate(bin_indices) if idx.size == 0]
+        return (
+            [idx for idx in bin_indices if idx.size],
+            # remove start/end value & empty bins in pd.qcut's range result.
+            # remain only left-open right-close split points
+            np.delete(split_points, empty_bins),
+            else_indices,
+        )
+
+
+def _chi(bin1: Tuple[float, float], bin2: Tuple[float, float]) -> float:
+    total = bin1[0] + bin2[0]
+    total_positive = bin1[1] + bin2[1]
+    positive_rate = float(total_positive) / float(total)
+
+    if positive_rate == 0 or positive_rate == 1:
+        # two bins has same label distribution
+        return 0.0
+
+    bin1_positive = bin1[1]
+    bin1_expt_positive = positive_rate * float(bin1[0])
+    bin1_negative = bin1[0] - bin1[1]
+    bin1_expt_negative = float(bin1[0]) - bin1_expt_positive
+
+    bin2_positive = bin2[1]
+    bin2_expt_positive = positive_rate * float(bin2[0])
+    bin2_negative = bin2[0] - bin2[1]
+    bin2_expt_negative = float(bin2[0]) - bin2_expt_positive
+
+    return (
+        math.pow(bin1_positive - bin1_expt_positive, 2) / bin1_expt_positive
+        + math.pow(bin1_negative - bin1_expt_negative, 2) / bin1_expt_negative
+        + math.pow(bin2_positive - bin2_expt_positive, 2) / bin2_expt_positive
+        + math.pow(bin2_negative - bin2_expt_negative, 2) / bin2_expt_negative
+    )
+
+
+def chi_merge(
+    bins: List[Tuple[float, float]], target_bins: int, target_chi: float
+) -> Tuple[List[Tuple[float, float]], List[int]]:
+    '''
+    apply ChiMerge on one feature. ChiMerge proposed by paper AAAI92-019.
+    merge adjacent bins by their samples' Chi-Square Statistic.
+
+    Chi values of adjacent pairs are kept in a heap with lazy deletion, so
+    each merge costs O(log B). Ties are broken by the leftmost pair.
+
+    Attributes:
+        bins: bins in feature build by initialization cut.
+        target_bins: stop when bins count <= target_bins.
+        target_chi: stop when min chi value > target_chi.
+
+    Return:
+        Tuple[bins after merge, removed bin indices in input bins]
+    '''
+    bins = list(bins)
+    size = len(bins)
+    # doubly linked list over input bin indices, a merged bin keeps the index
+    # of its right part, so the left index is removed.
+    prev_idx = list(range(-1, size - 1))
+    next_idx = list(range(1, size + 1))
+    version = [0] * size
+    heap = [(_chi(bins[i], bins[i + 1]), i, i + 1, 0, 0) for i in range(size - 1)]
+    heapq.heapify(heap)
+
+    removed_idx = list()
+    while size - len(removed_idx) > target_bins and heap:
+        min_chi, left, right, left_ver, right_ver = heap[0]
+        if version[left] != left_ver or version[right] != right_ver:
+            heapq.heappop(heap)
+            continue
+        if min_chi > target_chi:
+            # chi_merge stop by chi value
+            break
+        heapq.heappop(heap)
+
+        bins[right] = (bins[left][0] + bins[right][0], bins[left][1] + bins[right][1])
+        removed_idx.append(left)
+        # invalidate all pairs of left and right.
+        version[left] = -1
+        version[right] += 1
+        prev = prev_idx[left]
+        prev_idx[right] = prev
+        if prev >= 0:
+            next_idx[prev] = right
+            heapq.heappush(
+                heap,
+                (
+                    _chi(bins[prev], bins[right]),
+                    prev,
+                    right,
+                    version[prev],
+                    version[right],
+                ),
+            )
+        nxt = next_idx[right]
+        if nxt < size:
+            heapq.heappush(
+                heap,
+                (
+                    _chi(bins[right], bins[nxt]),
+                    right,
+                    nxt,
+                    version[right],
+                    version[nxt],
+                ),
+            )
+
+    removed = set(removed_idx)
+    return [b for i, b in enumerate(bins) if i not in removed], removed_idx
+
+
 @proxy(PYUObject)
 class VertWoeBinningPyuWorker:
     """
@@ -78,46 +259,12 @@ class VertWoeBinningPyuWorker:
                     categories for string column (List[str])
             Third: sample indices for np.nan values.
         '''
-        if f_data.dtype == np.dtype(object):
-            # for string type col, split into bins by categories.
-            categories = {d for d in f_data if not pd.isna(d)}
-            for c in categories:
-                assert isinstance(
-                    c, str
-                ), f"only support str if dtype == np.obj, but got {type(c)}"
-            split_points = sorted(list(categories))
-            bin_indices = list()
-            for b in split_points:
-                bin_indices.append(np.flatnonzero(f_data == b))
-            return bin_indices, split_points, np.flatnonzero(pd.isna(f_data))
-        else:
-            # for number type col, first binning by pd.qcut.
-            bin_num = (
-                self.bin_num
-                if self.binning_method == "quantile"
-                else self.chimerge_init_bins
-            )
-            bins, split_points = pd.qcut(
-                f_data, bin_num, labels=False, duplicates='drop', retbins=True
-            )
-            bin_indices = list()
-            assert split_points.size >= 2, f"split_points.size {split_points.size}"
-            empty_bins = [0, split_points.size - 1]
-            for b in range(split_points.size - 1):
-                bin = np.flatnonzero(bins == b)
-                if bin.size == 0:
-                    # Then, remove empty bin in pd.qcut's result.
-                    empty_bins.append(b + 1)
-                else:
-                    bin_indices.append(bin)
-
-            return (
-                bin_indices,
-                # remove start/end value & empty bins in pd.qcut's range result.
-                # remain only left-open right-close split points
-                np.delete(split_points, empty_bins),
-                np.flatnonzero(pd.isna(f_data)),
-            )
+        bin_num = (
+            self.bin_num
+            if self.binning_method == "quantile"
+            else self.chimerge_init_bins
+        )
+        return split_feature_bins(f_data, bin_num)
 
     def _build_feature_bins(
         self, data: pd.DataFrame
@@ -344,64 +491,7 @@ class VertWoeBinningPyuWorker:
             Tuple[bins after merge, removed bin indices in input bins]
         '''
 
-        def get_chi(bin1: Tuple[float, float], bin2: Tuple[float, float]):
-            total = bin1[0] + bin2[0]
-            total_positive = bin1[1] + bin2[1]
-            positive_rate = float(total_positive) / float(total)
-
-            if positive_rate == 0 or positive_rate == 1:
-                # two bins has same label distribution
-                return 0.0
-
-            bin1_positive = bin1[1]
-            bin1_expt_positive = positive_rate * float(bin1[0])
-            bin1_negative = bin1[0] - bin1[1]
-            bin1_expt_negative = float(bin1[0]) - bin1_expt_positive
-
-            bin2_positive = bin2[1]
-            bin2_expt_positive = positive_rate * float(bin2[0])
-            bin2_negative = bin2[0] - bin2[1]
-            bin2_expt_negative = float(bin2[0]) - bin2_expt_positive
-
-            return (
-                math.pow(bin1_positive - bin1_expt_positive, 2) / bin1_expt_positive
-                + math.pow(bin1_negative - bin1_expt_negative, 2) / bin1_expt_negative
-                + math.pow(bin2_positive - bin2_expt_positive, 2) / bin2_expt_positive
-                + math.pow(bin2_negative - bin2_expt_negative, 2) / bin2_expt_negative
-            )
-
-        chis = [get_chi(bins[i], bins[i + 1]) for i in range(len(bins) - 1)]
-
-        def get_min(chis):
-            min_idx = np.argmin(chis)
-            return chis[min_idx], min_idx
-
-        orig_idx = [i for i in range(len(bins))]
-        removed_idx = list()
-        while True:
-            if len(bins) <= self.chimerge_target_bins:
-                # chi_merge stop by bin size
-                return bins, removed_idx
-
-            min_chi, min_idx = get_min(chis)
-            if min_chi > self.chimerge_target_chi:
-                # chi_merge stop by chi value3333333
-                return bins, removed_idx
-
-            # merge bins[min_idx] & bins[min_idx + 1]
-            new_stat = (
-                bins[min_idx][0] + bins[min_idx + 1][0],
-                bins[min_idx][1] + bins[min_idx + 1][1],
-            )
-            bins.pop(min_idx + 1)
-            bins[min_idx] = new_stat
-            removed_idx.append(orig_idx.pop(min_idx))
-            # update chis
-            chis.pop(min_idx)
-            if min_idx > 0:
-                chis[min_idx - 1] = get_chi(bins[min_idx - 1], bins[min_idx])
-            if min_idx < len(bins) - 1:
-                chis[min_idx] = get_chi(bins[min_idx], bins[min_idx + 1])
+        return chi_merge(bins, self.chimerge_target_bins, self.chimerge_target_chi)
 
     def _apply_chimerge(
         self,
@@ -503,6 +593,43 @@ class VertWoeBinningPyuWorker:
 
         return np.concatenate((select, *else_select), axis=1)
 
+    def slave_build_sum_bin_ids(
+        self, data: pd.DataFrame
+    ) -> Tuple[np.ndarray, List[int], List[int]]:
+        '''
+        build bin ids for driver to calculate positive samples by Secret Sharing.
+        Attributes:
+            data: full dataset for this party.
+
+        Return:
+            First: samples x features bin ids, the id of a sample in feature f is
+                   its bin's index inside f, or the bins count of f for np.nan.
+            Second: bins count of each feature.
+            Third: 1 if np.nan bin of each feature is not empty else 0.
+        '''
+        bins_idx, self.split_points, else_bins_idx = self._build_feature_bins(data)
+        self.total_counts = [b.size for b in bins_idx]
+        self.else_counts = [b.size for b in else_bins_idx]
+
+        bin_ids = np.empty((data.shape[0], len(self.bin_names)), np.int32)
+        feature_bins = list()
+        pos = 0
+        for f_idx, split_point in enumerate(self.split_points):
+            if isinstance(split_point, list):
+                f_bin_size = len(split_point)
+            else:
+                f_bin_size = split_point.size + 1
+            f_bins_idx = bins_idx[pos : pos + f_bin_size]
+            if f_bins_idx:
+                bin_ids[np.concatenate(f_bins_idx), f_idx] = np.repeat(
+                    np.arange(f_bin_size), [b.size for b in f_bins_idx]
+                )
+            bin_ids[else_bins_idx[f_idx], f_idx] = f_bin_size
+            feature_bins.append(f_bin_size)
+            pos += f_bin_size
+
+        return bin_ids, feature_bins, [int(c > 0) for c in self.else_counts]
+
     def slave_build_sum_indices(self, data: pd.DataFrame) -> Tuple[np.ndarray]:
         '''
         return samples indices in bins for driver to calculate positive samples by Homomorphic encryption.
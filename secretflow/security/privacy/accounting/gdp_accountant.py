@@ -72,10 +72,26 @@ def delta_gaussian(eps, mu):
 def get_eps_from_mu(mu, delta):
     """Get epsilon from mu given delta via inverse dual.
 
+    A scalar mu is solved by brentq. An array of mu is solved elementwise at
+    once by a vectorized bisection on [0, 500] (delta_gaussian decreases with
+    epsilon), which agrees with the scalar result to about 1e-12.
+
     Args:
-        mu: The parameters of the GDP.
+        mu: The parameters of the GDP, a scalar or an array, e.g. the mu of
+            a sweep of noise multipliers from cal_mu_poisson.
         delta: The parameters of the (epsilon, delta)-DP.
     """
+    if np.ndim(mu) > 0:
+        mu = np.asarray(mu, dtype=np.float64)
+        lo = np.zeros(mu.shape)
+        hi = np.full(mu.shape, 500.0)
+        # 500 / 2**60 is below the float64 resolution of epsilon.
+        for _ in range(60):
+            mid = (lo + hi) / 2
+            above = delta_gaussian(mid, mu) > delta
+            lo = np.where(above, mid, lo)
+            hi = np.where(above, hi, mid)
+        return np.where(delta >= delta_gaussian(0, mu), 0.0, (lo + hi) / 2)
 
     if delta >= delta_gaussian(0, mu):
         return 0
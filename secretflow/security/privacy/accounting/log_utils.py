@@ -74,17 +74,10 @@ def log_alpha_int(q, sigma, alpha):
     """Calculate log(A_alpha) for integer alpha. 0 < q < 1."""
     assert isinstance(alpha, six.integer_types)
 
-    log_a = -np.inf
-
-    for i in range(alpha + 1):
-        log_coef_i = (
-            comb_log(alpha, i) + i * math.log(q) + (alpha - i) * math.log(1 - q)
-        )
-
-        s = log_coef_i + (i * i - i) / (2 * (sigma**2))
-        log_a = add_log(log_a, s)
-
-    return float(log_a)
+    i = np.arange(alpha + 1)
+    log_coef = comb_log(alpha, i) + i * math.log(q) + (alpha - i) * math.log(1 - q)
+    s = log_coef + (i * i - i) / (2 * (sigma**2))
+    return float(special.logsumexp(s))
 
 
 def log_alpha_frac(q, sigma, alpha):
@@ -128,3 +121,94 @@ def log_alpha(q, sigma, alpha):
         return log_alpha_int(q, sigma, int(alpha))
     else:
         return log_alpha_frac(q, sigma, alpha)
+
+
+"""
+VECTORIZED LOG(A_ALPHA) OVER ORDER GRIDS
+"""
+
+
+def _log_alpha_ints(q, sigma, alphas):
+    """Calculate log(A_alpha) of integer alphas, the sum of each alpha is a
+    masked logsumexp over i = 0..max(alphas)."""
+    i = np.arange(np.max(alphas) + 1)
+    alphas = alphas[:, None]
+    valid = i <= alphas
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_coef = np.where(valid, comb_log(alphas, i), -np.inf)
+        s = (
+            log_coef
+            + i * np.log(q)
+            + (alphas - i) * np.log(1 - q)
+            + (i * i - i) / (2 * sigma**2)
+        )
+    return special.logsumexp(np.where(valid, s, -np.inf), axis=-1)
+
+
+def _log_alpha_fracs(q, sigma, alphas):
+    """Calculate log(A_alpha) of fractional alphas.
+
+    Same series as log_alpha_frac, the terms of all alphas are evaluated
+    together and each series is cut after its first term < exp(-30).
+    """
+    alphas = alphas[:, None]
+    z0 = sigma**2 * np.log(1 / q - 1) + 0.5
+    n_terms = 64
+    while True:
+        i = np.arange(n_terms)
+        j = alphas - i
+        with np.errstate(divide='ignore', invalid='ignore'):
+            coef = special.binom(alphas, i)
+            log_coef = np.log(np.abs(coef))
+            log_t0 = log_coef + i * np.log(q) + j * np.log(1 - q)
+            log_t1 = log_coef + j * np.log(q) + i * np.log(1 - q)
+            log_e0 = math.log(0.5) + erfc_logs((i - z0) / (math.sqrt(2) * sigma))
+            log_e1 = math.log(0.5) + erfc_logs((z0 - j) / (math.sqrt(2) * sigma))
+            log_s0 = log_t0 + (i * i - i) / (2 * (sigma**2)) + log_e0
+            log_s1 = log_t1 + (j * j - j) / (2 * (sigma**2)) + log_e1
+        small = np.maximum(log_s0, log_s1) < -30
+        if np.all(np.any(small, axis=-1)):
+            break
+        n_terms *= 2
+
+    # the first small term is still added, same as log_alpha_frac.
+    used = i <= np.argmax(small, axis=-1)[..., None]
+    sign = np.where(used, np.sign(coef), 0)
+    log_s0 = np.where(used, log_s0, -np.inf)
+    log_s1 = np.where(used, log_s1, -np.inf)
+    log_a0 = special.logsumexp(log_s0, b=sign, axis=-1)
+    log_a1 = special.logsumexp(log_s1, b=sign, axis=-1)
+    return np.logaddexp(log_a0, log_a1)
+
+
+def erfc_logs(x):
+    """Calculate log(erfc(x)) elementwise with high accuracy for large x."""
+    return math.log(2) + special.log_ndtr(-x * 2**0.5)
+
+
+def log_alphas(q, sigma, orders):
+    """Calculate log(A_alpha) for all orders at once. 0 < q < 1.
+
+    Args:
+        q: The sampling rate, a scalar or an array.
+        sigma: The noise multiplier, a scalar or an array broadcastable with q.
+        orders: 1d array of positive finite orders.
+
+    Returns:
+        Array of shape broadcast(q, sigma).shape + orders.shape.
+    """
+    q = np.asarray(q, dtype=np.float64)
+    sigma = np.asarray(sigma, dtype=np.float64)
+    orders = np.asarray(orders, dtype=np.float64)
+    batch_shape = np.broadcast_shapes(q.shape, sigma.shape)
+    # trailing axes are orders and series terms.
+    q = np.broadcast_to(q, batch_shape)[..., None, None]
+    sigma = np.broadcast_to(sigma, batch_shape)[..., None, None]
+
+    result = np.empty(batch_shape + orders.shape)
+    is_int = orders == np.floor(orders)
+    if np.any(is_int):
+        result[..., is_int] = _log_alpha_ints(q, sigma, orders[is_int].astype(np.int64))
+    if not np.all(is_int):
+        result[..., ~is_int] = _log_alpha_fracs(q, sigma, orders[~is_int])
+    return result
@@ -14,11 +14,14 @@
 
 import math
 import numpy as np
-from .log_utils import log_alpha
+from .log_utils import log_alpha, log_alphas
 
 """Implements privacy accounting for Rényi Differential Privacy.
 """
 
+# default RDP orders used by the privacy mechanisms.
+DEFAULT_RDP_ORDERS = [1 + x / 10.0 for x in range(1, 100)] + list(range(12, 64))
+
 
 def rdp_core(q: float, noise_multiplier: float, alpha: float):
     """Comnpute RDP of the Sampled Gaussian mechanism at order alpha.
@@ -43,25 +46,60 @@ def rdp_core(q: float, noise_multiplier: float, alpha: float):
     return log_alpha(q, noise_multiplier, alpha) / (alpha - 1)
 
 
+def compute_rdp(q, noise_multiplier, orders) -> np.ndarray:
+    """Compute RDP of one step of the Sampled Gaussian mechanism at all orders.
+
+    The whole order grid, and batches of q and noise_multiplier, are evaluated
+    with array operations instead of one rdp_core call per order.
+
+    Args:
+        q: The sampling rate, a scalar or an array.
+        noise_multiplier: A scalar or an array broadcastable with q.
+        orders: An array (or a scalar) of RDP orders.
+
+    Returns:
+        Array of shape broadcast(q, noise_multiplier).shape + (len(orders),),
+        can be `np.inf`.
+    """
+    q = np.asarray(q, dtype=np.float64)
+    sigma = np.asarray(noise_multiplier, dtype=np.float64)
+    orders = np.atleast_1d(np.asarray(orders, dtype=np.float64))
+    batch_shape = np.broadcast_shapes(q.shape, sigma.shape)
+    q = np.broadcast_to(q, batch_shape)
+    sigma = np.broadcast_to(sigma, batch_shape)
+
+    finite = np.isfinite(orders)
+    # q = 0 and q = 1 are answered in closed form below, use a dummy rate.
+    sampled = (q > 0) & (q < 1)
+    log_a = np.full(batch_shape + orders.shape, np.inf)
+    log_a[..., finite] = log_alphas(np.where(sampled, q, 0.5), sigma, orders[finite])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rdp = log_a / (orders - 1)
+        # not inf / inf, the RDP at an infinite order is infinite.
+        rdp[..., ~finite] = np.inf
+        rdp = np.where((q == 1)[..., None], orders / (2 * sigma[..., None] ** 2), rdp)
+    return np.where((q == 0)[..., None], 0.0, rdp)
+
+
 def get_rdp(q: float, noise_multiplier: float, steps: int, orders):
     """Calculate RDP of the Sampled Gaussian Mechanism.
 
     Args:
-        q: The sampling rate.
+        q: The sampling rate, a scalar or an array.
         noise_multiplier: The ratio of the standard deviation of the Gaussian noise
-         to the l2-sensitivity of the function to which it is added
-        steps: The number of steps.
+         to the l2-sensitivity of the function to which it is added. A scalar or
+         an array broadcastable with q.
+        steps: The number of steps, a scalar or an array broadcastable with q.
         orders: An array (or a scalar) of RDP orders.
 
     Returns:
-        The RDPs at all orders. Can be `np.inf`.
+        The RDPs at all orders. Can be `np.inf`. The leading axes are the
+        broadcast axes of q, noise_multiplier and steps.
     """
-
+    rdp = compute_rdp(q, noise_multiplier, orders)
     if np.isscalar(orders):
-        rdp = rdp_core(q, noise_multiplier, orders)
-    else:
-        rdp = np.array([rdp_core(q, noise_multiplier, order) for order in orders])
-    return rdp * steps
+        return rdp[..., 0] * steps
+    return rdp * np.asarray(steps)[..., None]
 
 
 def cal_delta(orders, rdp, eps: float):
@@ -82,18 +120,17 @@ def cal_delta(orders, rdp, eps: float):
         raise ValueError("Value of privacy loss bound epsilon must be >=0.")
     if len(orders_vec) != len(rdp_vec):
         raise ValueError("Input lists must have the same length.")
-    logdeltas = []
-    for (a, r) in zip(orders_vec, rdp_vec):
-        if a < 1:
-            raise ValueError("Renyi divergence order must be >=1.")
-        if r < 0:
-            raise ValueError("Renyi divergence must be >=0.")
-        logdelta = 0.5 * math.log1p(-math.exp(-r))
-        if a > 1.01:
-            rdp_bound = (a - 1) * (r - eps + math.log1p(-1 / a)) - math.log(a)
-            logdelta = min(logdelta, rdp_bound)
-
-        logdeltas.append(logdelta)
+    if np.any(orders_vec < 1):
+        raise ValueError("Renyi divergence order must be >=1.")
+    if np.any(rdp_vec < 0):
+        raise ValueError("Renyi divergence must be >=0.")
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        logdeltas = 0.5 * np.log1p(-np.exp(-rdp_vec))
+        rdp_bound = (orders_vec - 1) * (
+            rdp_vec - eps + np.log1p(-1 / orders_vec)
+        ) - np.log(orders_vec)
+    logdeltas = np.where(orders_vec > 1.01, np.minimum(logdeltas, rdp_bound), logdeltas)
 
     idx_opt = np.argmin(logdeltas)
     return min(math.exp(logdeltas[idx_opt]), 1.0), orders_vec[idx_opt]
@@ -118,20 +155,19 @@ def cal_eps(orders, rdp, delta: float):
     if len(orders_vec) != len(rdp_vec):
         raise ValueError("Input lists must have the same length.")
 
-    eps_vec = []
-    for (a, r) in zip(orders_vec, rdp_vec):
-        if a < 1:
-            raise ValueError("Renyi divergence order must be >=1.")
-        if r < 0:
-            raise ValueError("Renyi divergence must be >=0.")
-
-        if delta**2 + math.expm1(-r) >= 0:
-            eps = 0
-        elif a > 1.01:
-            eps = r + math.log1p(-1 / a) - math.log(delta * a) / (a - 1)
-        else:
-            eps = np.inf
-        eps_vec.append(eps)
+    if np.any(orders_vec < 1):
+        raise ValueError("Renyi divergence order must be >=1.")
+    if np.any(rdp_vec < 0):
+        raise ValueError("Renyi divergence must be >=0.")
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        eps_vec = (
+            rdp_vec
+            + np.log1p(-1 / orders_vec)
+            - np.log(delta * orders_vec) / (orders_vec - 1)
+        )
+    eps_vec = np.where(orders_vec > 1.01, eps_vec, np.inf)
+    eps_vec = np.where(delta**2 + np.expm1(-rdp_vec) >= 0, 0, eps_vec)
 
     idx_opt = np.argmin(eps_vec)
     return max(0, eps_vec[idx_opt]), orders_vec[idx_opt]
@@ -170,3 +206,58 @@ def get_privacy_spent_rdp(
     else:
         eps, opt_order = cal_eps(orders, rdp, target_delta)
         return eps, target_delta, opt_order
+
+
+class RDPAccountant:
+    """Incremental RDP accountant.
+
+    Composes steps of Sampled Gaussian mechanisms with different sampling rates
+    and noise multipliers. RDP of one step is computed once per
+    (q, noise_multiplier) and the composition is a running sum, so querying
+    the privacy spent after every step does not recompute from scratch.
+
+    Example:
+        accountant = RDPAccountant()
+        accountant.step(q=0.01, noise_multiplier=1.1, steps=100)
+        eps, delta, order = accountant.get_privacy_spent(target_delta=1e-5)
+    """
+
+    def __init__(self, orders=None) -> None:
+        """
+        Args:
+            orders: An array of RDP orders, defaults to DEFAULT_RDP_ORDERS.
+        """
+        self.orders = np.asarray(
+            DEFAULT_RDP_ORDERS if orders is None else orders, dtype=np.float64
+        )
+        self._rdp = np.zeros(self.orders.shape)
+        self._step_rdp = {}
+
+    @property
+    def rdp(self) -> np.ndarray:
+        """The composed RDP at all orders."""
+        return self._rdp
+
+    def step(self, q: float, noise_multiplier: float, steps: int = 1):
+        """Compose steps of the Sampled Gaussian mechanism.
+
+        Args:
+            q: The sampling rate.
+            noise_multiplier: The noise multiplier of these steps.
+            steps: The number of steps.
+        """
+        key = (float(q), float(noise_multiplier))
+        if key not in self._step_rdp:
+            self._step_rdp[key] = compute_rdp(q, noise_multiplier, self.orders)
+        self._rdp = self._rdp + self._step_rdp[key] * steps
+        return self
+
+    def get_privacy_spent(self, target_eps: float = None, target_delta: float = None):
+        """Get privacy spent of all composed steps, see get_privacy_spent_rdp.
+
+        Returns:
+            A tuple of epsilon, delta, and the optimal order.
+        """
+        return get_privacy_spent_rdp(
+            self.orders, self._rdp, target_eps=target_eps, target_delta=target_delta
+        )
@@ -18,6 +18,7 @@ from abc import ABC, abstractmethod
 from typing import List
 
 from secretflow.security.privacy.accounting.rdp_accountant import (
+    DEFAULT_RDP_ORDERS,
     get_rdp,
     get_privacy_spent_rdp,
 )
@@ -29,6 +30,22 @@ from secretflow.security.privacy.accounting.gdp_accountant import (
 )
 
 
+def clip_by_sample_norm(inputs, l2_norm_clip: float):
+    """Clip each sample of inputs to l2 norm at most l2_norm_clip.
+
+    Each sample is scaled by a broadcast [batch, 1] factor, so the cost is
+    linear in the batch size.
+
+    Args:
+        inputs: Embedding of shape [batch, ...].
+        l2_norm_clip: The clipping norm.
+    """
+    embed_flat = tf.keras.layers.Flatten()(inputs)
+    norm_vec = tf.norm(embed_flat, ord=2, axis=-1, keepdims=True)
+    scale = 1.0 / tf.math.maximum(norm_vec / l2_norm_clip, 1.0)
+    return tf.reshape(embed_flat * scale, tf.shape(inputs))
+
+
 class EmbeddingDP(tf.keras.layers.Layer, ABC):
     def __init__(self) -> None:
         super().__init__()
@@ -73,14 +90,7 @@ class GaussianEmbeddingDP(EmbeddingDP):
             inputs: Embedding.
         """
         # clipping
-        embed_flat = tf.keras.layers.Flatten()(inputs)
-        norm_vec = tf.norm(embed_flat, ord=2, axis=-1)
-        ones = tf.ones(shape=norm_vec.shape)
-        max_v = tf.linalg.diag(
-            1.0 / tf.math.maximum(norm_vec / self.l2_norm_clip, ones)
-        )
-        embed_flat_clipped = tf.linalg.matmul(max_v, embed_flat)
-        embed_clipped = tf.reshape(embed_flat_clipped, inputs.shape)
+        embed_clipped = clip_by_sample_norm(inputs, self.l2_norm_clip)
         # add noise
         if self.is_secure_generator:
             import secretflow.security.privacy._lib.random as random
@@ -104,7 +114,7 @@ class GaussianEmbeddingDP(EmbeddingDP):
         """
 
         if orders is None:
-            orders = [1 + x / 10.0 for x in range(1, 100)] + list(range(12, 64))
+            orders = DEFAULT_RDP_ORDERS
 
         q = self.batch_size / self.num_samples
         rdp = get_rdp(q, self.noise_multiplier, step, orders)
@@ -141,12 +151,14 @@ class GaussianEmbeddingDP(EmbeddingDP):
 class LabelDP:
     """Label differential privacy perturbation"""
 
-    def __init__(self, eps: float) -> None:
+    def __init__(self, eps: float, seed: int = None) -> None:
         """
         Args:
             eps: epsilon for pure DP.
+            seed: seed of the random generator, None means fresh entropy.
         """
         self._eps = eps
+        self._rng = np.random.default_rng(seed)
 
     def __call__(self, inputs: np.ndarray):
         """Random Response. Except for binary classification, inputs only support onehot form.
@@ -161,19 +173,27 @@ class LabelDP:
 
         if inputs.ndim == 1:
             p_ori = np.exp(self._eps) / (np.exp(self._eps) + 1)
-            choice_ori = np.random.binomial(1, p_ori, size=inputs.shape[0])
+            choice_ori = self._rng.random(inputs.shape[0]) < p_ori
             outputs = np.abs(1 - choice_ori - inputs)
         elif inputs.ndim == 2:
-            p_ori = np.exp(self._eps) / (np.exp(self._eps) + inputs.shape[-1] - 1)
-            p_oth = (1 - p_ori) / (inputs.shape[-1] - 1)
-            p_array = inputs * (p_ori - p_oth) + np.ones(inputs.shape) * p_oth
-            index_rr = np.array(
-                [
-                    np.random.choice(inputs.shape[-1], p=p_array[i])
-                    for i in range(inputs.shape[0])
-                ]
-            )
-            outputs = np.eye(inputs.shape[-1])[index_rr]
+            if not np.all(np.sum(inputs, axis=-1) == 1):
+                raise ValueError(
+                    'Except for binary classification, inputs only support onehot form.'
+                )
+            n_classes = inputs.shape[-1]
+            p_ori = np.exp(self._eps) / (np.exp(self._eps) + n_classes - 1)
+            p_oth = (1 - p_ori) / max(n_classes - 1, 1)
+            # inverse cdf with one uniform draw per row: the original label
+            # takes [0, p_ori), then each of the other labels, starting from
+            # the next one, takes a segment of length p_oth.
+            labels = np.argmax(inputs, axis=-1)
+            u = self._rng.random(inputs.shape[0])
+            offset = np.minimum(
+                np.floor_divide(u - p_ori, p_oth) + 1, n_classes - 1
+            ).astype(np.int64)
+            index_rr = np.where(u < p_ori, labels, (labels + offset) % n_classes)
+            outputs = np.zeros(inputs.shape)
+            outputs[np.arange(inputs.shape[0]), index_rr] = 1
         else:
             raise ValueError('the dim of inputs in LabelDP must be less than 2.')
 
@@ -17,6 +17,7 @@ from typing import List
 import numpy as np
 
 from secretflow.security.privacy.accounting.rdp_accountant import (
+    DEFAULT_RDP_ORDERS,
     get_rdp,
     get_privacy_spent_rdp,
 )
@@ -128,7 +129,7 @@ class GaussianModelDP:
 
         if orders is None:
             # order \in [2,128] empirically
-            orders = [1 + x / 10.0 for x in range(1, 100)] + list(range(12, 64))
+            orders = DEFAULT_RDP_ORDERS
             # optional value
             # orders = (
             #     [1.25, 1.5, 1.75, 2.0, 2.25, 2.5, 3.0, 3.5, 4.0, 4.5]
@@ -15,3 +15,4 @@
 from .biclassification_eval_core import gen_all_reports as gen_biclassification_reports
 from .pva_core import pva
 from .psi_core import psi
+from .table_statistics_core import table_statistics
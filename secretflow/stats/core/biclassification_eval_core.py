@@ -17,6 +17,7 @@
 from typing import List, Tuple, Union
 
 import jax.numpy as jnp
+import numpy as np
 import pandas as pd
 
 from .utils import equal_obs, equal_range
@@ -206,11 +207,13 @@ def gen_all_reports(
         y_score = y_score.to_numpy()
     sorted_label_score_pair_arr = create_sorted_label_score_pair(y_true, y_score)
     pos_count = jnp.sum(y_true)
+    # prefix sums are computed once and shared by both bin reports
+    sums = prefix_sums(sorted_label_score_pair_arr)
     eq_frequent_result_arr_list = eq_frequent_bin_evaluate(
-        sorted_label_score_pair_arr, pos_count, bin_size
+        sorted_label_score_pair_arr, pos_count, bin_size, sums
     )
     eq_range_result_arr_list = eq_range_bin_evaluate(
-        sorted_label_score_pair_arr, pos_count, bin_size
+        sorted_label_score_pair_arr, pos_count, bin_size, sums
     )
     # fill summary report
     # positive has index 2
@@ -249,7 +252,10 @@ def create_sorted_label_score_pair(y_true: jnp.array, y_score: jnp.array):
 
 
 def eq_frequent_bin_evaluate(
-    sorted_pairs: jnp.array, pos_count: int, bin_size: int
+    sorted_pairs: jnp.array,
+    pos_count: int,
+    bin_size: int,
+    sums: Tuple[np.ndarray, np.ndarray, np.ndarray] = None,
 ) -> List[jnp.array]:
     """Fill eq frequent bin report.
 
@@ -260,6 +266,7 @@ def eq_frequent_bin_evaluate(
             Total number of positive samples
         bin_size: int
             Total number of bins
+        sums: optional result of prefix_sums(sorted_pairs)
     Returns:
         bin_reports: List[jnp.array]
 
@@ -270,11 +277,14 @@ def eq_frequent_bin_evaluate(
     split_points = jnp.flip(split_points)
 
     # Each bin has domain (split_left, split_right]
-    return evaluate_bins(sorted_pairs, pos_count, split_points)
+    return evaluate_bins(sorted_pairs, pos_count, split_points, sums)
 
 
 def eq_range_bin_evaluate(
-    sorted_pairs: jnp.array, pos_count: int, bin_size: int
+    sorted_pairs: jnp.array,
+    pos_count: int,
+    bin_size: int,
+    sums: Tuple[np.ndarray, np.ndarray, np.ndarray] = None,
 ) -> List[jnp.array]:
     """Fill eq range bin report.
 
@@ -285,6 +295,7 @@ def eq_range_bin_evaluate(
             Total number of positive samples
         bin_size: int
             Total number of bins
+        sums: optional result of prefix_sums(sorted_pairs)
     Returns:
         bin_reports: List[jnp.array]
 
@@ -295,151 +306,124 @@ def eq_range_bin_evaluate(
     split_points = jnp.flip(split_points)
 
     # Each bin has domain (split_left, split_right]
-    return evaluate_bins(sorted_pairs, pos_count, split_points)
+    return evaluate_bins(sorted_pairs, pos_count, split_points, sums)
 
 
-def evaluate_bins(
-    sorted_pairs: jnp.array, pos_count: int, split_points
-) -> List[jnp.array]:
-    """evaluate bins given sorted pairs, pos_count and split_points (in decreasing order)"""
-    n_samples = sorted_pairs.shape[0]
-    neg_count = n_samples - pos_count
-    cumulative_pos_count = 0
-    cumulative_neg_count = 0
-    start_pos = 0
-    end_pos = 0
-    bins = []
-    for shard in range(len(split_points)):
-        while (end_pos < n_samples) and (
-            sorted_pairs[end_pos, 1] > split_points[shard]
-        ):
-            end_pos += 1
-        t = bin_evaluate(
-            sorted_pairs,
-            start_pos,
-            end_pos,
-            pos_count,
-            neg_count,
-            cumulative_pos_count,
-            cumulative_neg_count,
-        )
-        bin_report_arr, cumulative_pos_count, cumulative_neg_count = t[0], t[1], t[2]
-        bins.append(bin_report_arr)
-        start_pos = end_pos
-
-    # last bin
-    bin_report_arr, _, _ = bin_evaluate(
-        sorted_pairs,
-        start_pos,
-        n_samples,
-        pos_count,
-        neg_count,
-        cumulative_pos_count,
-        cumulative_neg_count,
-    )
-    bins.append(bin_report_arr)
-    return bins
-
-
-def bin_evaluate(
-    sorted_pairs,
-    start_pos,
-    end_pos,
-    total_pos_count,
-    total_neg_count,
-    cumulative_pos_count,
-    cumulative_neg_count,
-) -> Tuple[jnp.array, int, int]:
-    """Evaluate statistics for a bin.
+def prefix_sums(sorted_pairs: jnp.array) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute prefix sums shared by all bin reports.
 
+    Args:
+        sorted_pairs: jnp.array
+            y_true y_score pairs sorted by y_score in decreasing order
     Returns:
-        bin_report_arr: jnp.array
-            an array of size BIN_REPORT_STATISTICS_ENTRY_COUNT
+        scores: 1d np.ndarray
+            the sorted scores, in the dtype of sorted_pairs
+        cum_pos: 1d np.ndarray
+            cum_pos[i] is the number of positive samples in sorted_pairs[:i]
+        cum_score: 1d np.ndarray
+            cum_score[i] is the sum of scores in sorted_pairs[:i]
+    """
+    sorted_pairs = np.asarray(sorted_pairs)
+    cum_pos = np.zeros(sorted_pairs.shape[0] + 1)
+    np.cumsum(sorted_pairs[:, 0], dtype=np.float64, out=cum_pos[1:])
+    cum_score = np.zeros(sorted_pairs.shape[0] + 1)
+    np.cumsum(sorted_pairs[:, 1], dtype=np.float64, out=cum_score[1:])
+    return sorted_pairs[:, 1], cum_pos, cum_score
 
-        cumulative_pos_count: int
 
-        cumulative_neg_count: int
+def evaluate_bins(
+    sorted_pairs: jnp.array,
+    pos_count: int,
+    split_points,
+    sums: Tuple[np.ndarray, np.ndarray, np.ndarray] = None,
+) -> List[jnp.array]:
+    """evaluate bins given sorted pairs, pos_count and split_points (in decreasing order)
 
-    """
-    if end_pos == start_pos:
-        return jnp.zeros((BIN_REPORT_STATISTICS_ENTRY_COUNT, 1))
-
-    # compute new f1
-    (
-        true_positive,
-        true_negative,
-        false_positive,
-        false_negative,
-    ) = confusion_matrix_from_cum_counts(
-        cumulative_pos_count, cumulative_neg_count, total_neg_count, total_pos_count
-    )
+    All bins are evaluated at once: bin boundaries are found by one searchsorted
+    over split points and per bin statistics are differences of prefix sums.
 
-    pos_count = jnp.sum(sorted_pairs[start_pos:end_pos, 0])
-    neg_count = end_pos - start_pos - pos_count
-    score_sum = jnp.sum(sorted_pairs[start_pos:end_pos, 1])
-    false_negative -= pos_count
-    true_positive += pos_count
-    true_negative -= neg_count
-    false_positive += neg_count
-    f1_score = compute_f1_score(true_positive, false_positive, false_negative)
-
-    # fill in rest of eq_bin_reports
-    start_value = float(sorted_pairs[end_pos - 1, 1])
-    end_value = float(sorted_pairs[start_pos, 1])
-    positive = int(pos_count)
-    negative = int(neg_count)
-    total = int(end_pos - start_pos)
-    precision, recall, false_positive_rate = precision_recall_false_positive_rate(
-        true_positive, false_positive, false_negative, true_negative
-    )
+    Ratios follow the float32 operations of the former per bin evaluation in
+    the same order, so all statistics but avg_score are bit identical to it.
+    avg_score is a difference of float64 prefix sums of scores instead of a
+    float32 sum per bin, and may differ from it in the last bits.
 
-    f1_score = float(f1_score)
-    lift = float(precision * (total_pos_count + total_neg_count) / total_pos_count)
-    predicted_positive_ratio = float(pos_count / total_pos_count)
-    predicted_negative_ratio = float(neg_count / total_neg_count)
-    cumulative_percent_of_positive = float(
-        (pos_count + cumulative_pos_count) / total_pos_count
-    )
-    cumulative_percent_of_negative = float(
-        (neg_count + cumulative_neg_count) / total_neg_count
-    )
-    total_cumulative_percent = float(
-        (pos_count + cumulative_pos_count + neg_count + cumulative_neg_count)
-        / (total_pos_count + total_neg_count)
-    )
-    ks = abs(float(cumulative_percent_of_positive - cumulative_percent_of_negative))
-
-    avg_score = float(score_sum / total)
-    # pack into a single array
-    bin_report_arr = jnp.array(
-        [
-            start_value,
-            end_value,
-            positive,
-            negative,
-            total,
-            precision,
-            recall,
-            false_positive_rate,
-            f1_score,
-            lift,
-            predicted_positive_ratio,
-            predicted_negative_ratio,
-            cumulative_percent_of_positive,
-            cumulative_percent_of_negative,
-            total_cumulative_percent,
-            ks,
-            avg_score,
-        ]
-    )
-    assert bin_report_arr.size == BIN_REPORT_STATISTICS_ENTRY_COUNT, "{}, {}".format(
-        bin_report_arr.size, BIN_REPORT_STATISTICS_ENTRY_COUNT
+    Args:
+        sorted_pairs: jnp.array
+            Should be of shape n * 2 and with second col sorted in decreasing order
+        pos_count: int
+            Total number of positive samples
+        split_points: 1d array in decreasing order
+        sums: optional result of prefix_sums(sorted_pairs), to share among reports
+    Returns:
+        bin_reports: List[jnp.array]
+    """
+    scores, cum_pos, cum_score = sums if sums is not None else prefix_sums(sorted_pairs)
+    n_samples = scores.shape[0]
+    total_pos_count = float(pos_count)
+    total_neg_count = n_samples - total_pos_count
+
+    # bin i ends at the number of samples whose score > split_points[i],
+    # scores are decreasing so it is a left searchsorted over negated scores.
+    split_points = np.asarray(split_points, dtype=scores.dtype)
+    ends = np.searchsorted(-scores, -split_points, side='left')
+    ends = np.append(ends, n_samples)
+    starts = np.concatenate(([0], ends[:-1]))
+    total = ends - starts
+    non_empty = total > 0
+
+    # counts are exact in float32, the ratios below are float32 as before.
+    total_pos = np.float32(total_pos_count)
+    total_neg = np.float32(total_neg_count)
+    true_positive = cum_pos[ends].astype(np.float32)
+    false_positive = ends.astype(np.float32) - true_positive
+    false_negative = total_pos - true_positive
+    true_negative = total_neg - false_positive
+    positive = true_positive - cum_pos[starts].astype(np.float32)
+    negative = total.astype(np.float32) - positive
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = true_positive / (true_positive + false_positive)
+        recall = true_positive / (true_positive + false_negative)
+        false_positive_rate = false_positive / (false_positive + true_negative)
+        f1_score = np.where(
+            true_positive == 0, 0, 2 * precision * recall / (precision + recall)
+        )
+        cumulative_percent_of_positive = true_positive / total_pos
+        cumulative_percent_of_negative = false_positive / total_neg
+        # ks was the difference of the two percents as python floats.
+        ks = np.abs(
+            cumulative_percent_of_positive.astype(np.float64)
+            - cumulative_percent_of_negative.astype(np.float64)
+        )
+        table = np.stack(
+            [
+                scores[np.maximum(ends - 1, 0)],
+                scores[np.minimum(starts, n_samples - 1)],
+                positive,
+                negative,
+                total,
+                precision,
+                recall,
+                false_positive_rate,
+                f1_score,
+                precision * (total_pos + total_neg) / total_pos,
+                positive / total_pos,
+                negative / total_neg,
+                cumulative_percent_of_positive,
+                cumulative_percent_of_negative,
+                (true_positive + false_positive) / (total_pos + total_neg),
+                ks,
+                (cum_score[ends] - cum_score[starts]) / total,
+            ],
+            axis=1,
+        )
+    assert table.shape[1] == BIN_REPORT_STATISTICS_ENTRY_COUNT, "{}, {}".format(
+        table.shape[1], BIN_REPORT_STATISTICS_ENTRY_COUNT
     )
 
-    # update cumulative values
-    cumulative_pos_count += pos_count
-    cumulative_neg_count += neg_count
-    return bin_report_arr, cumulative_pos_count, cumulative_neg_count
+    # empty bins are reported as zeros
+    table[~non_empty] = 0
+    return list(jnp.array(table))
 
 
 def gen_pr_reports(sorted_pairs: jnp.array, thresholds: jnp.array) -> List[jnp.array]:
@@ -456,18 +440,26 @@ def gen_pr_reports(sorted_pairs: jnp.array, thresholds: jnp.array) -> List[jnp.a
         a list of pr reports in jnp.array of shape 3 * 1, list len = len(thresholds)
     """
     tps, fps, all_thresholds = binary_clf_curve(sorted_pairs)
+    tps, fps, all_thresholds = (
+        np.asarray(tps),
+        np.asarray(fps),
+        np.asarray(all_thresholds),
+    )
     n_positive = tps[-1]
     n_negative = fps[-1]
 
-    result = []
-    for t in thresholds:
-        i = jnp.sum(all_thresholds < t)
+    # all_thresholds is decreasing, i = the number of thresholds < t.
+    thresholds = np.asarray(thresholds, dtype=all_thresholds.dtype)
+    i = len(all_thresholds) - np.searchsorted(
+        -all_thresholds, -thresholds, side='right'
+    )
+    # same as jnp indexing, out of range index is clamped.
+    i = np.minimum(i, len(all_thresholds) - 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
         precision = tps[i] / (tps[i] + fps[i])
         recall = tps[i] / n_positive
         false_positive_rate = fps[i] / n_negative
-        pr_report = jnp.array([false_positive_rate, precision, recall])
-        result.append(pr_report)
-    return result
+    return list(jnp.array(np.stack([false_positive_rate, precision, recall], axis=1)))
 
 
 # section of statistics
@@ -0,0 +1,208 @@
+# Copyright 2022 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License")
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This is a single party based table statistics
+
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# rows reduced at once by moments.
+_CHUNK_ROWS = 1 << 16
+
+
+@dataclass
+class Moments:
+    """Per column count, extrema, sums of powers and central sums.
+
+    Attributes:
+        count: number of non-missing values.
+        min: minimum, nan if count is 0.
+        max: maximum, nan if count is 0.
+        mean: mean, nan if count is 0.
+        m2, m3, m4: sum of (x - mean)^k for k = 2, 3, 4.
+        sum, sum_2, sum_3, sum_4: sum of x^k for k = 1, 2, 3, 4.
+    """
+
+    count: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+    mean: np.ndarray
+    m2: np.ndarray
+    m3: np.ndarray
+    m4: np.ndarray
+    sum: np.ndarray
+    sum_2: np.ndarray
+    sum_3: np.ndarray
+    sum_4: np.ndarray
+
+    @staticmethod
+    def of(x: np.ndarray) -> 'Moments':
+        """Compute moments of a 2d float array, nan is treated as missing."""
+        valid = ~np.isnan(x)
+        count = valid.sum(axis=0).astype(np.float64)
+        x_filled = np.where(valid, x, 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = x_filled.sum(axis=0) / count
+            dev = np.where(valid, x - mean, 0.0)
+            # correct the rounding error of the large sum before central sums.
+            mean = mean + dev.sum(axis=0) / count
+        dev = np.where(valid, x - mean, 0.0)
+        dev2 = dev * dev
+        x2 = x_filled * x_filled
+        x_min = np.where(valid, x, np.inf).min(axis=0, initial=np.inf)
+        x_max = np.where(valid, x, -np.inf).max(axis=0, initial=-np.inf)
+        return Moments(
+            count=count,
+            min=np.where(count > 0, x_min, np.nan),
+            max=np.where(count > 0, x_max, np.nan),
+            mean=mean,
+            m2=dev2.sum(axis=0),
+            m3=(dev2 * dev).sum(axis=0),
+            m4=(dev2 * dev2).sum(axis=0),
+            sum=x_filled.sum(axis=0),
+            sum_2=x2.sum(axis=0),
+            sum_3=(x2 * x_filled).sum(axis=0),
+            sum_4=(x2 * x2).sum(axis=0),
+        )
+
+    def merge(self, other: 'Moments') -> 'Moments':
+        """Merge moments of two disjoint row sets, see
+        https://en.wikipedia.org/wiki/Algorithms_for_calculating_variance#Higher-order_statistics
+        """
+        na, nb = self.count, other.count
+        n = na + nb
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta = other.mean - self.mean
+            delta_n = np.where(n > 0, delta / n, 0.0)
+        # a side without samples has nan mean, which must not leak into delta.
+        delta = np.where((na > 0) & (nb > 0), delta, 0.0)
+        delta_n = np.where((na > 0) & (nb > 0), delta_n, 0.0)
+        mean = np.where(na > 0, self.mean, other.mean) + np.where(
+            na > 0, nb * delta_n, 0.0
+        )
+        m2 = self.m2 + other.m2 + delta * delta_n * na * nb
+        m3 = (
+            self.m3
+            + other.m3
+            + delta * delta_n**2 * na * nb * (na - nb)
+            + 3 * delta_n * (na * other.m2 - nb * self.m2)
+        )
+        m4 = (
+            self.m4
+            + other.m4
+            + delta * delta_n**3 * na * nb * (na * na - na * nb + nb * nb)
+            + 6 * delta_n**2 * (na * na * other.m2 + nb * nb * self.m2)
+            + 4 * delta_n * (na * other.m3 - nb * self.m3)
+        )
+        return Moments(
+            count=n,
+            min=np.fmin(self.min, other.min),
+            max=np.fmax(self.max, other.max),
+            mean=mean,
+            m2=m2,
+            m3=m3,
+            m4=m4,
+            sum=self.sum + other.sum,
+            sum_2=self.sum_2 + other.sum_2,
+            sum_3=self.sum_3 + other.sum_3,
+            sum_4=self.sum_4 + other.sum_4,
+        )
+
+
+def moments(x: np.ndarray, chunk_rows: int = _CHUNK_ROWS) -> Moments:
+    """Compute moments of x in one pass over row chunks.
+
+    Each chunk is reduced with a local two-pass and chunks are merged with
+    Chan's formulas, so it is numerically stable and needs O(chunk_rows)
+    extra memory only.
+    """
+    result = Moments.of(x[:chunk_rows])
+    for start in range(chunk_rows, x.shape[0], chunk_rows):
+        result = result.merge(Moments.of(x[start : start + chunk_rows]))
+    return result
+
+
+def table_statistics(table: pd.DataFrame) -> pd.DataFrame:
+    """Get table statistics for a pd.DataFrame, see
+    secretflow.stats.table_statistics for the result.
+
+    All numeric columns are reduced together by one pass of moments, and the
+    quartiles come from one sort.
+    """
+    index = table.columns
+    result = pd.DataFrame(index=index)
+    result['datatype'] = table.dtypes
+    result['total_count'] = table.shape[0]
+    result['count'] = table.count()
+    result['count_na'] = table.isna().sum()
+
+    # bool columns are counted as 0/1, as pandas does with numeric_only=True.
+    numeric = table.select_dtypes(['number', 'bool'])
+    # column major, so each column is reduced alone and the result of a column
+    # does not depend on which other columns are in the table.
+    x = np.asfortranarray(numeric.to_numpy(dtype=np.float64, na_value=np.nan))
+    m = moments(x)
+    n = m.count
+    with np.errstate(divide='ignore', invalid='ignore'):
+        var = np.where(n > 1, m.m2 / (n - 1), np.nan)
+        std = np.sqrt(var)
+        # same bias correction and zero variance handling as pandas.
+        skew = np.where(
+            m.m2 == 0,
+            0.0,
+            np.sqrt(n * (n - 1)) / (n - 2) * (m.m3 / n) / (m.m2 / n) ** 1.5,
+        )
+        skew = np.where(n < 3, np.nan, skew)
+        kurt_denom = (n - 2) * (n - 3) * m.m2**2
+        kurtosis = np.where(
+            kurt_denom == 0,
+            0.0,
+            n * (n + 1) * (n - 1) * m.m4 / kurt_denom
+            - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3)),
+        )
+        kurtosis = np.where(n < 4, np.nan, kurtosis)
+        with warnings.catch_warnings():
+            # all missing columns get nan quartiles.
+            warnings.simplefilter('ignore', RuntimeWarning)
+            quantiles = np.nanquantile(x, [0.25, 0.5, 0.75], axis=0)
+
+        stats = {
+            'min': m.min,
+            'max': m.max,
+            'mean': m.mean,
+            'var': var,
+            'std': std,
+            'sem': std / np.sqrt(n),
+            'skew': skew,
+            'kurtosis': kurtosis,
+            'q1': quantiles[0],
+            'q2': quantiles[1],
+            'q3': quantiles[2],
+            'moment_2': m.sum_2 / n,
+            'moment_3': m.sum_3 / n,
+            'moment_4': m.sum_4 / n,
+            'central_moment_2': m.m2 / n,
+            'central_moment_3': m.m3 / n,
+            'central_moment_4': m.m4 / n,
+            'sum': m.sum,
+            'sum_2': m.sum_2,
+            'sum_3': m.sum_3,
+            'sum_4': m.sum_4,
+        }
+    for name, value in stats.items():
+        result[name] = pd.Series(value, index=numeric.columns, dtype=np.float64)
+    return result
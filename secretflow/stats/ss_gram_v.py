@@ -0,0 +1,72 @@
+# Copyright 2022 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import List
+
+import numpy as np
+import jax.numpy as jnp
+
+from secretflow.device import PYUObject, SPU, SPUObject
+
+
+def _local_xtx(x) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    return np.matmul(x.transpose(), x)
+
+
+def _assemble_xtx(diag_blocks: List[np.ndarray], xs: List[np.ndarray]):
+    # upper cross blocks of row i: Xi.T * [Xi+1, ..., Xk] in one matmul.
+    upper = [
+        jnp.matmul(xs[i].transpose(), jnp.concatenate(xs[i + 1 :], axis=1))
+        if i + 1 < len(xs)
+        else None
+        for i in range(len(xs))
+    ]
+    widths = [x.shape[1] for x in xs]
+    offsets = np.cumsum([0] + widths)
+    rows = []
+    for i in range(len(xs)):
+        row = []
+        for j in range(len(xs)):
+            if i == j:
+                row.append(diag_blocks[i])
+            elif i < j:
+                start = offsets[j] - offsets[i + 1]
+                row.append(upper[i][:, start : start + widths[j]])
+            else:
+                start = offsets[i] - offsets[j + 1]
+                row.append(upper[j][:, start : start + widths[i]].transpose())
+        rows.append(row)
+    return jnp.block(rows)
+
+
+def gram_matrix(spu: SPU, xs: List[PYUObject]) -> SPUObject:
+    """
+    Compute X.T * X of vertical slice dataset X = [X1, X2, ..., Xk] in spu.
+
+    Diagonal block Xi.T * Xi only depends on one party's data, so it is
+    computed in plaintext by its owner. Only the cross blocks Xi.T * Xj are
+    computed by secret sharing.
+
+    Args:
+        spu: SPU device.
+        xs: each party's data in column order.
+
+    Return:
+        X.T * X as SPUObject.
+    """
+    assert len(xs) > 0, "input dataset is empty"
+    diag_blocks = [x.device(_local_xtx)(x).to(spu) for x in xs]
+    spu_xs = [x.to(spu) for x in xs]
+    return spu(_assemble_xtx)(diag_blocks, spu_xs)
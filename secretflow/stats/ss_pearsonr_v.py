@@ -12,15 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List
-
-import numpy as np
-import jax.numpy as jnp
-
 import secretflow as sf
 from secretflow.data.vertical import VDataFrame
 from secretflow.device import SPU
 from secretflow.preprocessing.scaler import StandardScaler
+from .ss_gram_v import gram_matrix
 
 
 class PearsonR:
@@ -58,14 +54,10 @@ class PearsonR:
         if standardize:
             scaler = StandardScaler()
             vdata = scaler.fit_transform(vdata)
-        obj_list = [sf.to(self.spu_device, d.data) for d in vdata.partitions.values()]
+        obj_list = [d.data for d in vdata.partitions.values()]
 
         rows = vdata.shape[0]
 
-        def spu_xtx(objs: List[np.ndarray]):
-            data = jnp.concatenate(objs, axis=1)
-            return jnp.matmul(data.transpose(), data)
-
-        spu_obj = self.spu_device(spu_xtx)(obj_list)
+        spu_obj = gram_matrix(self.spu_device, obj_list)
         xtx = sf.reveal(spu_obj)
         return xtx / (rows - 1)
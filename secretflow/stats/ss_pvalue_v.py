@@ -26,6 +26,7 @@ from secretflow.ml.linear import LinearModel, RegType, SSRegression
 from secretflow.data.vertical import VDataFrame
 
 from .core.utils import newton_matrix_inverse
+from .ss_gram_v import gram_matrix
 
 
 # spu functions for Logistic PValue
@@ -60,19 +61,17 @@ def _z_square_value(x: List[np.ndarray], yhat: np.ndarray, w: np.ndarray):
 
 
 # spu function for Linear PValue
-def _t_square_value(
-    x: List[np.ndarray], y: np.ndarray, yhat: np.ndarray, w: np.ndarray
-):
-    x = jnp.concatenate([*x, jnp.ones((x[0].shape[0], 1))], axis=1)
-    assert x.shape[1] == w.shape[0], "weights' feature size != input x dataset's cols"
-    assert x.shape[0] == yhat.shape[0], "x/y dataset not aligned"
-    assert x.shape[0] == y.shape[0], "x/y dataset not aligned"
+def _t_square_value(XTX: np.ndarray, y: np.ndarray, yhat: np.ndarray, w: np.ndarray):
+    """
+    XTX is the gram matrix of x with a constant column appended.
+    """
+    assert XTX.shape[0] == w.shape[0], "weights' feature size != input x dataset's cols"
+    assert y.shape[0] == yhat.shape[0], "x/y dataset not aligned"
     w = jnp.reshape(w, (w.shape[0],))
     y = jnp.reshape(y, (y.shape[0], 1))
     yhat = jnp.reshape(yhat, (yhat.shape[0], 1))
     err = yhat - y
-    sigma = jnp.matmul(jnp.transpose(err), err) / (x.shape[0] - x.shape[1] + 1)
-    XTX = jnp.matmul(jnp.transpose(x), x)
+    sigma = jnp.matmul(jnp.transpose(err), err) / (y.shape[0] - XTX.shape[0] + 1)
     XTX_inv = newton_matrix_inverse(XTX)
     XTX_inv_diag = jnp.diagonal(XTX_inv)
     variance = XTX_inv_diag * sigma
@@ -81,6 +80,11 @@ def _t_square_value(
     return t_square
 
 
+def _append_ones(x) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float64)
+    return np.concatenate([x, np.ones((x.shape[0], 1))], axis=1)
+
+
 class PVlaue:
     """
     Calculate P-Value for LR model training on vertical slice dataset by using secret sharing.
@@ -133,11 +137,15 @@ class PVlaue:
         assert (
             x_shape[0] > x_shape[1]
         ), "num of samples must greater than num of features"
-        x = self._prepare_dataset(x)
+        assert x_shape[1] > 0, "input dataset is empty"
+        # constant column for intercept is appended to the last party.
+        x = [x.partitions[pyu].data for pyu in x.partitions]
+        x[-1] = x[-1].device(_append_ones)(x[-1])
+        xtx = gram_matrix(self.spu, x)
         y = self._prepare_dataset(y)
         assert len(y) == 1, "label should came from one party"
         y = y[0]
-        spu_t = self.spu(_t_square_value)(x, y, yhat, weights)
+        spu_t = self.spu(_t_square_value)(xtx, y, yhat, weights)
         t_square = self._rectify_negative(sf.reveal(spu_t))
         t_values = np.sqrt(t_square)
         return 2 * (1 - stats.t(x_shape[0] - x_shape[1]).cdf(np.abs(t_values)))
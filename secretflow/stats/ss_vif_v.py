@@ -12,8 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List
-
 import numpy as np
 import jax.numpy as jnp
 
@@ -22,6 +20,7 @@ from secretflow.data.vertical import VDataFrame
 from secretflow.device import SPU
 from secretflow.preprocessing.scaler import StandardScaler
 from .core.utils import newton_matrix_inverse
+from .ss_gram_v import gram_matrix
 
 
 class VIF:
@@ -77,17 +76,16 @@ class VIF:
         if standardize:
             scaler = StandardScaler()
             vdata = scaler.fit_transform(vdata)
-        obj_list = [sf.to(self.spu_device, d.data) for d in vdata.partitions.values()]
+        obj_list = [d.data for d in vdata.partitions.values()]
 
         rows = vdata.shape[0]
 
-        def spu_vif(objs: List[np.ndarray]):
-            data = jnp.concatenate(objs, axis=1)
-            xtx = jnp.matmul(data.transpose(), data)
+        def spu_vif(xtx: np.ndarray):
             x_inv = newton_matrix_inverse(xtx)
             x_diagonal = jnp.diagonal(x_inv)
             return x_diagonal
 
-        spu_obj = self.spu_device(spu_vif)(obj_list)
+        xtx = gram_matrix(self.spu_device, obj_list)
+        spu_obj = self.spu_device(spu_vif)(xtx)
         x_diagonal = sf.reveal(spu_obj)
         return x_diagonal * (rows - 1)
@@ -14,8 +14,11 @@
 
 import pandas as pd
 from secretflow.data.vertical import VDataFrame
+from secretflow.device.driver import reveal
 from typing import Union
 
+from .core import table_statistics as table_statistics_core
+
 
 def table_statistics(table: Union[pd.DataFrame, VDataFrame]) -> pd.DataFrame:
     """Get table statistics for a pd.DataFrame or VDataFrame.
@@ -37,46 +40,15 @@ def table_statistics(table: Union[pd.DataFrame, VDataFrame]) -> pd.DataFrame:
     assert isinstance(
         table, (pd.DataFrame, VDataFrame)
     ), "table must be a pd.DataFrame or VDataFrame"
-    index = table.columns
-    result = pd.DataFrame(index=index)
-    result['datatype'] = table.dtypes
-    result['total_count'] = table.shape[0]
-    result['count'] = table.count()
-    result['count_na'] = table.isna().sum()
-    result['min'] = table.min(numeric_only=True)
-    result['max'] = table.max(numeric_only=True)
-    result['mean'] = table.mean(numeric_only=True)
-    result['var'] = table.var(numeric_only=True)
-    result['std'] = table.std(numeric_only=True)
-    result['sem'] = table.sem(numeric_only=True)
-    result['skew'] = table.skew(numeric_only=True)
-    result['kurtosis'] = table.kurtosis(numeric_only=True)
-    result['q1'] = table.quantile(0.25)
-    result['q2'] = table.quantile(0.5)
-    result['q3'] = table.quantile(0.75)
-    result['moment_2'] = table.select_dtypes('number').pow(2).mean(numeric_only=True)
-    result['moment_3'] = table.select_dtypes('number').pow(3).mean(numeric_only=True)
-    result['moment_4'] = table.select_dtypes('number').pow(4).mean(numeric_only=True)
-    result['central_moment_2'] = (
-        table.subtract(result['mean'])
-        .select_dtypes('number')
-        .pow(2)
-        .mean(numeric_only=True)
-    )
-    result['central_moment_3'] = (
-        table.subtract(result['mean'])
-        .select_dtypes('number')
-        .pow(3)
-        .mean(numeric_only=True)
-    )
-    result['central_moment_4'] = (
-        table.subtract(result['mean'])
-        .select_dtypes('number')
-        .pow(4)
-        .mean(numeric_only=True)
+    if isinstance(table, pd.DataFrame):
+        return table_statistics_core(table)
+
+    # each party summarizes its own columns in one pass, all summaries are
+    # revealed together.
+    summaries = reveal(
+        [
+            device(table_statistics_core)(partition.data)
+            for device, partition in table.partitions.items()
+        ]
     )
-    result['sum'] = table.sum(numeric_only=True)
-    result['sum_2'] = table.select_dtypes('number').pow(2).sum(numeric_only=True)
-    result['sum_3'] = table.select_dtypes('number').pow(3).sum(numeric_only=True)
-    result['sum_4'] = table.select_dtypes('number').pow(4).sum(numeric_only=True)
-    return result
+    return pd.concat(summaries).reindex(table.columns)
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import random
+import sys
 
 import math
 import numpy as np
@@ -39,6 +40,53 @@ def zeros(shape):
     return BigintNdArray([0] * math.prod(shape), shape)
 
 
+def frombuffer(
+    buffer, bytes_per_int, shape, byteorder=sys.byteorder, chunk_size=1 << 20
+):
+    """Interpret a buffer of fixed-size signed integers as a BigintNdArray.
+
+    Integers of 1/2/4/8 bytes are decoded by numpy directly. 16 bytes integers
+    (e.g. shares in FM128) are assembled from two 64 bits words chunk by chunk,
+    which bounds the memory of intermediate object arrays. Other sizes fall back
+    to `int.from_bytes` per element.
+
+    Args:
+        buffer: bytes-like object.
+        bytes_per_int: size of each integer in bytes.
+        shape: shape of the result.
+        byteorder: 'little' or 'big'. Defaults to native byte order.
+        chunk_size: number of integers processed at a time for 16 bytes integers.
+    """
+    assert byteorder in ('little', 'big'), f'unknown byteorder {byteorder}'
+    assert (
+        len(buffer) % bytes_per_int == 0
+    ), f'buffer size {len(buffer)} is not a multiple of {bytes_per_int}'
+    order = '<' if byteorder == 'little' else '>'
+    count = len(buffer) // bytes_per_int
+
+    if bytes_per_int in (1, 2, 4, 8):
+        data = np.frombuffer(buffer, dtype=f'{order}i{bytes_per_int}').tolist()
+    elif bytes_per_int == 16:
+        words = np.frombuffer(buffer, dtype=f'{order}u8').reshape(-1, 2)
+        lo_idx, hi_idx = (0, 1) if byteorder == 'little' else (1, 0)
+        data = []
+        for start in range(0, count, chunk_size):
+            chunk = words[start : start + chunk_size]
+            lo = chunk[:, lo_idx].astype(object)
+            hi = chunk[:, hi_idx].view(f'{order}i8').astype(object)
+            data.extend(((hi << 64) + lo).tolist())
+    else:
+        data = [
+            int.from_bytes(
+                buffer[i * bytes_per_int : (i + 1) * bytes_per_int],
+                byteorder,
+                signed=True,
+            )
+            for i in range(count)
+        ]
+    return BigintNdArray(data, shape)
+
+
 class BigintNdArray:
     def __init__(self, data, shape):
         self.shape = shape
@@ -108,7 +108,16 @@ setup(
     author='SCI Center',
     author_email='secretflow-contact@service.alipay.com',
     url='https://github.com/secretflow/secretflow',
-    packages=find_packages(exclude=('examples', 'examples.*', 'tests', 'tests.*')),
+    packages=find_packages(
+        exclude=(
+            'examples',
+            'examples.*',
+            'tests',
+            'tests.*',
+            'benchmark',
+            'benchmark.*',
+        )
+    ),
     install_requires=read_requirements(),
     ext_modules=[
         BazelExtension(
@@ -264,3 +264,34 @@ class TestPartition(DeviceTestCase):
         # THEN
         expected = self.df.mode().iloc[0, :]
         pd.testing.assert_series_equal(reveal(value.data), expected)
+
+    def test_meta_cache_should_ok(self):
+        # WHEN
+        value = self.part.copy()
+        shape = value.shape
+
+        # THEN
+        self.assertEqual(shape, self.df.shape)
+        self.assertIs(value.meta, value.meta)
+
+        # WHEN
+        sub = value[['sepal_length', 'sepal_width']]
+
+        # THEN
+        expected = self.df[['sepal_length', 'sepal_width']]
+        pd.testing.assert_index_equal(sub.columns, expected.columns)
+        pd.testing.assert_series_equal(sub.dtypes, expected.dtypes)
+        self.assertEqual(sub.shape, expected.shape)
+
+    def test_meta_cache_invalidated_by_setitem(self):
+        # WHEN
+        value = self.part.copy()
+        self.assertEqual(len(value.columns), len(self.df.columns))
+        value['new_col'] = 1
+
+        # THEN
+        expected = self.df.copy(deep=True)
+        expected['new_col'] = 1
+        pd.testing.assert_index_equal(value.columns, expected.columns)
+        pd.testing.assert_series_equal(value.dtypes, expected.dtypes)
+        self.assertEqual(value.shape, expected.shape)
@@ -1,9 +1,13 @@
+import unittest
+
 import numpy as np
+from heu import numpy as hnp
 from heu import phe
 
 import secretflow.device as ft
 from secretflow import reveal
 from secretflow.device.device.base import MoveConfig
+from secretflow.device.device.heu import HEUActor
 from tests.basecase import DeviceTestCase
 
 
@@ -99,3 +103,40 @@ class TestDeviceHEU(DeviceTestCase):
         np.testing.assert_almost_equal(
             reveal(m).sum(), reveal(m_heu.encrypt().sum()), decimal=4
         )
+
+    def test_batch_select_sum(self):
+        m = ft.with_device(self.alice)(np.random.rand)(20)
+        m_heu = m.to(self.heu, MoveConfig(heu_dest_party=self.bob.party))
+        indices = [np.array([1, 2, 3]), np.arange(5, 20), np.array([0])]
+        expected = [reveal(m)[i].sum() for i in indices]
+        np.testing.assert_almost_equal(
+            reveal(m_heu.batch_select_sum(indices).to(self.alice)), expected, decimal=4
+        )
+        # indices held by the party where the ciphertext is located.
+        indices_bob = self.bob(lambda: tuple(indices))()
+        np.testing.assert_almost_equal(
+            reveal(m_heu.batch_select_sum(indices_bob).to(self.alice)),
+            expected,
+            decimal=4,
+        )
+
+
+class TestHEUActorBatchSelectSum(unittest.TestCase):
+    def test_without_batch_select_sum(self):
+        hekit = hnp.setup(phe.SchemaType.ZPaillier, 1024)
+        encoder = phe.IntegerEncoder(hekit.get_schema())
+        actor = HEUActor('heu', 'alice', hekit, np.int64, encoder)
+        data = actor.encryptor.encrypt(hnp.array(np.arange(1, 11), encoder))
+        indices = [np.array([0, 1]), [2, 3, 4], np.arange(5, 10)]
+        expected = hekit.decryptor().decrypt(actor.batch_select_sum(data, indices))
+
+        class SumOnly:
+            # evaluator of sf-heu before 0.4, which has no batch_select_sum.
+            def __init__(self, evaluator):
+                self.sum = evaluator.sum
+
+        actor.evaluator = SumOnly(actor.evaluator)
+        result = hekit.decryptor().decrypt(actor.batch_select_sum(data, indices))
+
+        np.testing.assert_equal(result.to_numpy(encoder), [3, 12, 40])
+        np.testing.assert_equal(result.to_numpy(encoder), expected.to_numpy(encoder))
@@ -1,19 +1,22 @@
 import logging
 import random
 import time
+import unittest
+from collections import namedtuple
 
 import numpy as np
 
 from secretflow.device import proxy, PYUObject, reveal
+from secretflow.ml.boost.homo_boost.tree_core.feature_histogram import HistogramBag
 from tests.basecase import DeviceTestCase
-from secretflow.device.link import Link
+from secretflow.device.link import Link, _CompressedArray, _compress, _decompress
 
 
 @proxy(PYUObject, max_concurrency=2)
 class Worker(Link):
-    def __init__(self, device=None, ps_device=None):
+    def __init__(self, device=None, ps_device=None, **kwargs):
         self._ps_device = ps_device
-        super().__init__(device)
+        super().__init__(device, **kwargs)
 
     def run(self, epochs, steps_per_epoch):
         for epoch in range(epochs):
@@ -31,9 +34,9 @@ class Worker(Link):
 
 @proxy(PYUObject, max_concurrency=2)
 class ParameterServer(Link):
-    def __init__(self, device=None, worker_device=None):
+    def __init__(self, device=None, worker_device=None, **kwargs):
         self._worker_device = worker_device
-        super().__init__(device)
+        super().__init__(device, **kwargs)
 
     def run(self, epochs, steps_per_epoch):
         for epoch in range(epochs):
@@ -47,14 +50,24 @@ class ParameterServer(Link):
 
 class TestLink(DeviceTestCase):
     def test_parameter_server(self):
+        self._run_parameter_server()
+
+    def test_parameter_server_with_batch_and_compression(self):
+        self._run_parameter_server(
+            batch_delay=0.01, compress_threshold=16, max_inflight=2
+        )
+
+    def _run_parameter_server(self, **kwargs):
         ps = ParameterServer(
-            device=self.davy, worker_device=[self.alice, self.bob, self.carol]
+            device=self.davy,
+            worker_device=[self.alice, self.bob, self.carol],
+            **kwargs,
         )
 
         workers = [
-            Worker(device=self.alice, ps_device=self.davy),
-            Worker(device=self.bob, ps_device=self.davy),
-            Worker(device=self.carol, ps_device=self.davy),
+            Worker(device=self.alice, ps_device=self.davy, **kwargs),
+            Worker(device=self.bob, ps_device=self.davy, **kwargs),
+            Worker(device=self.carol, ps_device=self.davy, **kwargs),
         ]
 
         # 集群组网
@@ -67,3 +80,35 @@ class TestLink(DeviceTestCase):
         res.append(ps.run(epochs, steps_per_epoch))
 
         reveal(res)  # wait all tasks done
+
+
+Gradients = namedtuple('Gradients', ['g', 'h'])
+
+
+class TestLinkCompress(unittest.TestCase):
+    def test_namedtuple_round_trip(self):
+        value = Gradients(np.zeros((16, 4)), [np.ones(16), 1.0])
+
+        compressed = _compress(value, 16)
+
+        self.assertIsInstance(compressed, Gradients)
+        self.assertIsInstance(compressed.g, _CompressedArray)
+        self.assertIsInstance(compressed.h[0], _CompressedArray)
+        result = _decompress(compressed)
+        self.assertIsInstance(result, Gradients)
+        np.testing.assert_array_equal(result.g, value.g)
+        np.testing.assert_array_equal(result.h[0], value.h[0])
+        self.assertEqual(result.h[1], 1.0)
+
+    def test_dataclass_round_trip(self):
+        value = {'bag': HistogramBag([np.random.rand(8, 3)] * 2, hid=3, p_hid=1)}
+
+        compressed = _compress(value, 16)
+
+        self.assertIsInstance(compressed['bag'], HistogramBag)
+        self.assertIsInstance(compressed['bag'].histogram[0], _CompressedArray)
+        result = _decompress(compressed)['bag']
+        self.assertIsInstance(result, HistogramBag)
+        self.assertEqual((result.hid, result.p_hid), (3, 1))
+        for a, b in zip(result.histogram, value['bag'].histogram):
+            np.testing.assert_array_equal(a, b)
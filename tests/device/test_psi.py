@@ -130,6 +130,33 @@ class TestDevicePSI2PC(DeviceTestCase):
         # bob can not get result
         self.assertIsNone(sf.reveal(db))
 
+    def test_single_col_in_memory(self):
+        da, db = self.spu.psi_df('c1', [self.da, self.db], 'alice', in_memory=True)
+
+        expected = pd.DataFrame(
+            {'c1': ['K1', 'K3', 'K4'], 'c2': ['A1', 'A3', 'A4'], 'c3': [1, 3, 4]}
+        )
+        pd.testing.assert_frame_equal(sf.reveal(da), expected)
+
+        expected = pd.DataFrame(
+            {'c1': ['K1', 'K3', 'K4'], 'c2': ['A1', 'B3', 'A4'], 'c3': [1, 3, 4]}
+        )
+        pd.testing.assert_frame_equal(sf.reveal(db), expected)
+
+    def test_no_broadcast_in_memory(self):
+        da, db = self.spu.psi_df(
+            'c1',
+            [self.da, self.db],
+            'alice',
+            broadcast_result=False,
+            in_memory=True,
+        )
+        expected = pd.DataFrame(
+            {'c1': ['K1', 'K3', 'K4'], 'c2': ['A1', 'A3', 'A4'], 'c3': [1, 3, 4]}
+        )
+        pd.testing.assert_frame_equal(sf.reveal(da), expected)
+        self.assertIsNone(sf.reveal(db))
+
     def test_psi_csv(self):
         data_dir = f'.data/{uuid.uuid4()}'
 
@@ -267,6 +294,34 @@ class TestDevicePSIJoin(DeviceTestCase):
         pd.testing.assert_frame_equal(sf.reveal(da).reset_index(drop=True), result_a)
         pd.testing.assert_frame_equal(sf.reveal(db).reset_index(drop=True), result_b)
 
+    def test_psi_join_df_in_memory(self):
+        select_keys = {
+            self.alice: ['id1'],
+            self.bob: ['id2'],
+        }
+
+        da, db = self.spu.psi_join_df(
+            select_keys, [self.da, self.db], 'bob', 'bob', in_memory=True
+        )
+
+        result_a = pd.DataFrame(
+            {
+                'id1': ['K200', 'K200', 'K300', 'K400', 'K400', 'K500'],
+                'item': ['B', 'C', 'D', 'E', 'F', 'G'],
+                'feature1': ['BBB', 'CCC', 'DDD', 'EEE', 'FFF', 'GGG'],
+            }
+        )
+
+        result_b = pd.DataFrame(
+            {
+                'id2': ['K200', 'K200', 'K300', 'K400', 'K400', 'K500'],
+                'feature2': ['AA', 'AA', 'BB', 'CC', 'CC', 'DD'],
+            }
+        )
+
+        pd.testing.assert_frame_equal(sf.reveal(da), result_a)
+        pd.testing.assert_frame_equal(sf.reveal(db), result_b)
+
     def test_psi_join_csv(self):
         data_dir = f'.data/{uuid.uuid4()}'
 
@@ -80,3 +80,22 @@ class TestDeviceSPU(DeviceTestCase):
         x_spu = x_heu.to(self.spu)
         y = x_spu.to(self.alice)
         np.testing.assert_almost_equal(sf.reveal(x), sf.reveal(y), decimal=5)
+
+    def test_compile_cache(self):
+        def add(x, y):
+            return x + y
+
+        self.spu.clear_compile_cache()
+        x = self.alice(np.random.rand)(3, 4).to(self.spu)
+        y = self.bob(np.random.rand)(3, 4).to(self.spu)
+        z1 = self.spu(add)(x, y)
+        z2 = self.spu(add)(y, x)
+        np.testing.assert_almost_equal(sf.reveal(z1), sf.reveal(z2), decimal=5)
+        stats = self.spu.compile_cache_stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 1)
+
+        # a different input shape must trigger a compilation.
+        w = self.alice(np.random.rand)(4, 3).to(self.spu)
+        sf.reveal(self.spu(add)(w, w))
+        self.assertEqual(self.spu.compile_cache_stats()['misses'], 2)
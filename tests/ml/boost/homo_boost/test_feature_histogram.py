@@ -6,6 +6,7 @@ from secretflow.ml.boost.homo_boost.tree_core.feature_histogram import (
     FeatureHistogram,
     HistogramBag,
 )
+from secretflow.ml.boost.homo_boost.tree_core.node import Node
 
 
 def gen_data(data_num, feature_num, use_random=False, data_bin_num=10):
@@ -132,6 +133,51 @@ class TestFeatureHistogram(unittest.TestCase):
         histogram_len = len(histogram_bag[0])
         np.testing.assert_equal(histogram_len, 10)
 
+    def test_calculate_single_histogram(self):
+        rng = np.random.default_rng(0)
+        data = rng.random((500, 3))
+        data[:, 0] = rng.integers(0, 20, 500)
+        split_point = np.arange(0, 20, 2, dtype=np.float64)
+        histogram = self.feature_histogram.calculate_single_histogram(data, split_point)
+        expect = [
+            [
+                data[data[:, 0] < p, 1].sum(),
+                data[data[:, 0] < p, 2].sum(),
+                (data[:, 0] < p).sum(),
+            ]
+            for p in split_point
+        ]
+        np.testing.assert_almost_equal(histogram, np.array(expect))
+
+    def test_calculate_layer_histogram(self):
+        parent = gen_data(1000, self.feature_num, use_random=True)
+        parent['grad'] = np.random.random(1000)
+        parent['hess'] = np.random.random(1000)
+        split_point_list = np.linspace(0.0, 1.0, self.data_bin_num + 1)[1:]
+        bin_split_points = np.array([split_point_list] * self.feature_num)
+        left = parent[parent['x0'] < 0.3]
+        right = parent[parent['x0'] >= 0.3]
+        nodes = [
+            Node(id=1, parent_nodeid=0, sibling_nodeid=2, is_left_node=True),
+            Node(id=2, parent_nodeid=0, sibling_nodeid=1, is_left_node=False),
+        ]
+        for use_missing in [False, True]:
+            parent_histogram = self.feature_histogram.calculate_histogram(
+                [parent], bin_split_points, self.valid_feature, use_missing
+            )[0]
+            expect = self.feature_histogram.calculate_histogram(
+                [left, right], bin_split_points, self.valid_feature, use_missing
+            )
+            histograms = self.feature_histogram.calculate_layer_histogram(
+                nodes,
+                [left, right],
+                bin_split_points,
+                self.valid_feature,
+                use_missing,
+                parent_histograms={0: parent_histogram},
+            )
+            np.testing.assert_almost_equal(np.array(histograms), np.array(expect))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,3 +1,4 @@
+import json
 import os
 import unittest
 
@@ -148,6 +149,15 @@ class TestFeatureHistogram(unittest.TestCase):
 
         ypred = bst.predict(self.dTest, training=True, output_margin=False)
 
+        # 在内存中构建模型，结果应与文件方式一致
+        json_model = decision_tree.gen_xgboost_model()
+        decision_tree.append_xgboost_tree(json_model, tree_nodes)
+        mem_bst = xgb.Booster(param)
+        mem_bst.load_model(bytearray(json.dumps(json_model).encode()))
+        np.testing.assert_array_equal(
+            mem_bst.predict(self.dTest, training=True, output_margin=False), ypred
+        )
+
         # 用xgboost训练模型
         xgb_bst = xgb.train(param, self.dTrain, num_boost_round=1, obj=obj_func)
         xgb_result = xgb_bst.predict(self.dTest, output_margin=False)
@@ -103,6 +103,9 @@ class TestHomoXgboost(DeviceTestCase):
         bst.save_model(model_path)
         result = bst.eval(model_path=model_path, hdata=self.hdf, params=params)
         print(result)
+        # evaluate trained model in memory
+        result_in_memory = bst.eval(model_path=None, hdata=self.hdf, params=params)
+        self.assertEqual(result, result_in_memory)
         bst_ft = SFXgboost(server=self.davy, clients=[self.alice, self.bob])
 
         bst_ft.train(
@@ -123,3 +126,28 @@ class TestHomoXgboost(DeviceTestCase):
         for path in dump_path.values():
             self.assertTrue(os.path.isfile(path), True)
             os.remove(path)
+
+    def test_homo_xgboost_checkpoint(self):
+        bst = SFXgboost(server=self.davy, clients=[self.alice, self.bob])
+        checkpoint_dir = tempfile.mkdtemp(dir=_temp_dir)
+        params = {
+            'max_depth': 3,
+            'eta': 1.0,
+            'objective': 'binary:logistic',
+            'max_bin': 10,
+            'eval_metric': 'logloss',
+            'hess_key': 'hess',
+            'grad_key': 'grad',
+            'label_key': 'label',
+            'checkpoint_freq': 2,
+            'checkpoint_dir': checkpoint_dir,
+        }
+
+        bst.train(self.hdf, self.hdf, params=params, num_boost_round=4)
+        # one checkpoint file of each client.
+        checkpoints = os.listdir(checkpoint_dir)
+        self.assertEqual(len(checkpoints), 2)
+        self.assertEqual(
+            {name.split('_')[0] for name in checkpoints},
+            {self.alice.party, self.bob.party},
+        )
@@ -0,0 +1,112 @@
+# Copyright 2022 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import jax.numpy as jnp
+import numpy as np
+
+from secretflow.ml.boost.ss_xgb_v.core import node_split
+from secretflow.ml.boost.ss_xgb_v.core import tree_worker
+
+
+def per_node_gradient_sums(context, buckets_map, nodes_s, cache):
+    # gradient sums of the nodes computed one node at a time.
+    if 'col_choices' in context:
+        buckets_map = buckets_map[:, context['col_choices']]
+    if 'sub_choices' in context:
+        buckets_map = buckets_map[context['sub_choices'], :]
+    GL, HL = [], []
+    for idx, s in enumerate(nodes_s[::2]):
+        if 'sub_choices' in context:
+            s = s[:, context['sub_choices']]
+        lchild_GL = jnp.matmul(context['g'] * s, buckets_map)
+        lchild_HL = jnp.matmul(context['h'] * s, buckets_map)
+        GL.append(lchild_GL)
+        HL.append(lchild_HL)
+        if cache is not None:
+            GL.append(cache[0][idx] - lchild_GL)
+            HL.append(cache[1][idx] - lchild_HL)
+    return GL, HL
+
+
+class TestFindBestSplitBucket(unittest.TestCase):
+    samples = 200
+    feature_buckets = (5, 8, 3, 6)
+
+    def _check_levels(self, col_choices, subsample, compact):
+        rng = np.random.default_rng(0)
+        bucket_ids = np.stack(
+            [rng.integers(0, b, self.samples) for b in self.feature_buckets], axis=1
+        ).astype(np.int8)
+        buckets_map = tree_worker.build_buckets_map(bucket_ids, self.feature_buckets)
+        # two parties, each holds two features.
+        parts = bucket_ids if compact else buckets_map
+        split = 2 if compact else sum(self.feature_buckets[:2])
+        y = (rng.random(self.samples) < 0.5).astype(np.float32)
+
+        context = node_split.global_setup(
+            [parts[:, :split], parts[:, split:]], y, 42, 0.1, 0.3, compact=compact
+        )
+        context = node_split.tree_setup(
+            context,
+            node_split.init_pred(0.0, self.samples),
+            [col_choices] if col_choices is not None else [],
+            node_split.RegType.Logistic,
+            self.samples,
+            subsample,
+        )
+
+        nodes_s = list(node_split.root_select(self.samples))
+        cache = None
+        for level in range(3):
+            expected_GL, expected_HL = per_node_gradient_sums(
+                context, buckets_map, nodes_s, cache
+            )
+            split_buckets, context = node_split.find_best_split_bucket(
+                context,
+                nodes_s,
+                False,
+                self.feature_buckets if compact else None,
+            )
+            GL, HL = context['cache']
+            np.testing.assert_allclose(
+                GL, jnp.concatenate(expected_GL, axis=0), rtol=1e-5, atol=1e-5
+            )
+            np.testing.assert_allclose(
+                HL, jnp.concatenate(expected_HL, axis=0), rtol=1e-5, atol=1e-5
+            )
+            self.assertEqual(split_buckets.shape, (2**level,))
+
+            cache = (expected_GL, expected_HL)
+            lchilds_s = [
+                (rng.random(self.samples) < 0.5).astype(np.int8) for _ in nodes_s
+            ]
+            nodes_s = node_split.get_child_select(nodes_s, [lchilds_s])
+
+    def test_dense(self):
+        self._check_levels(None, 1.0, compact=False)
+
+    def test_dense_with_choices(self):
+        self._check_levels(np.array([0, 2, 3, 7, 8, 12, 16, 21]), 0.7, compact=False)
+
+    def test_compact(self):
+        self._check_levels(None, 1.0, compact=True)
+
+    def test_compact_with_choices(self):
+        self._check_levels(np.array([0, 2, 3, 7, 8, 12, 16, 21]), 0.7, compact=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+# Copyright 2022 Ant Group Co., Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import unittest
+
+import numpy as np
+
+from secretflow.ml.boost.ss_xgb_v.core import tree_worker
+
+
+def row_by_row_select(x, split_features, split_values):
+    split_nodes = len(split_features)
+    select = np.zeros((x.shape[0], split_nodes + 1), dtype=np.int8)
+    for r in range(x.shape[0]):
+        idxs = [0]
+        while len(idxs):
+            idx = idxs.pop(0)
+            if idx < split_nodes:
+                f = split_features[idx]
+                if f == -1:
+                    idxs.extend([idx * 2 + 1, idx * 2 + 2])
+                elif x[r, f] < split_values[idx]:
+                    idxs.append(idx * 2 + 1)
+                else:
+                    idxs.append(idx * 2 + 2)
+            else:
+                select[r, idx - split_nodes] = 1
+    return select
+
+
+def loop_qcut(x, buckets):
+    sorted_x = np.sort(x, axis=0)
+    remained_count = len(sorted_x)
+    assert remained_count > 0, 'can not qcut empty x'
+
+    value_category = list()
+    last_value = None
+
+    split_points = list()
+    expected_bin_count = math.ceil(remained_count / buckets)
+    current_bin_count = 0
+    for v in sorted_x:
+        if v != last_value:
+            if len(value_category) <= buckets:
+                value_category.append(v)
+
+            if current_bin_count >= expected_bin_count:
+                split_points.append(v)
+                if len(split_points) == buckets - 1:
+                    break
+                remained_count -= current_bin_count
+                expected_bin_count = math.ceil(
+                    remained_count / (buckets - len(split_points))
+                )
+                current_bin_count = 0
+
+            last_value = v
+        current_bin_count += 1
+
+    if len(value_category) <= buckets:
+        # full dataset category count <= buckets
+        # use category as split point.
+        split_points = value_category[1:]
+    elif split_points[-1] != sorted_x[-1]:
+        # add max sample value into split_points like xgboost.
+        split_points.append(sorted_x[-1])
+
+    split_points = list(map(float, split_points))
+
+    def upper_bound_bin(x: float):
+        count = len(split_points)
+        pos = 0
+        while count > 0:
+            step = math.floor(count / 2)
+            v = split_points[pos + step]
+            if x == v:
+                return pos + step + 1
+            elif x > v:
+                pos = pos + step + 1
+                count -= step + 1
+            else:
+                count = step
+        return pos
+
+    bins = np.vectorize(upper_bound_bin)(x)
+
+    return bins, split_points
+
+
+class TestTreeSelect(unittest.TestCase):
+    def test_predict_tree_select(self):
+        rng = np.random.default_rng(42)
+        x = rng.normal(size=(500, 5))
+        x[rng.random(x.shape) < 0.05] = np.nan
+        for depth in range(0, 7):
+            nodes = 2**depth - 1
+            split_features = rng.integers(-1, 5, size=nodes).tolist()
+            split_values = rng.normal(size=nodes).tolist()
+            expected = row_by_row_select(x, split_features, split_values)
+            np.testing.assert_array_equal(
+                tree_worker.predict_tree_select(x, split_features, split_values),
+                expected,
+            )
+
+    def test_predict_tree_select_in_chunks(self):
+        rng = np.random.default_rng(7)
+        x = rng.normal(size=(1000, 3))
+        split_features = rng.integers(-1, 3, size=15).tolist()
+        split_values = rng.normal(size=15).tolist()
+        expected = row_by_row_select(x, split_features, split_values)
+
+        chunk_rows = tree_worker._PREDICT_CHUNK_ROWS
+        tree_worker._PREDICT_CHUNK_ROWS = 64
+        try:
+            np.testing.assert_array_equal(
+                tree_worker.predict_tree_select(
+                    x, split_features, split_values, threads=4
+                ),
+                expected,
+            )
+        finally:
+            tree_worker._PREDICT_CHUNK_ROWS = chunk_rows
+
+
+class TestQcut(unittest.TestCase):
+    def test_qcut(self):
+        rng = np.random.default_rng(0)
+        for trial in range(200):
+            x = rng.normal(size=int(rng.integers(1, 300)))
+            if trial % 3 == 1:
+                x = np.round(x * 2)
+            if trial % 3 == 2:
+                x[rng.random(x.shape) < 0.1] = np.nan
+            buckets = int(rng.integers(2, 32))
+            expected_bins, expected_points = loop_qcut(x, buckets)
+            bins, points = tree_worker.qcut(x, buckets)
+            np.testing.assert_array_equal(points, expected_points)
+            np.testing.assert_array_equal(bins, expected_bins)
+
+
+class TestBucketsMap(unittest.TestCase):
+    def test_build_buckets_map(self):
+        rng = np.random.default_rng(0)
+        feature_buckets = [3, 1, 5]
+        order_map = np.stack(
+            [rng.integers(0, b, size=100) for b in feature_buckets], axis=1
+        ).astype(tree_worker.bins_dtype(5))
+        expected = np.concatenate(
+            [
+                (order_map[:, f, None] <= np.arange(b)).astype(np.int8)
+                for f, b in enumerate(feature_buckets)
+            ],
+            axis=1,
+        )
+        buckets_map = tree_worker.build_buckets_map(order_map, feature_buckets)
+        self.assertEqual(buckets_map.dtype, np.int8)
+        np.testing.assert_array_equal(buckets_map, expected)
+
+    def test_bins_dtype(self):
+        self.assertEqual(tree_worker.bins_dtype(10), np.int8)
+        self.assertEqual(tree_worker.bins_dtype(127), np.int16)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,11 +14,15 @@
 
 import os
 import sys
+import tempfile
 import time
 import logging
 
+import numpy as np
+
+import secretflow as sf
 from secretflow.device.driver import reveal, wait
-from secretflow.ml.boost.ss_xgb_v import Xgb
+from secretflow.ml.boost.ss_xgb_v import Xgb, XgbModel
 from secretflow.data import FedNdarray, PartitionWay
 from secretflow.utils.simulation.datasets import (
     load_linear,
@@ -39,7 +43,17 @@ class TestVertBinning(ABY3DeviceTestCase):
     def setUpClass(cls) -> None:
         super().setUpClass()
 
-    def run_xgb(self, test_name, v_data, label_data, y, logistic, subsample, colsample):
+    def run_xgb(
+        self,
+        test_name,
+        v_data,
+        label_data,
+        y,
+        logistic,
+        subsample,
+        colsample,
+        compact_buckets=False,
+    ):
         xgb = Xgb(self.spu)
         start = time.time()
         params = {
@@ -51,6 +65,7 @@ class TestVertBinning(ABY3DeviceTestCase):
             'subsample': subsample,
             'colsample_bytree': colsample,
             'base_score': 0.5,
+            'compact_buckets': compact_buckets,
         }
         model = xgb.train(params, v_data, label_data)
         reveal(model.weights[-1])
@@ -64,6 +79,20 @@ class TestVertBinning(ABY3DeviceTestCase):
         else:
             print(f"{test_name} mse: {mean_squared_error(y, yhat)}")
 
+        # batched trees and save / load must give the same prediction.
+        batched_yhat = reveal(model.predict(v_data, trees_per_batch=2))
+        np.testing.assert_almost_equal(batched_yhat, yhat, decimal=4)
+        with tempfile.TemporaryDirectory() as model_dir:
+            parties = set(model.trees[0].keys()) | {
+                sf.PYU(node['party']) for node in self.spu.cluster_def['nodes']
+            }
+            model_path = {p: os.path.join(model_dir, p.party) for p in parties}
+            model.save_model(model_path)
+            loaded = XgbModel.load_model(self.spu, model_path)
+            self.assertEqual(len(loaded.trees), len(model.trees))
+            loaded_yhat = reveal(loaded.predict(v_data))
+        np.testing.assert_almost_equal(loaded_yhat, yhat, decimal=4)
+
         fed_yhat = model.predict(v_data, self.alice)
         assert len(fed_yhat.partitions) == 1 and self.alice in fed_yhat.partitions
         yhat = reveal(fed_yhat.partitions[self.alice])
@@ -123,6 +152,7 @@ class TestVertBinning(ABY3DeviceTestCase):
         )
 
         self.run_xgb("breast_cancer", v_data, label_data, y, True, 1, 0.9)
+        self.run_xgb("breast_cancer_compact", v_data, label_data, y, True, 1, 0.9, True)
 
     def test_dermatology(self):
         vdf = load_dermatology(parts={self.alice: (0, 17), self.bob: (17, 35)}, axis=1)
@@ -22,19 +22,22 @@ class TestVertBinning(ABY3DeviceTestCase):
             wait_objs.extend([input.partitions[d] for d in input.partitions])
         wait(wait_objs)
 
-    def run_test(self, test_name, v_data, label_data, y, batch_size):
+    def run_test(
+        self, test_name, v_data, label_data, y, batch_size, epochs=3, **kwargs
+    ):
         model = SSRegression(self.spu)
         start = time.time()
         model.fit(
             v_data,
             label_data,
-            3,
+            epochs,
             0.3,
             batch_size,
             't1',
             'logistic',
             'l2',
             0.5,
+            **kwargs,
         )
         logging.info(f"{test_name} train time: {time.time() - start}")
         start = time.time()
@@ -73,6 +76,18 @@ class TestVertBinning(ABY3DeviceTestCase):
         logging.info(f"IO times: {time.time() - start}s")
 
         self.run_test("breast_cancer", v_data, label_data, y, 128)
+        self.run_test(
+            "breast_cancer_early_stop",
+            v_data,
+            label_data,
+            y,
+            64,
+            epochs=20,
+            tol=1e-3,
+            check_interval=2,
+            shuffle=True,
+            random_state=42,
+        )
 
     def test_linear(self):
         start = time.time()
@@ -11,6 +11,7 @@ separated from the rest by a newline
 import functools
 import os
 import tempfile
+import time
 
 import numpy as np
 import tensorflow as tf
@@ -164,6 +165,57 @@ class TestFedModelCSV(DeviceTestCase):
         print(global_metric[1].result().numpy())
 
 
+class TestAsyncAggregate(DeviceTestCase):
+    def _fed_model(self):
+        fed_model = FLModel.__new__(FLModel)
+        fed_model._aggregator = PlainAggregator(self.carol)
+        return fed_model
+
+    def test_single_stale_client(self):
+        fed_model = self._fed_model()
+        global_params = self.carol(lambda: [np.zeros(4), np.ones(2)])()
+        client_params = self.alice(lambda: [np.full(4, 8.0), np.full(2, 5.0)])()
+        inflight = {self.alice: (client_params, self.alice(lambda: 100)(), 0)}
+
+        params = fed_model._async_aggregate(
+            global_params, inflight, cur_round=3, max_staleness=3, alpha=0.5
+        )
+
+        # a stale update is mixed into the global model by 0.5 / (1 + 3).
+        self.assertFalse(inflight)
+        np.testing.assert_allclose(reveal(params)[0], np.full(4, 1.0))
+        np.testing.assert_allclose(reveal(params)[1], np.full(2, 1.5))
+
+    def test_slow_client_does_not_delay_fast_client(self):
+        fed_model = self._fed_model()
+        params = self.carol(lambda: [np.zeros(2)])()
+        slow_params = self.alice(lambda: time.sleep(10) or [np.full(2, 100.0)])()
+        inflight = {self.alice: (slow_params, 1, 0)}
+
+        start = time.time()
+        for cur_round in range(3):
+            fast_params = self.bob(lambda p: [p[0] + 1])(params.to(self.bob))
+            inflight[self.bob] = (fast_params, 1, cur_round)
+            params = fed_model._async_aggregate(
+                params, inflight, cur_round, max_staleness=3, alpha=0.5
+            )
+            reveal(params)
+
+        # rounds of the fast client are not blocked by the slow one.
+        self.assertLess(time.time() - start, 10)
+        self.assertEqual(list(inflight), [self.alice])
+        np.testing.assert_allclose(reveal(params)[0], np.full(2, 1.5))
+
+        # the slow update is waited for once it falls max_staleness rounds behind.
+        params = fed_model._async_aggregate(
+            params, inflight, cur_round=3, max_staleness=3, alpha=0.5
+        )
+        self.assertFalse(inflight)
+        np.testing.assert_allclose(
+            reveal(params)[0], np.full(2, 1.5 * 0.875 + 100 * 0.125)
+        )
+
+
 class TestFedModelTensorflow(DeviceTestCase):
     def keras_model_with_mnist(self, model, data, label, strategy, backend, **kwargs):
         aggregator = PlainAggregator(self.carol)
@@ -178,6 +230,7 @@ class TestFedModelTensorflow(DeviceTestCase):
         # spcify params
         sampler_method = kwargs.get('sampler_method', "batch")
         dp_spent_step_freq = kwargs.get('dp_spent_step_freq', None)
+        max_staleness = kwargs.pop('max_staleness', None)
         device_list = [self.alice, self.bob]
 
         fed_model = FLModel(
@@ -200,6 +253,7 @@ class TestFedModelTensorflow(DeviceTestCase):
             sampler_method=sampler_method,
             random_seed=random_seed,
             dp_spent_step_freq=dp_spent_step_freq,
+            max_staleness=max_staleness,
         )
         global_metric, _ = fed_model.evaluate(
             data,
@@ -279,6 +333,15 @@ class TestFedModelTensorflow(DeviceTestCase):
             backend="tensorflow",
             sampler_method='possion',
         )
+        # test fed avg w with asynchronous aggregation
+        self.keras_model_with_mnist(
+            data=mnist_data,
+            label=mnist_label,
+            model=model,
+            strategy="fed_avg_w",
+            backend="tensorflow",
+            max_staleness=1,
+        )
         # test fed avg g
         self.keras_model_with_mnist(
             data=mnist_data,
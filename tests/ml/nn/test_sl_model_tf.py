@@ -95,6 +95,7 @@ class TestSLModelTensorflow(DeviceTestCase):
         # kwargs parsing
         dp_strategy_dict = kwargs.get('dp_strategy_dict', None)
         compressor = kwargs.get('compressor', None)
+        pipeline = kwargs.get('pipeline', False)
 
         party_shape = data.partition_shape()
         alice_length = party_shape[self.alice][0]
@@ -116,7 +117,9 @@ class TestSLModelTensorflow(DeviceTestCase):
             batch_size=train_batch_size,
             shuffle=True,
             random_seed=1234,
+            pipeline=pipeline,
         )
+        self.assertEqual(len(sl_model.train_time_stats), 2)
         global_metric = sl_model.evaluate(
             data,
             label,
@@ -249,6 +252,15 @@ class TestSLModelTensorflow(DeviceTestCase):
             device_y=self.bob,
             compressor=random_sparse,
         )
+        print("test pipeline")
+        self.keras_model_with_mnist(
+            data=x_train,
+            label=y_train,
+            base_model_dict=base_model_dict,
+            model_fuse=fuse_model,
+            device_y=self.bob,
+            pipeline=True,
+        )
 
     def test_multi_output_model(self):
         (x_train, y_train), (_, _) = load_mnist(
@@ -83,3 +83,28 @@ class TestHomoBinning(DeviceTestCase):
         }
         expect_df = pd.DataFrame.from_dict(expect_result)
         pd.testing.assert_frame_equal(bin_result_df, expect_df, rtol=1e-2)
+
+    def test_homo_binning_search_points(self):
+        expect_result = {
+            "x0": [2.0, 4.0, 6.0, 8.0, 9.0],
+            "x1": [2.0, 4.0, 6.0, 8.0, 9.0],
+            "x2": [2.0, 4.0, 6.0, 8.0, 9.0],
+            "x3": [2.0, 4.0, 6.0, 8.0, 9.0],
+        }
+        expect_df = pd.DataFrame.from_dict(expect_result)
+        rounds = []
+        for search_points in [1, 7]:
+            bin_obj = HomoBinning(
+                bin_num=5,
+                bin_indexes=[1, 2, 3, 4],
+                error=1e-10,
+                max_iter=200,
+                compress_thres=30,
+                search_points=search_points,
+            )
+            bin_result = bin_obj.fit_split_points(self.hdf)
+            bin_result_df = pd.DataFrame.from_dict(reveal(bin_result))
+            pd.testing.assert_frame_equal(bin_result_df, expect_df, rtol=1e-2)
+            rounds.append(len(bin_obj.round_times))
+        # 8 way search narrows the interval 3 times faster than bisection.
+        self.assertLess(rounds[1] * 2, rounds[0])
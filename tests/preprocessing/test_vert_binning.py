@@ -7,7 +7,14 @@ import ray
 from secretflow.data.base import Partition
 from secretflow.data.vertical.dataframe import VDataFrame
 from secretflow.device.driver import reveal
-from secretflow.preprocessing.binning.vert_woe_binning import VertWoeBinning
+from secretflow.preprocessing.binning.vert_woe_binning import (
+    VertWoeBinning,
+    bin_ids_positive_sums,
+)
+from secretflow.preprocessing.binning.vert_woe_binning_pyu import (
+    chi_merge,
+    split_feature_bins,
+)
 from secretflow.utils.simulation.datasets import dataset
 
 from tests.basecase import DeviceTestCase
@@ -161,6 +168,14 @@ class TestVertBinning(DeviceTestCase):
         print(he_bob)
         woe_almost_equal(he_bob, he_alice)
 
+        compact_report = ss_binning.binning(
+            self.v_nan_data,
+            bin_names={self.alice: ["f1", "f3", "f2"], self.bob: ["f1", "f3", "f2"]},
+            label_name="y",
+            compact_bins=True,
+        )
+        woe_almost_equal(reveal(compact_report[self.bob]), he_alice)
+
         # audit_log
         import cloudpickle as pickle
 
@@ -235,3 +250,40 @@ class TestVertBinning(DeviceTestCase):
         print("chi_bob to chi_alice")
         print(he_bob)
         woe_almost_equal(he_bob, he_alice)
+
+    def test_chi_merge(self):
+        bins = [(10, 0), (10, 0), (10, 10), (10, 10)]
+        # both zero chi pairs merge, leftmost first, then chi 40 stops merging.
+        merged, removed = chi_merge(bins, target_bins=1, target_chi=2.7)
+        assert merged == [(20, 0), (20, 20)], merged
+        assert removed == [0, 2], removed
+        merged, removed = chi_merge(bins, target_bins=3, target_chi=2.7)
+        assert merged == [(20, 0), (10, 10), (10, 10)], merged
+        assert removed == [0], removed
+
+    def test_split_feature_bins(self):
+        f_data = pd.Series([3.0, np.nan, 1.0, 2.0, 2.0, 5.0, np.nan, 4.0])
+        bins, split_points, else_bin = split_feature_bins(f_data, 3)
+        expected_bins, expected_points = pd.qcut(
+            f_data, 3, labels=False, duplicates='drop', retbins=True
+        )
+        assert len(bins) == 3
+        for b, idx in enumerate(bins):
+            np.testing.assert_array_equal(idx, np.flatnonzero(expected_bins == b))
+        np.testing.assert_array_equal(split_points, expected_points[1:-1])
+        np.testing.assert_array_equal(else_bin, [1, 6])
+
+        f_data = pd.Series(['b', None, 'a', 'b'], dtype=object)
+        bins, categories, else_bin = split_feature_bins(f_data, 3)
+        assert categories == ['a', 'b']
+        np.testing.assert_array_equal(bins[0], [2])
+        np.testing.assert_array_equal(bins[1], [0, 3])
+        np.testing.assert_array_equal(else_bin, [1])
+
+    def test_bin_ids_positive_sums(self):
+        label = np.array([1, 0, 1, 1, 0, 1], dtype=np.float32)
+        # feature 0 has 2 bins and nan at sample 4, feature 1 has 3 bins.
+        bin_ids = np.array([[0, 2], [1, 0], [1, 1], [0, 2], [2, 1], [1, 0]])
+        sums = bin_ids_positive_sums(label, bin_ids, (2, 3), (1, 0))
+        # same as label @ dense select: bins of all features, then nan bins.
+        np.testing.assert_almost_equal(sums, [2, 2, 1, 1, 2, 0])
@@ -0,0 +1,87 @@
+import unittest
+
+import numpy as np
+
+from secretflow.security.privacy.accounting.gdp_accountant import (
+    cal_mu_poisson,
+    get_eps_from_mu,
+)
+from secretflow.security.privacy.accounting.rdp_accountant import (
+    DEFAULT_RDP_ORDERS,
+    RDPAccountant,
+    get_privacy_spent_rdp,
+    get_rdp,
+    rdp_core,
+)
+
+
+class TestRDPAccountant(unittest.TestCase):
+    def test_get_rdp_matches_rdp_core(self):
+        for q in [0, 1e-3, 0.05, 0.5, 1]:
+            for noise_multiplier in [0.5, 1.1, 4.0]:
+                expect = np.array(
+                    [rdp_core(q, noise_multiplier, a) for a in DEFAULT_RDP_ORDERS]
+                )
+                rdp = get_rdp(q, noise_multiplier, 1, DEFAULT_RDP_ORDERS)
+                np.testing.assert_allclose(rdp, expect, rtol=1e-8, atol=1e-12)
+
+    def test_get_rdp_infinite_order(self):
+        orders = [2.0, np.inf]
+        for q in [0, 0.01, 1]:
+            expect = np.array([rdp_core(q, 1.1, a) for a in orders])
+            np.testing.assert_array_equal(get_rdp(q, 1.1, 1, orders), expect)
+        self.assertEqual(get_rdp(0.01, 1.1, 10, np.inf), np.inf)
+
+    def test_get_rdp_batch(self):
+        q = np.array([0.01, 0.02])
+        noise_multiplier = np.array([[0.8], [1.1], [2.0]])
+        steps = np.array([100, 200])
+
+        rdp = get_rdp(q, noise_multiplier, steps, DEFAULT_RDP_ORDERS)
+
+        self.assertEqual(rdp.shape, (3, 2, len(DEFAULT_RDP_ORDERS)))
+        np.testing.assert_allclose(
+            rdp[1, 0], get_rdp(0.01, 1.1, 100, DEFAULT_RDP_ORDERS), rtol=1e-12
+        )
+        self.assertAlmostEqual(get_rdp(0.01, 1.1, 10, 8), 10 * rdp_core(0.01, 1.1, 8))
+
+    def test_incremental_accountant(self):
+        accountant = RDPAccountant()
+        for _ in range(100):
+            accountant.step(0.01, 1.1)
+        accountant.step(0.05, 2.0, steps=30)
+
+        rdp = get_rdp(0.01, 1.1, 100, DEFAULT_RDP_ORDERS) + get_rdp(
+            0.05, 2.0, 30, DEFAULT_RDP_ORDERS
+        )
+        np.testing.assert_allclose(accountant.rdp, rdp, rtol=1e-12)
+        eps, delta, order = accountant.get_privacy_spent(target_delta=1e-5)
+        expect = get_privacy_spent_rdp(DEFAULT_RDP_ORDERS, rdp, target_delta=1e-5)
+        self.assertAlmostEqual(eps, expect[0])
+        self.assertEqual(order, expect[2])
+        self.assertGreater(eps, 0)
+
+
+class TestGDPAccountant(unittest.TestCase):
+    def test_get_eps_from_mu_batch(self):
+        mu = cal_mu_poisson(1000, np.array([0.8, 1.1, 2.0]), 60000, 256)
+
+        eps = get_eps_from_mu(mu, 1e-5)
+
+        np.testing.assert_allclose(eps, [get_eps_from_mu(m, 1e-5) for m in mu])
+        self.assertTrue(np.all(np.diff(eps) < 0))
+
+    def test_get_eps_from_mu_array_shape(self):
+        mu = np.array([[1e-6, 0.5], [1.0, 4.0]])
+
+        eps = get_eps_from_mu(mu, 1e-5)
+
+        self.assertEqual(eps.shape, mu.shape)
+        self.assertEqual(eps[0, 0], 0)
+        np.testing.assert_allclose(
+            eps, [[get_eps_from_mu(m, 1e-5) for m in row] for row in mu], atol=1e-10
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
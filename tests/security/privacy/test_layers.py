@@ -0,0 +1,93 @@
+import unittest
+
+import numpy as np
+import tensorflow as tf
+
+from secretflow.security.privacy import GaussianEmbeddingDP, LabelDP
+from secretflow.security.privacy.mechanism.tensorflow.layers import (
+    clip_by_sample_norm,
+)
+
+
+class TestGaussianEmbeddingDP(unittest.TestCase):
+    def test_clip_by_sample_norm(self):
+        embed = np.random.normal(size=(64, 4, 8)).astype(np.float32)
+        embed[:8] *= 1e-3
+
+        clipped = clip_by_sample_norm(tf.constant(embed), 1.5).numpy()
+
+        # the O(B^2) diag matmul clipping used before.
+        flat = embed.reshape(64, -1)
+        norm = np.linalg.norm(flat, axis=-1)
+        expect = (np.diag(1.0 / np.maximum(norm / 1.5, 1.0)) @ flat).reshape(
+            embed.shape
+        )
+        np.testing.assert_allclose(clipped, expect, rtol=1e-5)
+        self.assertTrue(
+            np.all(np.linalg.norm(clipped.reshape(64, -1), axis=-1) <= 1.5 + 1e-5)
+        )
+        np.testing.assert_array_equal(clipped[:8], embed[:8])
+
+    def test_call_without_noise(self):
+        layer = GaussianEmbeddingDP(
+            noise_multiplier=0.0, batch_size=32, num_samples=1000, l2_norm_clip=1.0
+        )
+        embed = np.random.normal(size=(32, 16)).astype(np.float32)
+
+        outputs = layer(tf.constant(embed)).numpy()
+
+        np.testing.assert_allclose(
+            np.linalg.norm(outputs, axis=-1),
+            np.minimum(np.linalg.norm(embed, axis=-1), 1.0),
+            rtol=1e-5,
+        )
+
+
+class TestLabelDP(unittest.TestCase):
+    n_samples = 1000000
+
+    def assert_rate(self, count, p):
+        # within 5 standard deviations of the binomial count.
+        std = np.sqrt(self.n_samples * p * (1 - p))
+        self.assertLess(abs(count - self.n_samples * p), 5 * std)
+
+    def test_binary_flip_rate(self):
+        eps = 1.0
+        labels = np.random.randint(0, 2, self.n_samples)
+
+        outputs = LabelDP(eps, seed=0)(labels)
+
+        self.assert_rate(np.sum(outputs != labels), 1 / (np.exp(eps) + 1))
+
+    def test_onehot_flip_rate(self):
+        eps, n_classes = 2.0, 5
+        labels = np.random.randint(0, n_classes, self.n_samples)
+        inputs = np.eye(n_classes)[labels]
+
+        outputs = LabelDP(eps, seed=0)(inputs)
+
+        np.testing.assert_array_equal(outputs.sum(axis=-1), 1)
+        p_ori = np.exp(eps) / (np.exp(eps) + n_classes - 1)
+        p_oth = (1 - p_ori) / (n_classes - 1)
+        shift = np.bincount(
+            (np.argmax(outputs, axis=-1) - labels) % n_classes, minlength=n_classes
+        )
+        self.assert_rate(shift[0], p_ori)
+        for count in shift[1:]:
+            self.assert_rate(count, p_oth)
+        # keeping the label is exp(eps) times as likely as any other label.
+        self.assertAlmostEqual(np.log(shift[0] / shift[1:].mean()), eps, delta=0.02)
+
+    def test_seed(self):
+        inputs = np.eye(3)[np.random.randint(0, 3, 1000)]
+        np.testing.assert_array_equal(
+            LabelDP(1.0, seed=7)(inputs), LabelDP(1.0, seed=7)(inputs)
+        )
+
+    def test_invalid_onehot(self):
+        with self.assertRaises(ValueError):
+            LabelDP(1.0)(np.array([[1, 1, 0], [0, 0, 1]]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,6 @@
+import unittest
+from fractions import Fraction
+
 import jax.numpy as jnp
 import numpy as np
 import pandas as pd
@@ -8,6 +11,12 @@ from secretflow.data import FedNdarray, PartitionWay
 from secretflow.data.base import Partition
 from secretflow.data.vertical import VDataFrame
 from secretflow.stats import BiClassificationEval
+from secretflow.stats.core.biclassification_eval_core import (
+    create_sorted_label_score_pair,
+    eq_frequent_bin_evaluate,
+    eq_range_bin_evaluate,
+)
+from secretflow.stats.core.utils import equal_obs
 from tests.basecase import DeviceTestCase
 
 
@@ -47,3 +56,114 @@ class TestBiClassificationReport(DeviceTestCase):
         true_score = roc_auc_score(self.y_true, self.y_pred)
         score = float(self.reports.summary_report.auc)
         np.testing.assert_almost_equal(true_score, score, decimal=2)
+
+    def test_bin_reports_match_per_bin_evaluation(self):
+        # reports of the former per bin float32 evaluation on this fixture.
+        zeros = [0.0] * 17
+        expects = {
+            eq_frequent_bin_evaluate: [
+                zeros,
+                [0.4, 0.8, 1.0, 1.0, 2.0, 0.5, 0.33333334, 0.5, 0.4, 0.8333333]
+                + [0.33333334, 0.5, 0.33333334, 0.5, 0.4, 0.16666666, 0.6],
+                [0.35, 0.35, 1.0, 0.0, 1.0, 0.6666667, 0.6666667, 0.5, 0.6666667]
+                + [1.1111112, 0.33333334, 0.0, 0.6666667, 0.5, 0.6, 0.16666669, 0.35],
+                [0.1, 0.1, 1.0, 1.0, 2.0, 0.6, 1.0, 1.0, 0.75, 1.0, 0.33333334]
+                + [0.5, 1.0, 1.0, 1.0, 0.0, 0.1],
+            ],
+            eq_range_bin_evaluate: [
+                zeros,
+                [0.8, 0.8, 1.0, 0.0, 1.0, 1.0, 0.33333334, 0.0, 0.5, 1.6666666]
+                + [0.33333334, 0.0, 0.33333334, 0.0, 0.2, 0.33333334, 0.8],
+                [0.35, 0.4, 1.0, 1.0, 2.0, 0.6666667, 0.6666667, 0.5, 0.6666667]
+                + [1.1111112, 0.33333334, 0.5, 0.6666667, 0.5, 0.6, 0.16666669, 0.375],
+                [0.1, 0.1, 1.0, 1.0, 2.0, 0.6, 1.0, 1.0, 0.75, 1.0, 0.33333334]
+                + [0.5, 1.0, 1.0, 1.0, 0.0, 0.1],
+            ],
+        }
+        sorted_pairs = create_sorted_label_score_pair(self.y_true, self.y_pred_jax)
+        pos_count = jnp.sum(self.y_true)
+        for evaluate, expect in expects.items():
+            result = np.array(
+                evaluate(sorted_pairs, pos_count, self.bucket_size), dtype=np.float32
+            )
+            np.testing.assert_array_equal(
+                result, np.array(expect, dtype=np.float32), err_msg=evaluate.__name__
+            )
+
+    def test_eq_frequent_bin_report(self):
+        # split points are 0.8, 0.375 and 0.1, the first bin is empty.
+        bins = self.reports.eq_frequent_bin_report
+        self.assertEqual(len(bins), 4)
+        expect = [
+            # positive, negative, total, cumulative positive percent, avg score
+            [1, 1, 2, 1 / 3, 0.6],
+            [1, 0, 1, 2 / 3, 0.35],
+            [1, 1, 2, 1.0, 0.1],
+        ]
+        for bin, (pos, neg, total, cum_pos, avg_score) in zip(bins[1:], expect):
+            np.testing.assert_almost_equal(float(bin.positive), pos)
+            np.testing.assert_almost_equal(float(bin.negative), neg)
+            np.testing.assert_almost_equal(float(bin.total), total)
+            np.testing.assert_almost_equal(
+                float(bin.cumulative_percent_of_positive), cum_pos, decimal=5
+            )
+            np.testing.assert_almost_equal(float(bin.avg_score), avg_score, decimal=5)
+
+
+def exact_bin_reports(sorted_pairs, bin_ends):
+    """Bin statistics in exact rational arithmetic, rounded to float32."""
+    scores, labels = sorted_pairs[:, 1], sorted_pairs[:, 0].astype(int)
+    n, pos_count = len(scores), int(labels.sum())
+    neg_count = n - pos_count
+    reports, start = [], 0
+    for end in bin_ends:
+        if end == start:
+            reports.append([0] * 17)
+            continue
+        tp = int(labels[:end].sum())
+        fp = end - tp
+        pos = int(labels[start:end].sum())
+        precision = Fraction(tp, end)
+        recall = Fraction(tp, pos_count)
+        f1 = 2 * precision * recall / (precision + recall) if tp else 0
+        cum_pos, cum_neg = Fraction(tp, pos_count), Fraction(fp, neg_count)
+        score_sum = sum(Fraction(float(s)) for s in scores[start:end])
+        reports.append(
+            [scores[end - 1], scores[start], pos, end - start - pos, end - start]
+            + [precision, recall, Fraction(fp, neg_count), f1]
+            + [precision * n / pos_count, Fraction(pos, pos_count)]
+            + [Fraction(end - start - pos, neg_count), cum_pos, cum_neg]
+            + [Fraction(end, n), abs(cum_pos - cum_neg), score_sum / (end - start)]
+        )
+        start = end
+    return np.array([[float(v) for v in r] for r in reports], dtype=np.float32)
+
+
+class TestEvaluateBinsPrecision(unittest.TestCase):
+    def test_close_to_exact(self):
+        rng = np.random.default_rng(0)
+        y_true = (rng.random((1000, 1)) < 0.3).astype(np.float32)
+        y_score = rng.random((1000, 1)).astype(np.float32)
+        sorted_pairs = create_sorted_label_score_pair(
+            jnp.array(y_true), jnp.array(y_score)
+        )
+
+        bins = eq_frequent_bin_evaluate(sorted_pairs, jnp.sum(y_true), 10)
+
+        result = np.array(bins, dtype=np.float32)
+        scores = np.asarray(sorted_pairs)[:, 1]
+        split_points = np.flip(np.asarray(equal_obs(sorted_pairs[:, 1], 10)))
+        ends = [int(np.sum(scores > p)) for p in split_points] + [len(scores)]
+        expected = exact_bin_reports(np.asarray(sorted_pairs), ends)
+        # counts and ratios of two counts are exact, f1, lift and avg_score
+        # within 1 ulp, ks is a difference of two rounded percents.
+        exact_columns = [0, 1, 2, 3, 4, 5, 6, 7, 10, 11, 12, 13, 14]
+        np.testing.assert_array_equal(
+            result[:, exact_columns], expected[:, exact_columns]
+        )
+        np.testing.assert_array_max_ulp(
+            result[:, [8, 9, 16]], expected[:, [8, 9, 16]], maxulp=1
+        )
+        np.testing.assert_allclose(
+            result[:, 15], expected[:, 15], rtol=0, atol=2**-23
+        )
@@ -0,0 +1,23 @@
+import numpy as np
+
+from secretflow.device.driver import reveal
+from secretflow.stats.ss_gram_v import gram_matrix
+
+from tests.basecase import ABY3DeviceTestCase
+
+
+class TestGramMatrix(ABY3DeviceTestCase):
+    def test_gram_matrix(self):
+        rng = np.random.default_rng(0)
+        data = [rng.normal(size=(100, w)) for w in [3, 1, 4]]
+        xs = [
+            pyu(lambda x: x)(d)
+            for pyu, d in zip([self.alice, self.bob, self.carol], data)
+        ]
+        x = np.concatenate(data, axis=1)
+
+        xtx = reveal(gram_matrix(self.spu, xs))
+        np.testing.assert_almost_equal(xtx, x.T @ x, decimal=2)
+
+        xtx = reveal(gram_matrix(self.spu, xs[:1]))
+        np.testing.assert_almost_equal(xtx, data[0].T @ data[0], decimal=2)
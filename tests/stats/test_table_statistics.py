@@ -1,6 +1,7 @@
 from secretflow.stats import table_statistics
 
 from tests.basecase import DeviceTestCase
+import numpy as np
 import pandas as pd
 import secretflow as sf
 from sklearn.datasets import load_iris
@@ -20,13 +21,14 @@ class TestTableStatistics(DeviceTestCase):
         data = pd.concat([iris.data, iris.target], axis=1)
         data.iloc[1, 1] = None
         data.iloc[100, 1] = None
+        data.insert(2, 'long_sepal', data['sepal length (cm)'] > 5.8)
 
         # Restore target to its original name.
         data['target'] = data['target'].map(
             {0: 'setosa', 1: 'versicolor', 2: 'virginica'}
         )
         # Vertical partitioning.
-        v_alice, v_bob = data.iloc[:, :2], data.iloc[:, 2:]
+        v_alice, v_bob = data.iloc[:, :3], data.iloc[:, 3:]
 
         # Save to temprary files.
         _, alice_path = tempfile.mkstemp()
@@ -55,3 +57,30 @@ class TestTableStatistics(DeviceTestCase):
                     assert (
                         correct_summary.iloc[i, j] == summary.iloc[i, j]
                     ), "row {}, col {} mismatch".format(i, summary.columns[j])
+
+    def test_table_statistics_moments(self):
+        summary = table_statistics(self.df)
+        numeric = self.df.select_dtypes(['number', 'bool']).astype(float)
+        expects = {
+            'mean': numeric.mean(),
+            'var': numeric.var(),
+            'sem': numeric.sem(),
+            'skew': numeric.skew(),
+            'kurtosis': numeric.kurtosis(),
+            'q1': numeric.quantile(0.25),
+            'q3': numeric.quantile(0.75),
+            'moment_3': numeric.pow(3).mean(),
+            'central_moment_4': (numeric - numeric.mean()).pow(4).mean(),
+            'sum_4': numeric.pow(4).sum(),
+        }
+        for name, expect in expects.items():
+            np.testing.assert_allclose(
+                summary.loc[numeric.columns, name].astype(float),
+                expect,
+                rtol=1e-9,
+                err_msg=name,
+            )
+        self.assertTrue(np.isnan(summary.loc['target', 'mean']))
+        self.assertAlmostEqual(
+            summary.loc['long_sepal', 'mean'], self.df['long_sepal'].mean()
+        )
@@ -62,6 +62,18 @@ class BigintNdarrayCase(unittest.TestCase):
         self.assertTrue(isinstance(array_pt[0][0], phe.Plaintext))
         self.assertEqual(array.data[0], int(array_pt[0][0]))
 
+    def test_frombuffer(self):
+        for bytes_per_int in (4, 8, 16):
+            bits = bytes_per_int * 8
+            array = ndarray_bigint.randbits((30, 40), bits)
+            for byteorder in ('little', 'big'):
+                buffer = array.to_bytes(bytes_per_int, byteorder)
+                res = ndarray_bigint.frombuffer(
+                    buffer, bytes_per_int, (30, 40), byteorder, chunk_size=7
+                )
+                self.assertEqual(res.shape, (30, 40))
+                self.assertEqual(res.data, array.data)
+
 
 if __name__ == '__main__':
     unittest.main()